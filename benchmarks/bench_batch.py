@@ -0,0 +1,69 @@
+"""
+Compares BatchQLearning against N separate QLearningAgents on random layouts.
+
+Run with ``python -m benchmarks.bench_batch [N] [EPISODES]``.
+"""
+import sys
+import time
+
+import numpy as np
+
+from gridnav import BatchQLearning, GridWorld, QLearningAgent
+
+WIDTH, HEIGHT = 15, 10
+ACTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+STARTS = [(0, 0), (14, 0), (0, 9), (14, 9)]
+END = (8, 6)
+OBSTACLES = [
+    (1, 3), (4, 1), (6, 6), (8, 3), (3, 5), (7, 4),
+    (10, 2), (12, 6), (11, 1), (13, 7), (5, 8),
+    (7, 6), (2, 9), (6, 2), (1, 6), (2, 4), (4, 4),
+    (5, 5), (6, 7), (8, 5), (9, 7), (10, 4), (11, 6)
+]
+ALPHA, GAMMA, EPSILON = 0.5, 0.9, 0.1
+
+
+def random_envs(n, seed=0):
+    """Builds n layouts from random subsets of the built-in obstacles, which keeps the goal reachable."""
+    rng = np.random.default_rng(seed)
+    envs = []
+    for i in range(n):
+        keep = rng.random(len(OBSTACLES)) < 0.8
+        obstacles = [cell for cell, kept in zip(OBSTACLES, keep) if kept]
+        envs.append(GridWorld(WIDTH, HEIGHT, STARTS[i % len(STARTS)], END, obstacles, ACTIONS))
+    return envs
+
+
+def run_agents(envs, seeds, episodes):
+    """Trains one QLearningAgent per environment, the way the GUI does."""
+    tables = []
+    steps = 0
+    for env, seed in zip(envs, seeds):
+        agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(seed))
+        for _ in range(episodes):
+            while not agent.take_step():
+                steps += 1
+            steps += 1
+            agent.reset()
+        tables.append(agent.q_table)
+    return np.stack(tables), steps
+
+
+def main(n=200, episodes=20):
+    envs = random_envs(n)
+    seeds = list(range(n))
+
+    started = time.perf_counter()
+    reference, ref_steps = run_agents(envs, seeds, episodes)
+    ref_seconds = time.perf_counter() - started
+
+    trainer = BatchQLearning(envs, ALPHA, GAMMA, EPSILON, seeds)
+    stats = trainer.train(episodes)
+
+    print(f"QLearningAgent x{n}: {ref_steps / ref_seconds:,.0f} steps/sec")
+    print(f"BatchQLearning x{n}: {stats['steps_per_sec']:,.0f} steps/sec ({stats['ticks']} ticks)")
+    print("Q-tables identical:", np.array_equal(reference, trainer.q_tables))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
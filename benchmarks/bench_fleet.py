@@ -0,0 +1,57 @@
+"""
+Fleet throughput as the number of agents grows, with and without collisions.
+
+All agents share one Q-table on a random 100x100 map with three goals. After
+the largest collision-free run the greedy path from every start must reach
+a goal, and with collisions no two agents may share an ordinary cell; the
+script exits non-zero otherwise. Run with
+``python -m benchmarks.bench_fleet [TICKS]``.
+"""
+import sys
+
+import numpy as np
+
+from gridnav import GridWorld, QLearningAgent
+from gridnav.fleet import Fleet
+
+ACTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+SIZE = 100
+STARTS = [(0, 0), (SIZE - 1, SIZE - 1)]
+GOALS = [(SIZE - 1, 0), (SIZE // 2, SIZE // 2), (0, SIZE - 1)]
+AGENTS = [1, 16, 256, 1024, 4096]
+
+
+def main(ticks=1000, seed=0):
+    mask = np.random.default_rng(seed).random((SIZE, SIZE)) < 0.2
+    mask[:, 0] = mask[SIZE - 1, :] = mask[0, :] = False # Corridors keep every goal reachable
+    for x, y in STARTS + GOALS:
+        mask[x, y] = False
+    env = GridWorld(SIZE, SIZE, STARTS[0], GOALS[0], mask, ACTIONS, extra_goals=GOALS[1:])
+
+    failures = []
+    for collisions in (False, True):
+        base = None
+        for n in AGENTS:
+            fleet = Fleet(env, 0.5, 0.99, 0.1, STARTS, n, seed=seed, collisions=collisions)
+            stats = fleet.run(ticks)
+            base = base or stats["steps_per_sec"]
+            print(f"collisions={collisions!s:5} agents {n:5}: {stats['steps_per_sec']:>12,.0f} steps/sec "
+                  f"({stats['steps_per_sec'] / base:6.1f}x one agent), {stats['episodes']:>7} episodes, "
+                  f"{fleet.collided:>9} blocked moves")
+            if collisions:
+                ordinary = fleet.states[~fleet.shared[fleet.states]]
+                if np.bincount(ordinary).max(initial=0) > 1:
+                    failures.append(f"{n} agents share a cell")
+        if not collisions:
+            agent = QLearningAgent(env, 0.5, 0.99, 0.1, STARTS[0], q_table=fleet.q_table)
+            statuses = [agent.trace_path(start)["status"] for start in STARTS]
+            print(f"greedy paths after the largest fleet: {statuses}")
+            if statuses != ["goal"] * len(STARTS):
+                failures.append("the fleet did not learn a path from every start")
+    if failures:
+        print("FAILED:", "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
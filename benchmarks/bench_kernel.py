@@ -0,0 +1,58 @@
+"""
+Episode kernel versus QLearningAgent.take_step on the built-in 15x10 layout.
+
+Both are seeded with the same generator and must produce the same Q-table.
+Run with ``python -m benchmarks.bench_kernel [EPISODES]``.
+"""
+import sys
+import time
+
+import numpy as np
+
+from gridnav import GridWorld, QLearningAgent, run_episodes
+
+ACTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+STARTS = [(0, 0), (14, 0), (0, 9), (14, 9)]
+END = (8, 6)
+OBSTACLES = [
+    (1, 3), (4, 1), (6, 6), (8, 3), (3, 5), (7, 4),
+    (10, 2), (12, 6), (11, 1), (13, 7), (5, 8),
+    (7, 6), (2, 9), (6, 2), (1, 6), (2, 4), (4, 4),
+    (5, 5), (6, 7), (8, 5), (9, 7), (10, 4), (11, 6)
+]
+ALPHA, GAMMA, EPSILON = 0.5, 0.9, 0.1
+
+
+def step_by_step(env, episodes, seed):
+    agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, STARTS[0], rng=np.random.default_rng(seed))
+    steps = 0
+    started = time.perf_counter()
+    for episode in range(episodes):
+        agent.start_state = STARTS[episode % len(STARTS)]
+        agent.reset()
+        while True:
+            steps += 1
+            if agent.take_step():
+                break
+    return agent.q_table, steps / (time.perf_counter() - started)
+
+
+def main(episodes=400, seed=0):
+    env = GridWorld(15, 10, STARTS[0], END, OBSTACLES, ACTIONS)
+    reference, step_rate = step_by_step(env, episodes, seed)
+
+    q_table = np.zeros_like(reference)
+    stats = run_episodes(q_table, env.transitions, env.reward_codes, env.terminal,
+                         [env.state_index(s) for s in STARTS], episodes, np.random.default_rng(seed),
+                         ALPHA, GAMMA, EPSILON, reward_values=env.reward_values)
+
+    print(f"take_step:    {step_rate:,.0f} steps/sec")
+    print(f"run_episodes: {stats['steps_per_sec']:,.0f} steps/sec ({stats['steps_per_sec'] / step_rate:.1f}x)")
+    identical = np.array_equal(reference, q_table)
+    print("Q-tables identical:", identical)
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
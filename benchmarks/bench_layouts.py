@@ -0,0 +1,51 @@
+"""
+Generated layouts: time per layout, reachability check included, and a
+check of every yielded layout against the GridWorld's own search.
+
+Each generator streams layouts of SIZE x SIZE; a dense random kind shows the
+cost of rejections. The first few layouts of every kind are checked on a
+small map with ``GridWorld(compact=True)``, whose state set is exactly the
+cells reachable from the start. Exits non-zero if a yielded layout leaves a
+start cut off from the goal. Run with
+``python -m benchmarks.bench_layouts [SIZE] [LAYOUTS]``.
+"""
+import sys
+import time
+from itertools import islice
+
+import numpy as np
+
+from gridnav import GridWorld, generate_layouts
+
+KINDS = [("random", {"density": 0.2}), ("random", {"density": 0.33}), ("maze", {}), ("rooms", {}),
+         ("rooms", {"room": 16, "wall": 3, "loops": 0.0})]
+
+
+def solvable(layout):
+    """Reference check: every start lies in the compact state set of a world started from the goal."""
+    env = GridWorld(layout["width"], layout["height"], layout["end"], layout["end"], layout["obstacles"],
+                    layout["actions"], compact=True)
+    return all(env.slots[x * env.height + y] >= 0 for x, y in layout["starts"])
+
+
+def main(size=1000, layouts=10, seed=0):
+    failures = 0
+    for kind, options in KINDS:
+        label = kind + "".join(f" {key}={value}" for key, value in options.items())
+        stream = generate_layouts(kind, size, size, seed=seed, **options)
+        next(stream) # Imports and first-touch page faults
+        started = time.perf_counter()
+        blocked = [layout["obstacles"].mean() for layout in islice(stream, layouts)]
+        seconds = (time.perf_counter() - started) / layouts
+        checked = list(generate_layouts(kind, 101, 101, count=20, seed=seed, **options))
+        bad = sum(not solvable(layout) for layout in checked)
+        failures += bad
+        print(f"{label:36} {size}x{size}: {seconds * 1000:7.1f} ms/layout, {np.mean(blocked):5.1%} blocked, "
+              f"{len(checked) - bad}/{len(checked)} solvable at 101x101")
+    if failures:
+        print(f"FAILED: {failures} unsolvable layouts")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,56 @@
+"""
+Memory per configuration on a warehouse-style map: dense versus compact
+states, and float64, float32 and float16 Q-tables.
+
+Each configuration also trains for a fixed number of kernel steps to show
+that the agent works on it unchanged. Run with
+``python -m benchmarks.bench_memory [SIZE] [STEPS]``.
+"""
+import sys
+import time
+
+import numpy as np
+
+from gridnav import GridWorld, QLearningAgent
+
+ACTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+CONFIGURATIONS = [
+    ("dense", False, np.float64),
+    ("compact", True, np.float64),
+    ("compact", True, np.float32),
+    ("compact", True, np.float16),
+]
+
+
+def warehouse(size):
+    """Two-deep racks between one-wide aisles, cross aisles every 20 rows, and a sealed-off corner room."""
+    blocked = np.zeros((size, size), dtype=bool)
+    blocked[np.arange(size) % 3 != 0, :] = True
+    blocked[:, ::20] = False
+    room = size // 4
+    blocked[size - room:, size - room:] = False
+    blocked[size - room - 1, size - room - 1:] = True
+    blocked[size - room - 1:, size - room - 1] = True
+    blocked[0, 0] = False
+    return [(int(x), int(y)) for x, y in zip(*np.nonzero(blocked))]
+
+
+def main(size=2000, steps=200000):
+    obstacles = warehouse(size)
+    end = (0, size - 1)
+    print(f"{size}x{size} warehouse, {len(obstacles) / size ** 2:.0%} obstacles")
+    for name, compact, dtype in CONFIGURATIONS:
+        started = time.perf_counter()
+        env = GridWorld(size, size, (0, 0), end, obstacles, ACTIONS, compact=compact)
+        build = time.perf_counter() - started
+        agent = QLearningAgent(env, 0.5, 0.99, 0.1, env.start, rng=np.random.default_rng(0), dtype=dtype)
+        stats = agent.run_episodes(1, max_steps=steps)
+        usage = agent.memory_usage()
+        breakdown = ", ".join(f"{key} {value / 2 ** 20:.1f}" for key, value in usage.items())
+        print(f"{name:8} {np.dtype(dtype).name:8} states {env.n_states:>9,}  total {sum(usage.values()) / 2 ** 20:7.1f} MB "
+              f"({breakdown})  build {build:.2f} s, {stats['steps_per_sec']:,.0f} steps/sec")
+        del agent, env
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,98 @@
+"""
+Wall time to an optimal policy: Planner versus Q-learning on the built-in layout.
+
+Q-learning trains through the episode kernel, one round over every start at
+a time, until the greedy path from each start is as short as the planner's.
+A second run edits one obstacle on a larger random map and compares
+``Planner.replan`` with solving from scratch; it exits non-zero if the two
+Q-tables disagree. Finally a trained Q-learning agent is warm-started with
+``QLearningAgent.replan`` after the same kind of edit and compared with
+retraining from zeros. Run with ``python -m benchmarks.bench_planner [SEED]``.
+"""
+import sys
+import time
+
+import numpy as np
+
+from gridnav import ConvergenceMonitor, DEFAULT_LAYOUT, GridWorld, Planner, QLearningAgent, TrainingEngine, make_env
+
+ALPHA, GAMMA, EPSILON = 0.5, 0.9, 0.1
+
+
+def path_lengths(agent, starts, end):
+    paths = [agent.find_best_path(start) for start in starts]
+    return [len(path) - 1 if path[-1] == end else None for path in paths]
+
+
+def time_to_optimal(env, starts, optimal, seed, max_rounds=10000):
+    agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, starts[0], rng=np.random.default_rng(seed))
+    started = time.perf_counter()
+    for rounds in range(1, max_rounds + 1):
+        agent.run_episodes(len(starts), starts=starts)
+        if path_lengths(agent, starts, env.end) == optimal:
+            break
+    return time.perf_counter() - started, rounds * len(starts)
+
+
+def train_until_converged(agent, starts, max_episodes=10000):
+    convergence = ConvergenceMonitor(patience=5 * len(starts))
+    engine = TrainingEngine(agent, max_episodes, starts=starts, convergence=convergence)
+    engine.run()
+    return convergence.episodes, engine.total_steps
+
+
+def random_layout(width, height, density, seed):
+    mask = np.random.default_rng(seed).random((width, height)) < density
+    mask[0, 0] = mask[width - 1, height - 1] = False
+    return [(int(x), int(y)) for x, y in zip(*np.nonzero(mask))]
+
+
+def main(seed=0):
+    layout = DEFAULT_LAYOUT
+    env = make_env(layout)
+    planner = Planner(env, GAMMA)
+    solved = planner.solve()
+    optimal = path_lengths(QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, q_table=planner.q_table),
+                           layout["starts"], env.end)
+    learned_seconds, episodes = time_to_optimal(env, layout["starts"], optimal, seed)
+    print(f"optimal path lengths: {optimal}")
+    print(f"value iteration: {solved['seconds'] * 1000:.2f} ms ({solved['sweeps']} sweeps)")
+    print(f"Q-learning:      {learned_seconds * 1000:.2f} ms ({episodes} episodes, "
+          f"{learned_seconds / solved['seconds']:.0f}x slower)")
+
+    width, height = 60, 60
+    env = GridWorld(width, height, (0, 0), (width - 1, height - 1), random_layout(width, height, 0.2, seed),
+                    layout["actions"])
+    planner = Planner(env, 0.99)
+    planner.solve()
+    path = QLearningAgent(env, ALPHA, 0.99, EPSILON, env.start, q_table=planner.q_table).find_best_path()
+    edit = path[len(path) // 2]
+    env.toggle_obstacle(edit)
+    replanned = planner.replan([edit])
+    reference = Planner(env, 0.99)
+    fresh = reference.solve()
+    print(f"{width}x{height} edit at {edit}: replan {replanned['seconds'] * 1000:.2f} ms "
+          f"({replanned['touched']} of {env.n_states} states), full solve {fresh['seconds'] * 1000:.2f} ms "
+          f"({fresh['sweeps']} sweeps)")
+
+    error = np.abs(reference.q_table - planner.q_table).max()
+    print(f"max |replan - full solve|: {error:.2e}")
+
+    env = make_env(layout)
+    agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(seed))
+    train_until_converged(agent, layout["starts"])
+    edits = [(9, 6), (10, 6), (12, 8)]
+    for cell in edits:
+        env.toggle_obstacle(cell)
+    warm_started = agent.replan(edits)
+    warm = train_until_converged(agent, layout["starts"])
+    cold = train_until_converged(QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(seed)),
+                                 layout["starts"])
+    print(f"edit {edits}: warm start touched {warm_started['touched']} states, "
+          f"then {warm[0]} episodes / {warm[1]} steps; from zeros {cold[0]} episodes / {cold[1]} steps")
+    if error > 1e-3:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
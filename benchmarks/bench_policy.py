@@ -0,0 +1,61 @@
+"""
+Batched path queries through ``GreedyPolicy`` versus ``find_best_path`` per start.
+
+A random map is solved with the Planner, then paths from a batch of random
+free cells are extracted both ways. Exits non-zero if any path differs. Run
+with ``python -m benchmarks.bench_policy [SIZE] [QUERIES]``.
+"""
+import sys
+import time
+
+import numpy as np
+
+from gridnav import GridWorld, Planner, QLearningAgent
+
+ACTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+GAMMA = 0.99
+
+
+def main(size=100, queries=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    mask = rng.random((size, size)) < 0.2
+    mask[:, 0] = mask[size - 1, :] = False # A corridor keeps the goal reachable from the corners
+    env = GridWorld(size, size, (0, 0), (size - 1, 0), mask, ACTIONS)
+    planner = Planner(env, GAMMA)
+    planner.solve()
+    agent = QLearningAgent(env, 0.5, GAMMA, 0.1, env.start, q_table=planner.q_table)
+
+    free = np.argwhere(~mask)
+    starts = free[rng.choice(len(free), queries)]
+
+    started = time.perf_counter()
+    reference = [agent.find_best_path(tuple(start)) for start in starts.tolist()]
+    loop = time.perf_counter() - started
+
+    started = time.perf_counter()
+    policy = agent.greedy_policy()
+    policy.distances
+    build = time.perf_counter() - started
+    started = time.perf_counter()
+    lengths = policy.lengths(starts)
+    lengths_time = time.perf_counter() - started
+    started = time.perf_counter()
+    paths = policy.paths(starts)
+    paths_time = time.perf_counter() - started
+
+    print(f"{size}x{size}, {queries} queries, mean path length {lengths[lengths >= 0].mean():.1f}")
+    print(f"find_best_path loop: {loop * 1e6 / queries:8.2f} us/query")
+    print(f"policy build:        {build * 1000:8.2f} ms once")
+    print(f"policy lengths:      {lengths_time * 1e6 / queries:8.2f} us/query ({loop / lengths_time:.0f}x)")
+    print(f"policy paths:        {paths_time * 1e6 / queries:8.2f} us/query ({loop / paths_time:.0f}x)")
+
+    mismatches = sum(
+        (path is None) != (ref[-1] != env.end) or (path is not None and not np.array_equal(path, ref))
+        for path, ref in zip(paths, reference))
+    print("paths identical:", mismatches == 0)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
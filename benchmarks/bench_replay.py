@@ -0,0 +1,73 @@
+"""
+Dyna-Q replay versus plain Q-learning: real environment steps and wall time
+until a ConvergenceMonitor reports convergence.
+
+Runs the built-in 15x10 layout and random maps of 30x30 and 45x45 with
+several seeds per configuration and prints medians. Exits non-zero if
+planning needs more real steps to converge than plain Q-learning on any
+layout. Run with ``python -m benchmarks.bench_replay [SEEDS]``.
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from gridnav import DEFAULT_LAYOUT, ConvergenceMonitor, QLearningAgent, ReplayBuffer, TrainingEngine, make_env
+from gridnav.layouts import random_mask
+
+ALPHA, GAMMA, EPSILON = 0.5, 0.9, 0.1
+PATIENCE = 20
+MAX_EPISODES = 20000
+# (planning_steps, batch_size, planning_interval); None is plain Q-learning
+CONFIGS = [None, (1, 32, 1), (1, 256, 8), (1, 1024, 32)]
+
+
+def layouts():
+    yield DEFAULT_LAYOUT
+    for size in (30, 45):
+        mask = random_mask(size, size, 0.2, rng=0)
+        mask[:, 0] = mask[size - 1, :] = False # A corridor keeps the goal reachable from the corners
+        starts = [(0, 0), (0, size - 1), (size - 1, size - 1)]
+        yield dict(DEFAULT_LAYOUT, name=f"random-{size}", width=size, height=size, starts=starts, end=(size - 1, 0),
+                   obstacles=mask)
+
+
+def train(layout, config, seed):
+    env = make_env(layout)
+    replay = None
+    if config is not None:
+        planning_steps, batch_size, interval = config
+        replay = ReplayBuffer(batch_size=batch_size, planning_steps=planning_steps, planning_interval=interval,
+                              seed=seed)
+    agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(seed), replay=replay)
+    monitor = ConvergenceMonitor(patience=PATIENCE * len(layout["starts"]))
+    engine = TrainingEngine(agent, MAX_EPISODES, starts=layout["starts"], convergence=monitor)
+    started = time.perf_counter()
+    steps = engine.run()
+    return steps, time.perf_counter() - started, monitor.converged
+
+
+def main(seeds=5):
+    failures = []
+    for layout in layouts():
+        plain_steps = plain_seconds = None
+        for config in CONFIGS:
+            runs = [train(layout, config, seed) for seed in range(seeds)]
+            steps = statistics.median(run[0] for run in runs)
+            seconds = statistics.median(run[1] for run in runs)
+            converged = sum(run[2] for run in runs)
+            label = "plain" if config is None else "dyna {}x{} every {}".format(*config)
+            plain_steps = plain_steps or steps
+            plain_seconds = plain_seconds or seconds
+            print(f"{layout['name']:10} {label:20} {steps:>9,.0f} steps ({plain_steps / steps:5.1f}x fewer), "
+                  f"{seconds:6.2f} s ({plain_seconds / seconds:4.1f}x faster), converged {converged}/{seeds}")
+            if config is not None and steps > plain_steps:
+                failures.append(f"{layout['name']} {label}")
+    if failures:
+        print("FAILED: planning needed more real steps on", ", ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
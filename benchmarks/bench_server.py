@@ -0,0 +1,124 @@
+"""
+The policy server against a localhost socket.
+
+Starts a PolicyServer on a free port and talks to it through PolicyClient
+connections, in three phases:
+
+* a burst of concurrent requests for one untrained layout, which must be
+  trained exactly once,
+* a skewed mix of requests over a set of generated layouts, whose paths are
+  checked against a GreedyPolicy solved in this process, reporting the cache
+  hit rate and p50/p99 latency,
+* the same mix against a cache too small for every layout, which must evict.
+
+Exits non-zero if any check fails. Run with
+``python -m benchmarks.bench_server [SIZE] [REQUESTS]``.
+"""
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from gridnav import generate_layouts
+from gridnav.server import PolicyClient, PolicyServer, build_policy, parse_layout, policy_nbytes, route, solve_layout
+
+LAYOUTS = 8
+CONCURRENCY = 16
+STARTS_PER_REQUEST = 32
+
+
+def request_layout(layout):
+    """The ``layout`` part of a request for a generated layout dict."""
+    return {"width": layout["width"], "height": layout["height"], "end": list(layout["end"]),
+            "obstacles": np.argwhere(layout["obstacles"]).tolist()}
+
+
+async def run_mix(port, layouts, requests, rng):
+    """Sends ``requests`` requests from CONCURRENCY clients and returns them with their responses."""
+    weights = 1 / np.arange(1, len(layouts) + 1) # A few hot layouts and a long tail
+    picks = rng.choice(len(layouts), requests, p=weights / weights.sum())
+    work = []
+    for pick in picks.tolist():
+        free = np.argwhere(~layouts[pick]["obstacles"])
+        work.append((pick, free[rng.choice(len(free), STARTS_PER_REQUEST)].tolist()))
+    clients = [await PolicyClient.connect(port=port) for _ in range(CONCURRENCY)]
+    results = []
+
+    async def worker(client, jobs):
+        for pick, starts in jobs:
+            response = await client.paths(request_layout(layouts[pick]), starts)
+            results.append((pick, starts, response))
+
+    await asyncio.gather(*(worker(client, work[i::CONCURRENCY]) for i, client in enumerate(clients)))
+    stats = await clients[0].stats()
+    for client in clients:
+        await client.close()
+    return results, stats
+
+
+async def bench(size, requests, seed=0):
+    rng = np.random.default_rng(seed)
+    layouts = list(generate_layouts("random", size, size, count=LAYOUTS, seed=seed, density=0.25))
+    failures = []
+
+    server = PolicyServer(workers=2)
+    _, port = await server.start()
+    try:
+        clients = [await PolicyClient.connect(port=port) for _ in range(CONCURRENCY)]
+        started = time.perf_counter()
+        burst = await asyncio.gather(*(client.paths(request_layout(layouts[0]), [layouts[0]["starts"][0]])
+                                       for client in clients))
+        seconds = time.perf_counter() - started
+        stats = await clients[0].stats()
+        for client in clients:
+            await client.close()
+        print(f"burst of {CONCURRENCY} requests for one new layout: {seconds * 1000:.0f} ms, "
+              f"{stats['trained']} training job, {stats['coalesced']} coalesced")
+        if stats["trained"] != 1 or any("error" in response for response in burst):
+            failures.append("the burst was not coalesced into one training job")
+
+        results, stats = await run_mix(port, layouts, requests, rng)
+        print(f"{requests} requests over {LAYOUTS} layouts of {size}x{size}: hit rate {stats['hit_rate']:.1%}, "
+              f"p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, {stats['trained']} trained, "
+              f"{stats['cache_bytes'] / 2 ** 20:.1f} MB cached")
+        references = {}
+        mismatches = 0
+        for pick, starts, response in results:
+            if pick not in references:
+                parsed = parse_layout(request_layout(layouts[pick]))
+                references[pick] = build_policy(parsed, solve_layout(parsed))
+            expected = route(references[pick], np.array(starts))[1]
+            mismatches += "error" in response or any(
+                (path is None) != (ref is None) or (path is not None and not np.array_equal(path, ref))
+                for path, ref in zip(response["paths"], expected))
+        print("paths identical to an in-process solve:", mismatches == 0)
+        if mismatches:
+            failures.append(f"{mismatches} responses differ from the in-process solve")
+    finally:
+        await server.close()
+
+    # A budget of about three policies forces evictions
+    budget = 3 * policy_nbytes(next(iter(references.values())))
+    server = PolicyServer(cache_bytes=budget, workers=2)
+    _, port = await server.start()
+    try:
+        _, stats = await run_mix(port, layouts, requests // 10, rng)
+        print(f"with a {budget / 2 ** 20:.1f} MB cache: hit rate {stats['hit_rate']:.1%}, {stats['evictions']} "
+              f"evictions, {stats['cached']} cached, p99 {stats['p99_ms']:.2f} ms")
+        if not stats["evictions"] or stats["cache_bytes"] > budget:
+            failures.append("the small cache did not stay within its budget")
+    finally:
+        await server.close()
+    return failures
+
+
+def main(size=64, requests=2000):
+    failures = asyncio.run(bench(size, requests))
+    if failures:
+        print("FAILED:", "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
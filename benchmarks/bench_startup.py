@@ -0,0 +1,71 @@
+"""
+Startup cost: import times and the wall time of ``main.py``'s subcommands,
+each in a fresh interpreter.
+
+Reports the best of several runs per command next to a bare interpreter and
+a bare ``import numpy``, so what gridnav itself adds is visible. Exits
+non-zero if importing ``main`` or ``gridnav`` loads pygame, if importing
+either one trains or loads NumPy, or if ``main.py train`` loads pygame.
+Run with ``python -m benchmarks.bench_startup [RUNS]``.
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMMANDS = [
+    ("python -c pass", ["-c", "pass"]),
+    ("import numpy", ["-c", "import numpy"]),
+    ("import gridnav", ["-c", "import gridnav"]),
+    ("from gridnav import GridWorld", ["-c", "from gridnav import GridWorld"]),
+    ("import main", ["-c", "import main"]),
+    ("main.py --help", ["main.py", "--help"]),
+    ("main.py solve", ["main.py", "solve"]),
+    ("main.py train", ["main.py", "train"]),
+]
+# Modules each snippet must not have loaded when it finishes
+CHECKS = [
+    ("import main", "import main", ("pygame", "numpy", "gridnav")),
+    ("import gridnav", "import gridnav", ("pygame", "numpy")),
+    ("main.py train", "import main; main.main(['train'])", ("pygame",)),
+]
+
+
+def best_time(args, runs):
+    """The fastest of ``runs`` wall times of ``python args`` in seconds."""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def loaded(snippet, modules):
+    """The ``modules`` that are in ``sys.modules`` after running ``snippet`` in a fresh interpreter."""
+    check = f"import sys\n{snippet}\nprint(' '.join(m for m in {list(modules)!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", check], cwd=ROOT, check=True, capture_output=True, text=True)
+    return out.stdout.splitlines()[-1].split() if out.stdout.strip() else []
+
+
+def main(runs=5):
+    baseline = None
+    for name, args in COMMANDS:
+        seconds = best_time(args, runs)
+        baseline = seconds if baseline is None else baseline
+        print(f"{name:30s} {seconds * 1000:8.1f} ms  (+{(seconds - baseline) * 1000:.1f} ms over the interpreter)")
+
+    failures = []
+    for name, snippet, modules in CHECKS:
+        found = loaded(snippet, modules)
+        if found:
+            failures.append(f"{name} loaded {', '.join(found)}")
+    if failures:
+        print("FAILED:", "; ".join(failures))
+        sys.exit(1)
+    print("no pygame outside render, no NumPy or training on import")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,72 @@
+"""
+Per-step cost of QLearningAgent before and after the compiled GridWorld tables.
+
+The "before" step replays the old tuple-based logic (``get_reward`` plus a
+second ``is_valid_state`` call per step) on the same agent and environment.
+Run with ``python -m benchmarks.bench_tables``.
+"""
+import time
+
+import numpy as np
+
+from gridnav import GridWorld, QLearningAgent
+
+ACTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+OBSTACLES = [
+    (1, 3), (4, 1), (6, 6), (8, 3), (3, 5), (7, 4),
+    (10, 2), (12, 6), (11, 1), (13, 7), (5, 8),
+    (7, 6), (2, 9), (6, 2), (1, 6), (2, 4), (4, 4),
+    (5, 5), (6, 7), (8, 5), (9, 7), (10, 4), (11, 6)
+]
+
+
+def tuple_step(agent):
+    """QLearningAgent.take_step as it was before the compiled tables."""
+    env = agent.env
+    action_idx = agent.choose_action()
+    dx, dy = env.actions[action_idx]
+    x, y = agent.current_state
+    next_state = (x + dx, y + dy)
+    reward = env.get_reward(agent.current_state, next_state)
+    if not env.is_valid_state(*next_state):
+        next_state = agent.current_state
+    nx, ny = next_state
+    agent.q_table[x, y, action_idx] += agent.alpha * (reward + agent.gamma * np.max(agent.q_table[nx, ny]) - agent.q_table[x, y, action_idx])
+    agent.current_state = next_state
+    return next_state == env.end
+
+
+def time_steps(env, step, n_steps, seed=0):
+    agent = QLearningAgent(env, 0.5, 0.9, 0.1, env.start, rng=np.random.default_rng(seed))
+    started = time.perf_counter()
+    for _ in range(n_steps):
+        if step(agent):
+            agent.reset()
+    return (time.perf_counter() - started) / n_steps, agent.q_table
+
+
+def random_layout(width, height, density, seed=0):
+    mask = np.random.default_rng(seed).random((width, height)) < density
+    mask[0, 0] = mask[width - 1, height - 1] = False
+    return [(int(x), int(y)) for x, y in zip(*np.nonzero(mask))]
+
+
+def main(n_steps=100000):
+    layouts = [
+        ("15x10", 15, 10, (0, 0), (8, 6), OBSTACLES),
+        ("1000x1000", 1000, 1000, (0, 0), (999, 999), random_layout(1000, 1000, 0.2)),
+    ]
+    for name, width, height, start, end, obstacles in layouts:
+        started = time.perf_counter()
+        env = GridWorld(width, height, start, end, obstacles, ACTIONS)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        before, q_before = time_steps(env, tuple_step, n_steps)
+        after, q_after = time_steps(env, QLearningAgent.take_step, n_steps)
+        print(f"{name}: build {compile_ms:.1f} ms, "
+              f"before {before * 1e6:.2f} us/step, after {after * 1e6:.2f} us/step "
+              f"({before / after:.2f}x), same Q-table: {np.array_equal(q_before, q_after)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+n-step Q-learning and Watkins Q(lambda) versus one-step Q-learning:
+episodes, real environment steps and wall time until a ConvergenceMonitor
+reports convergence, and how many steps the converged greedy paths take
+beyond the shortest ones from ``Planner.solve()``.
+
+The two are a trade-off, not a free speed-up. Multi-step updates carry the
+goal reward along the first paths that reach it, so the greedy paths settle
+while exploration has seen less of the map, and on open maps they often
+settle on a detour that further training rarely corrects. On mazes, where
+the paths are unique, they lose nothing. Each step also costs a NumPy call,
+so wall time can be higher even when episodes are fewer.
+
+Runs the built-in 15x10 layout, a random 30x30 map, a 21x21 maze and a 32x32
+rooms map with several seeds per configuration and prints medians of all
+four measures. Exits non-zero only if a configuration does not converge with
+every seed. Run with ``python -m benchmarks.bench_traces [SEEDS]``.
+"""
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from gridnav import (DEFAULT_LAYOUT, ConvergenceMonitor, GreedyPolicy, Planner, QLearningAgent, TrainingEngine,
+                     generate_layouts, make_env)
+from gridnav.layouts import random_mask
+
+ALPHA, GAMMA, EPSILON = 0.5, 0.9, 0.1
+PATIENCE = 20
+MAX_EPISODES = 20000
+# QLearningAgent keywords; the empty dict is one-step Q-learning
+CONFIGS = [{}, {"n_step": 2}, {"n_step": 4}, {"trace_decay": 0.5}, {"trace_decay": 0.8}, {"trace_decay": 0.9}]
+
+
+def layouts():
+    yield DEFAULT_LAYOUT
+    size = 30
+    mask = random_mask(size, size, 0.2, rng=0)
+    mask[:, 0] = mask[size - 1, :] = False # A corridor keeps the goal reachable from the corners
+    yield dict(DEFAULT_LAYOUT, name=f"random-{size}", width=size, height=size,
+               starts=[(0, 0), (0, size - 1), (size - 1, size - 1)], end=(size - 1, 0), obstacles=mask)
+    # Mazes are all long corridors, where one-step updates are slowest
+    for kind, size in (("maze", 21), ("rooms", 32)):
+        generated = next(generate_layouts(kind, size, size, seed=0))
+        yield dict(DEFAULT_LAYOUT, name=f"{kind}-{size}", width=size, height=size, starts=generated["starts"],
+                   end=generated["end"], obstacles=generated["obstacles"])
+
+
+def shortest_lengths(layout):
+    """Greedy path length from every start under the exact Q-values from value iteration."""
+    env = make_env(layout)
+    planner = Planner(env, GAMMA)
+    planner.solve()
+    return GreedyPolicy(env, planner.q_values).lengths(layout["starts"])
+
+
+def train(layout, config, seed, shortest):
+    env = make_env(layout)
+    agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(seed), **config)
+    monitor = ConvergenceMonitor(patience=PATIENCE * len(layout["starts"]))
+    engine = TrainingEngine(agent, MAX_EPISODES, starts=layout["starts"], convergence=monitor)
+    started = time.perf_counter()
+    steps = engine.run()
+    seconds = time.perf_counter() - started
+    lengths = agent.greedy_policy().lengths(layout["starts"])
+    # Excess steps over all starts; a path that misses the goal has no length to compare
+    excess = int((lengths - shortest).sum()) if (lengths >= 0).all() else float("inf")
+    return engine.current_episode, steps, seconds, excess, monitor.converged
+
+
+def main(seeds=5):
+    failures = []
+    for layout in layouts():
+        shortest = shortest_lengths(layout)
+        one_step = None
+        for config in CONFIGS:
+            runs = [train(layout, config, seed, shortest) for seed in range(seeds)]
+            episodes, steps, seconds, excess = (statistics.median(run[i] for run in runs) for i in range(4))
+            converged = sum(run[4] for run in runs)
+            label = ", ".join(f"{key} {value}" for key, value in config.items()) or "one-step"
+            one_step = one_step or episodes
+            print(f"{layout['name']:10} {label:16} {episodes:>7,.0f} episodes ({one_step / episodes:4.1f}x fewer), "
+                  f"{steps:>9,.0f} steps, {seconds:6.2f} s, {excess:>4} excess path steps, "
+                  f"converged {converged}/{seeds}")
+            if converged < seeds:
+                failures.append(f"{layout['name']} {label}")
+    if failures:
+        print("FAILED: no convergence with every seed on", ", ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
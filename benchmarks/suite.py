@@ -0,0 +1,250 @@
+"""
+Reproducible benchmark suite for the Q-learning core and the renderer.
+
+Every layout is built from a fixed seed: the built-in 15x10 map shared by
+main.py and update_GUI.py, random maps at 30x30, 100x100 and 1000x1000, a
+maze and an open map. For each layout the suite measures
+
+* build time of the GridWorld tables,
+* training throughput of the episode kernel and of ``take_step``,
+* episodes until a ``ConvergenceMonitor`` reports convergence, on the maps
+  small enough for Q-learning to converge within a benchmark run,
+* ``find_best_path`` latency from every start,
+* peak Python-tracked memory while building and training (``tracemalloc``,
+  measured in a separate pass so it does not slow the timings),
+
+and, if pygame is installed, headless frame times of ``GridWorldApp`` with
+the dummy SDL video driver. Results are written as JSON. Run with
+``python -m benchmarks.suite [--quick] [--out FILE] [--compare BASELINE]``;
+``--compare`` prints the change of every metric against an earlier run and
+exits non-zero if a throughput or latency regressed by more than
+``--tolerance``.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from gridnav import DEFAULT_LAYOUT, ConvergenceMonitor, GridWorld, QLearningAgent, TrainingEngine, generate_layouts
+
+SEED = 0
+ALPHA, GAMMA, EPSILON = 0.5, 0.9, 0.1
+PATIENCE = 20
+# Timings are the best of a few identical runs, which filters out most scheduler noise
+REPEATS = 3
+# Changes of timings below this many milliseconds are never reported as regressions
+NOISE_FLOOR_MS = 0.5
+
+# Metrics where a larger value is worse, and those where a smaller one is
+LOWER_IS_BETTER = {"build_ms", "find_best_path_ms", "frame_ms", "frame_p95_ms", "lod_frame_ms", "peak_memory_mb"}
+HIGHER_IS_BETTER = {"kernel_steps_per_sec", "take_step_steps_per_sec"}
+
+
+def standard_layouts(quick=False):
+    """
+    The benchmark layouts as layout dicts; ``quick`` drops the 1000x1000 map.
+    Random maps and the maze come from ``generate_layouts`` with fixed seeds,
+    so the suite uses the same generators, and the same solvability check,
+    as everything else.
+    """
+    corners = lambda w, h: [(0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1)]
+    layouts = [dict(DEFAULT_LAYOUT, converge=True)]
+    specs = [("random-30", "random", 30, 30, (29, 0), True),
+             ("random-100", "random", 100, 100, (99, 0), False),
+             ("maze-101", "maze", 101, 101, (100, 100), False),
+             ("open-100", None, 100, 100, (99, 99), False)]
+    if not quick:
+        specs.append(("random-1000", "random", 1000, 1000, (999, 0), False))
+    for name, kind, width, height, end, converge in specs:
+        starts = [start for start in corners(width, height) if start != end]
+        if kind is None:
+            layout = {"width": width, "height": height, "starts": starts, "end": end,
+                      "obstacles": np.zeros((width, height), dtype=bool), "actions": DEFAULT_LAYOUT["actions"]}
+        else:
+            options = {"density": 0.2} if kind == "random" else {}
+            layout = next(generate_layouts(kind, width, height, count=1, starts=starts, end=end, seed=SEED,
+                                           **options))
+        layouts.append(dict(layout, name=name, converge=converge))
+    return layouts
+
+
+def build(layout):
+    return GridWorld(layout["width"], layout["height"], layout["starts"][0], layout["end"], layout["obstacles"],
+                     layout["actions"])
+
+
+def measure_training(layout, kernel_steps, step_steps, max_episodes):
+    """Timings of one layout; every run starts from zeros with the same seed."""
+    build_ms = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        env = build(layout)
+        build_ms.append((time.perf_counter() - started) * 1000)
+    result = {"states": env.n_states, "build_ms": min(build_ms)}
+
+    rates = []
+    for _ in range(REPEATS):
+        agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(SEED))
+        rates.append(agent.run_episodes(1 << 30, starts=layout["starts"], max_steps=kernel_steps)["steps_per_sec"])
+    result["kernel_steps_per_sec"] = max(rates)
+
+    rates = []
+    for _ in range(REPEATS):
+        agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(SEED))
+        started = time.perf_counter()
+        for _ in range(step_steps):
+            if agent.take_step():
+                agent.reset()
+        rates.append(step_steps / (time.perf_counter() - started))
+    result["take_step_steps_per_sec"] = max(rates)
+
+    result["converged_at"] = None
+    if layout["converge"]:
+        agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(SEED))
+        monitor = ConvergenceMonitor(patience=PATIENCE * len(layout["starts"]))
+        engine = TrainingEngine(agent, max_episodes, starts=layout["starts"], convergence=monitor)
+        started = time.perf_counter()
+        engine.run()
+        result["converged_at"] = monitor.stable_since if monitor.converged else None
+        result["episodes_run"] = monitor.episodes
+        result["training_seconds"] = time.perf_counter() - started
+
+    # Latency on whatever the last agent learned, best of a few repeats
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        for start in layout["starts"]:
+            agent.find_best_path(start)
+        timings.append((time.perf_counter() - started) * 1000 / len(layout["starts"]))
+    result["find_best_path_ms"] = min(timings)
+    return result
+
+
+def measure_memory(layout, kernel_steps):
+    """Peak memory of building the layout and training on it, in MB."""
+    tracemalloc.start()
+    try:
+        env = build(layout)
+        agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(SEED))
+        agent.run_episodes(1 << 30, starts=layout["starts"], max_steps=kernel_steps)
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+def measure_frames(sizes, frames):
+    """Headless GridWorldApp frame times per grid size; None without pygame."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    try:
+        from update_GUI import GridWorldApp
+    except ImportError:
+        return None
+    results = {}
+    for size in sizes:
+        random.seed(SEED) # The app's agent explores with the random module
+        app = GridWorldApp(grid_size=size, seed=SEED)
+        app.draw_scene(0) # The first frame builds every cache
+        timings = []
+        for frame in range(frames):
+            app.advance_training()
+            started = time.perf_counter()
+            app.draw_scene(frame * 0.1)
+            timings.append((time.perf_counter() - started) * 1000)
+        result = {"frame_ms": statistics.median(timings),
+                  "frame_p95_ms": sorted(timings)[int(0.95 * (len(timings) - 1))]}
+        if size is not None:
+            # Zoomed all the way out, which draws the level-of-detail image
+            app.set_camera(0, 0, 0)
+            app.draw_scene(0)
+            timings = []
+            for frame in range(frames // 4):
+                app.invalidate_static()
+                started = time.perf_counter()
+                app.draw_scene(frame * 0.1)
+                timings.append((time.perf_counter() - started) * 1000)
+            result["lod_frame_ms"] = statistics.median(timings)
+        results["default" if size is None else f"{size[0]}x{size[1]}"] = result
+    return results
+
+
+def run_suite(quick=False):
+    kernel_steps = 50000 if quick else 200000
+    step_steps = 10000 if quick else 50000
+    max_episodes = 3000
+    layouts = standard_layouts(quick)
+    # An untimed run first, so imports and CPU frequency scaling settle before anything is measured
+    measure_training(dict(layouts[0], converge=False), kernel_steps, step_steps, max_episodes)
+    results = {}
+    for layout in layouts:
+        result = measure_training(layout, kernel_steps, step_steps, max_episodes)
+        result["peak_memory_mb"] = measure_memory(layout, kernel_steps)
+        results[layout["name"]] = result
+        print(f"{layout['name']:12} " + "  ".join(f"{key} {format_value(value)}" for key, value in result.items()),
+              file=sys.stderr)
+    sizes = [None, (100, 100)] if quick else [None, (100, 100), (1000, 1000)]
+    frames = measure_frames(sizes, 60 if quick else 240)
+    return {
+        "meta": {"seed": SEED, "quick": quick, "python": platform.python_version(), "numpy": np.__version__,
+                 "platform": platform.platform(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "training": results,
+        "render": frames,
+    }
+
+
+def format_value(value):
+    return f"{value:,.2f}" if isinstance(value, float) else str(value)
+
+
+def compare(current, baseline, tolerance):
+    """Prints every shared metric against ``baseline`` and returns the regressions beyond ``tolerance``."""
+    regressions = []
+    for section in ("training", "render"):
+        for name, metrics in (current.get(section) or {}).items():
+            before = (baseline.get(section) or {}).get(name, {})
+            for key, value in metrics.items():
+                old = before.get(key)
+                if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or not old:
+                    continue
+                change = value / old - 1
+                if key in HIGHER_IS_BETTER:
+                    worse = change < -tolerance
+                else:
+                    noise = key.endswith("_ms") and value - old < NOISE_FLOOR_MS
+                    worse = key in LOWER_IS_BETTER and change > tolerance and not noise
+                print(f"{section}/{name}/{key}: {format_value(old)} -> {format_value(value)} ({change:+.1%})"
+                      + ("  REGRESSION" if worse else ""))
+                if worse:
+                    regressions.append(f"{section}/{name}/{key}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--quick", action="store_true", help="smaller budgets and no 1000x1000 map")
+    parser.add_argument("--out", default="benchmark-results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.quick)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=1)
+    print(f"results written to {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Q-learning grid navigation core, usable without pygame.
+
+The names below are imported from their submodules on first use, so
+``import gridnav`` costs nothing until something is used and a program only
+loads the parts (and dependencies, NumPy included) it actually touches.
+"""
+import importlib
+
+_EXPORTS = {
+    "GridWorld": "gridnav.core",
+    "QLearningAgent": "gridnav.core",
+    "BatchQLearning": "gridnav.batch",
+    "ConvergenceMonitor": "gridnav.convergence",
+    "TrainingEngine": "gridnav.engine",
+    "Fleet": "gridnav.fleet",
+    "run_episodes": "gridnav.kernel",
+    "DEFAULT_LAYOUT": "gridnav.layouts",
+    "make_env": "gridnav.layouts",
+    "generate_layouts": "gridnav.layouts",
+    "Planner": "gridnav.planner",
+    "GreedyPolicy": "gridnav.policy",
+    "ReplayBuffer": "gridnav.replay",
+    "Telemetry": "gridnav.telemetry",
+    "EligibilityTraces": "gridnav.traces",
+    "NStepReturns": "gridnav.traces",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    # Cached on the package, so later lookups skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
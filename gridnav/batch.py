@@ -0,0 +1,114 @@
+import time
+
+import numpy as np
+
+
+class BatchQLearning:
+    """
+    Trains N independent GridWorld instances at once with array operations.
+
+    All environments must share the grid size and action set. Each one gets its
+    own NumPy ``Generator`` and consumes two uniforms per step, exactly like a
+    ``QLearningAgent`` created with ``rng=np.random.default_rng(seed)``, so a
+    single ``train`` call yields the same Q-tables as N separate agents.
+    """
+    def __init__(self, envs, alpha, gamma, epsilon, seeds, block_size=256):
+        if not envs:
+            raise ValueError("BatchQLearning needs at least one environment")
+        first = envs[0]
+        for env in envs:
+            if (env.width, env.height) != (first.width, first.height) or list(env.actions) != list(first.actions):
+                raise ValueError("all environments must share grid size and actions")
+        if len(seeds) != len(envs):
+            raise ValueError("one seed per environment is required")
+
+        self.n = len(envs)
+        self.width, self.height = first.width, first.height
+        self.moves = np.array(first.actions, dtype=np.intp)
+        self.n_actions = len(first.actions)
+        self.block_size = block_size
+
+        self.obstacles = np.stack([env.blocked for env in envs])
+        self.starts = np.array([env.start for env in envs], dtype=np.intp)
+        self.goal_masks = np.stack([env.goal_mask for env in envs])
+        self.rewards = np.array([first.GOAL_REWARD, first.OBSTACLE_PENALTY, first.STEP_PENALTY], dtype=np.float64)
+
+        self.alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), (self.n,))
+        self.gamma = np.broadcast_to(np.asarray(gamma, dtype=np.float64), (self.n,))
+        self.epsilon = np.broadcast_to(np.asarray(epsilon, dtype=np.float64), (self.n,))
+
+        self.rngs = [np.random.default_rng(seed) for seed in seeds]
+        self.q_tables = np.zeros((self.n, self.width, self.height, self.n_actions))
+        self.positions = self.starts.copy()
+        self.episodes_done = np.zeros(self.n, dtype=np.int64)
+        self.total_steps = 0
+
+    def _draw_block(self):
+        """Pre-draws the next block of (explore, pick) pairs for every environment."""
+        return np.stack([rng.random((self.block_size, 2)) for rng in self.rngs], axis=1)
+
+    def _step(self, idx, draws):
+        """Advances the environments in ``idx`` by one step and returns which reached their goal."""
+        x = self.positions[idx, 0]
+        y = self.positions[idx, 1]
+        rows = np.arange(idx.size)
+
+        # Epsilon-greedy selection
+        q = self.q_tables[idx, x, y]
+        greedy = q.argmax(axis=1)
+        random_action = (draws[idx, 1] * self.n_actions).astype(np.intp)
+        action = np.where(draws[idx, 0] < self.epsilon[idx], random_action, greedy)
+
+        # Transition and reward
+        nx = x + self.moves[action, 0]
+        ny = y + self.moves[action, 1]
+        inside = (nx >= 0) & (nx < self.width) & (ny >= 0) & (ny < self.height)
+        cx, cy = np.clip(nx, 0, self.width - 1), np.clip(ny, 0, self.height - 1)
+        valid = inside & ~self.obstacles[idx, cx, cy]
+        reached = inside & self.goal_masks[idx, cx, cy]
+        reward = np.where(reached, self.rewards[0], np.where(valid, self.rewards[2], self.rewards[1]))
+        nx = np.where(valid, nx, x)
+        ny = np.where(valid, ny, y)
+
+        # TD update
+        target = self.q_tables[idx, nx, ny].max(axis=1)
+        q_sa = q[rows, action]
+        self.q_tables[idx, x, y, action] = q_sa + self.alpha[idx] * (reward + self.gamma[idx] * target - q_sa)
+
+        self.positions[idx, 0] = nx
+        self.positions[idx, 1] = ny
+        return self.goal_masks[idx, nx, ny]
+
+    def train(self, episodes, max_ticks=None):
+        """
+        Runs every environment for ``episodes`` episodes (or until ``max_ticks``)
+        and returns throughput statistics.
+        """
+        started = time.perf_counter()
+        steps = 0
+        tick = 0
+        draws = None
+        active = self.episodes_done < episodes
+        while active.any() and (max_ticks is None or tick < max_ticks):
+            if tick % self.block_size == 0:
+                draws = self._draw_block()
+            idx = np.flatnonzero(active)
+            done = self._step(idx, draws[tick % self.block_size])
+            steps += idx.size
+            tick += 1
+
+            finished = idx[done]
+            if finished.size:
+                self.episodes_done[finished] += 1
+                self.positions[finished] = self.starts[finished]
+                active[finished] = self.episodes_done[finished] < episodes
+
+        seconds = time.perf_counter() - started
+        self.total_steps += steps
+        return {
+            "environments": self.n,
+            "ticks": tick,
+            "steps": steps,
+            "seconds": seconds,
+            "steps_per_sec": steps / seconds if seconds > 0 else float("inf"),
+        }
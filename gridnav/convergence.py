@@ -0,0 +1,53 @@
+class ConvergenceMonitor:
+    """
+    Decides when training has converged from per-episode statistics.
+
+    Training counts as converged once the greedy policy (the paths from every
+    start) reaches the goal and has not changed for ``patience`` episodes and,
+    if ``tolerance`` is set, the largest absolute Q-update stayed below it in
+    each of those episodes. ``stable_since`` is the episode where the final
+    policy first appeared, i.e. the episodes-to-convergence metric, and
+    ``stopped_at`` the episode where convergence was declared.
+    """
+    def __init__(self, patience=10, tolerance=None, min_episodes=0):
+        self.patience = patience
+        self.tolerance = tolerance
+        self.min_episodes = min_episodes
+        self.episodes = 0
+        self.max_deltas = []
+        self.stable_since = None
+        self.stopped_at = None
+        self._policy = None
+        self._calm_since = None
+
+    @property
+    def converged(self):
+        return self.stopped_at is not None
+
+    def update(self, max_delta, policy, solved=True):
+        """Records one finished episode and returns True once converged."""
+        self.episodes += 1
+        self.max_deltas.append(max_delta)
+        if policy != self._policy or not solved:
+            self._policy = policy if solved else None
+            self.stable_since = self.episodes if solved else None
+        if self.tolerance is not None and max_delta >= self.tolerance:
+            self._calm_since = None
+        elif self._calm_since is None:
+            self._calm_since = self.episodes
+
+        if self.stopped_at is None and self.stable_since is not None and self.episodes >= self.min_episodes:
+            stable = self.episodes - self.stable_since >= self.patience
+            calm = self._calm_since is not None and self.episodes - self._calm_since + 1 >= self.patience
+            if stable and calm:
+                self.stopped_at = self.episodes
+        return self.converged
+
+    def summary(self):
+        return {
+            "episodes_run": self.episodes,
+            "converged": self.converged,
+            "converged_at": self.stable_since if self.converged else None,
+            "stopped_at": self.stopped_at,
+            "last_max_delta": self.max_deltas[-1] if self.max_deltas else None,
+        }
@@ -0,0 +1,480 @@
+# Writed By https://github.com/Behdad-kanaani
+
+import numpy as np
+import random
+
+from gridnav.kernel import run_episodes
+from gridnav.planner import sweep_changes
+from gridnav.policy import GreedyPolicy
+from gridnav.trail import TrailBuffer
+from gridnav.traces import EligibilityTraces, NStepReturns
+
+# ------------------------------
+# Environment and Agent Classes
+# ------------------------------
+class GridWorld:
+    """
+    The GridWorld class is responsible for managing the environment and its rules.
+
+    Obstacles live in the boolean ``blocked`` mask, and ``obstacles`` may be
+    given as such a mask instead of a list of cells. By default every cell is
+    a state. With ``compact=True`` only the free cells reachable from
+    ``start`` get a state index (``cells`` maps indices to flat cells,
+    ``slots`` maps flat cells back, -1 outside), so walls and sealed-off
+    areas cost no Q-table rows. That state set is fixed when the world is
+    built; cells outside it act as walls even if their obstacle is removed
+    later.
+
+    ``end`` is the primary goal; ``extra_goals`` adds more. Every goal is
+    terminal and pays the goal reward, and ``goal_mask`` marks them all.
+
+    Every reward is one of three constants, so ``reward_codes`` stores one
+    ``int8`` per (state, action), an index into ``reward_values``:
+    ``STEP``, ``OBSTACLE`` or ``GOAL``.
+    """
+    GOAL_REWARD = 100
+    OBSTACLE_PENALTY = -10
+    STEP_PENALTY = -1
+    STEP, OBSTACLE, GOAL = 0, 1, 2
+
+    def __init__(self, width, height, start, end, obstacles, actions, compact=False, extra_goals=()):
+        self.width = width
+        self.height = height
+        self.start = start
+        self.actions = actions
+        self.moves = np.array(actions, dtype=np.int32).reshape(-1, 2)
+        self._end = end
+        self._extra_goals = [tuple(goal) for goal in extra_goals if tuple(goal) != tuple(end)]
+        self.goal_mask = np.zeros((width, height), dtype=bool)
+        for x, y in self.goals:
+            self.goal_mask[x, y] = True
+        if isinstance(obstacles, np.ndarray) and obstacles.dtype == bool:
+            # A (width, height) mask skips building millions of tuples on large maps
+            self.blocked = obstacles.copy()
+        else:
+            self.blocked = np.zeros((width, height), dtype=bool)
+            for x, y in obstacles:
+                if 0 <= x < width and 0 <= y < height:
+                    self.blocked[x, y] = True
+        self.cells = None
+        self.slots = None
+        if compact:
+            self.cells = self._reachable_cells(start)
+            self.slots = np.full(width * height, -1, dtype=np.int32)
+            self.slots[self.cells] = np.arange(len(self.cells), dtype=np.int32)
+        self.n_states = width * height if self.cells is None else len(self.cells)
+        self.transitions = np.zeros((self.n_states, len(actions)), dtype=np.int32)
+        self.reward_values = np.array([self.STEP_PENALTY, self.OBSTACLE_PENALTY, self.GOAL_REWARD], dtype=np.float64)
+        self.reward_codes = np.zeros((self.n_states, len(actions)), dtype=np.int8)
+        self.terminal = np.zeros(self.n_states, dtype=bool)
+        self._compile(np.arange(self.n_states))
+
+    @property
+    def q_shape(self):
+        """Shape of a Q-table for this world: ``(width, height, n_actions)``, or ``(n_states, n_actions)`` if compact."""
+        if self.cells is None:
+            return (self.width, self.height, len(self.actions))
+        return (self.n_states, len(self.actions))
+
+    @property
+    def rewards(self):
+        """
+        Reward of every (state, action) as a new float array decoded from
+        ``reward_codes``. Per-step code indexes ``reward_values`` instead.
+        """
+        return self.reward_values[self.reward_codes]
+
+    def memory_usage(self):
+        """Bytes held by the obstacle mask and the compiled tables."""
+        arrays = {"blocked": self.blocked, "goal_mask": self.goal_mask, "transitions": self.transitions,
+                  "reward_codes": self.reward_codes, "terminal": self.terminal, "cells": self.cells,
+                  "slots": self.slots}
+        return {name: array.nbytes for name, array in arrays.items() if array is not None}
+
+    def _reachable_cells(self, start):
+        """Sorted flat indices of the free cells reachable from ``start``, found by a frontier-at-a-time search."""
+        free = ~self.blocked.reshape(-1)
+        seen = np.zeros(self.width * self.height, dtype=bool)
+        frontier = np.array([start[0] * self.height + start[1]], dtype=np.int64)
+        seen[frontier] = True
+        while frontier.size:
+            nx = frontier[:, None] // self.height + self.moves[:, 0]
+            ny = frontier[:, None] % self.height + self.moves[:, 1]
+            inside = (nx >= 0) & (nx < self.width) & (ny >= 0) & (ny < self.height)
+            targets = (nx * self.height + ny)[inside]
+            frontier = np.unique(targets[free[targets] & ~seen[targets]])
+            seen[frontier] = True
+        return np.flatnonzero(seen).astype(np.int32)
+
+    # --- Layout, kept in sync with the compiled tables ---
+    @property
+    def obstacles(self):
+        return frozenset(zip(*(axis.tolist() for axis in np.nonzero(self.blocked))))
+
+    @obstacles.setter
+    def obstacles(self, obstacles):
+        blocked = np.zeros_like(self.blocked)
+        for x, y in obstacles:
+            if 0 <= x < self.width and 0 <= y < self.height:
+                blocked[x, y] = True
+        changed = set(zip(*(axis.tolist() for axis in np.nonzero(blocked != self.blocked))))
+        self.blocked[:] = blocked
+        if len(changed) * (len(self.actions) + 1) >= self.n_states:
+            self._compile(np.arange(self.n_states))
+        else:
+            self._recompile_around(changed)
+
+    @property
+    def end(self):
+        return self._end
+
+    @end.setter
+    def end(self, end):
+        old_end, self._end = self._end, end
+        if old_end not in self._extra_goals:
+            self.goal_mask[old_end] = False
+        self.goal_mask[end] = True
+        self._recompile_around({old_end, end})
+
+    @property
+    def goals(self):
+        """Every goal cell, ``end`` first."""
+        return (self._end, *self._extra_goals)
+
+    def is_goal(self, cell):
+        x, y = cell
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.goal_mask[x, y])
+
+    def add_goal(self, cell):
+        """Adds an extra goal and patches the tables around it."""
+        cell = tuple(cell)
+        if not self.is_goal(cell):
+            self._extra_goals.append(cell)
+            self.goal_mask[cell] = True
+            self._recompile_around({cell})
+
+    def remove_goal(self, cell):
+        """Removes an extra goal; the primary goal ``end`` can only be moved."""
+        cell = tuple(cell)
+        if cell in self._extra_goals:
+            self._extra_goals.remove(cell)
+            self.goal_mask[cell] = False
+            self._recompile_around({cell})
+
+    def add_obstacle(self, cell):
+        if self.is_valid_state(*cell):
+            self.toggle_obstacle(cell)
+
+    def remove_obstacle(self, cell):
+        if not self.is_valid_state(*cell):
+            self.toggle_obstacle(cell)
+
+    def toggle_obstacle(self, cell):
+        """Adds or removes a single obstacle and patches the tables around it."""
+        x, y = cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.blocked[x, y] = not self.blocked[x, y]
+            self._recompile_around({cell})
+
+    # --- Compiled transition and reward tables ---
+    def state_index(self, state):
+        """Flat index of a cell, matching ``q_table.reshape(-1, n_actions)``."""
+        index = state[0] * self.height + state[1]
+        if self.slots is None:
+            return index
+        if self.slots[index] < 0:
+            raise ValueError(f"cell {tuple(state)} is not reachable in this compact GridWorld")
+        return int(self.slots[index])
+
+    def state_indices(self, xs, ys):
+        """Vectorized ``state_index`` for arrays of x and y coordinates."""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        if ((xs < 0) | (xs >= self.width) | (ys < 0) | (ys >= self.height)).any():
+            raise ValueError("cells outside the grid")
+        flat = xs * self.height + ys
+        if self.slots is None:
+            return flat
+        states = self.slots[flat]
+        if (states < 0).any():
+            raise ValueError("cells that are not reachable in this compact GridWorld")
+        return states
+
+    def cell(self, index):
+        """Inverse of ``state_index``."""
+        if self.cells is not None:
+            index = self.cells[index]
+        return divmod(int(index), self.height)
+
+    def cell_arrays(self, indices):
+        """Vectorized ``cell``: ``(x, y)`` coordinate arrays of an array of state indices."""
+        flat = np.asarray(indices, dtype=np.int64)
+        if self.cells is not None:
+            flat = self.cells[flat]
+        return flat // self.height, flat % self.height
+
+    def affected_states(self, cells):
+        """Flat indices of ``cells`` and of every state that can step into one of them."""
+        sources = set()
+        for x, y in cells:
+            sources.add((x, y))
+            for dx, dy in self.actions:
+                sources.add((x - dx, y - dy))
+        flat = [x * self.height + y for x, y in sources if 0 <= x < self.width and 0 <= y < self.height]
+        if self.slots is None:
+            return sorted(flat)
+        return sorted(int(self.slots[i]) for i in flat if self.slots[i] >= 0)
+
+    def _recompile_around(self, cells):
+        """Recomputes the rows of every state that can step into one of ``cells``."""
+        rows = self.affected_states(cells)
+        if rows:
+            self._compile(np.array(rows, dtype=np.int64))
+
+    def _compile(self, rows):
+        """Fills ``transitions``, ``reward_codes`` and ``terminal`` for the given states."""
+        flat = rows if self.cells is None else self.cells[rows].astype(np.int64)
+        x = flat // self.height
+        y = flat % self.height
+        nx = x[:, None] + self.moves[:, 0]
+        ny = y[:, None] + self.moves[:, 1]
+        inside = (nx >= 0) & (nx < self.width) & (ny >= 0) & (ny < self.height)
+        valid = inside & ~self.blocked[np.clip(nx, 0, self.width - 1), np.clip(ny, 0, self.height - 1)]
+        targets = np.where(valid, nx * self.height + ny, flat[:, None])
+        if self.slots is not None:
+            targets = self.slots[targets]
+            valid &= targets >= 0
+            targets = np.where(valid, targets, rows[:, None])
+        reached = inside & self.goal_mask[np.clip(nx, 0, self.width - 1), np.clip(ny, 0, self.height - 1)]
+        self.reward_codes[rows] = np.where(reached, self.GOAL, np.where(valid, self.STEP, self.OBSTACLE))
+        self.transitions[rows] = targets
+        self.terminal[rows] = self.goal_mask[x, y]
+
+    # --- Tuple-based API ---
+    def is_valid_state(self, x, y):
+        """Checks if a position is valid within the grid."""
+        return 0 <= x < self.width and 0 <= y < self.height and not self.blocked[x, y]
+
+    def get_reward(self, state, next_state):
+        """Returns the reward value based on the state transition."""
+        if self.is_goal(next_state):
+            return self.GOAL_REWARD
+        if not self.is_valid_state(*next_state):
+            return self.OBSTACLE_PENALTY
+        return self.STEP_PENALTY
+
+class QLearningAgent:
+    """
+    The QLearningAgent class is responsible for the Q-learning logic.
+
+    By default exploration uses the global ``random`` module. Passing a NumPy
+    ``Generator`` as ``rng`` makes every step draw exactly two uniforms from it
+    (explore test, random action), which is what the batched trainer replays.
+
+    The Q-table has ``env.q_shape`` and ``dtype`` (float32 or float16 halve
+    or quarter its memory at the cost of precision).
+
+    ``trail`` holds the state indices of the last ``trail_capacity`` cells the
+    current episode moved through, and ``visit_counts`` counts, per state,
+    the steps that ended there over the agent's whole training.
+
+    ``episode_steps``, ``episode_return`` and ``episode_max_delta`` describe
+    the episode in progress. Setting ``telemetry`` to a ``Telemetry`` with
+    ``phases=True`` times the phases of every ``take_step``.
+
+    With a ``ReplayBuffer`` as ``replay``, every real step is stored and
+    followed by its Dyna-Q planning updates, in ``take_step`` and in the
+    episode kernel alike.
+
+    ``n_step`` above 1 selects n-step Q-learning and ``trace_decay`` (lambda)
+    above 0 selects Watkins Q(lambda), both of which carry reward back along
+    the path faster than the default one-step update. ``returns`` holds the
+    ``NStepReturns`` or ``EligibilityTraces`` doing so, or None.
+    """
+    def __init__(self, env, alpha, gamma, epsilon, start_state, rng=None, q_table=None, dtype=np.float64,
+                 trail_capacity=1024, replay=None, n_step=1, trace_decay=0.0):
+        self.env = env
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.start_state = start_state
+        self.state_index = env.state_index(start_state)
+        self.rng = rng
+        # An existing array of shape env.q_shape is trained in place
+        self.q_table = q_table if q_table is not None else np.zeros(env.q_shape, dtype=dtype)
+        # Flat (n_states, n_actions) view used by the hot loop
+        self.q_values = self.q_table.reshape(env.n_states, len(env.actions))
+        self.trail = TrailBuffer(trail_capacity)
+        self.visit_counts = np.zeros(env.n_states, dtype=np.int32)
+        self.episode_steps = 0
+        self.episode_return = 0.0
+        self.episode_max_delta = 0.0
+        self.telemetry = None
+        self.replay = replay
+        if n_step > 1 and trace_decay > 0:
+            raise ValueError("n_step and trace_decay select different updates; set only one of them")
+        self.returns = None
+        if n_step > 1:
+            self.returns = NStepReturns(n_step)
+        elif trace_decay > 0:
+            self.returns = EligibilityTraces(trace_decay)
+
+    @property
+    def current_state(self):
+        return self.env.cell(self.state_index)
+
+    @current_state.setter
+    def current_state(self, state):
+        self.state_index = self.env.state_index(state)
+
+    def choose_action(self):
+        """Selects an action based on the epsilon-greedy policy."""
+        if self.rng is not None:
+            explore, pick = self.rng.random(2)
+            if explore < self.epsilon:
+                return int(pick * len(self.env.actions))
+            return self.q_values[self.state_index].argmax()
+        if random.uniform(0, 1) < self.epsilon:
+            return random.randint(0, len(self.env.actions) - 1)
+        else:
+            return self.q_values[self.state_index].argmax()
+
+    def take_step(self):
+        """Takes a step in the environment and updates the Q-table."""
+        telemetry = self.telemetry
+        clock = telemetry.clock if telemetry is not None and telemetry.phases else None
+        if clock:
+            started = clock()
+        action_idx = self.choose_action()
+        env = self.env
+        q = self.q_values
+        state = self.state_index
+        if clock:
+            selected = clock()
+
+        # Transition, reward and episode end all come from the compiled tables
+        next_state = int(env.transitions[state, action_idx])
+        reward = float(env.reward_values[env.reward_codes[state, action_idx]])
+        if clock:
+            moved = clock()
+        done = bool(env.terminal[next_state])
+        if self.returns is None:
+            delta = self.alpha * (reward + self.gamma * q[next_state].max() - q[state, action_idx])
+            q[state, action_idx] += delta
+        else:
+            greedy = q[state, action_idx] >= q[state].max()
+            delta = self.returns.step(q, state, action_idx, reward, next_state, done, greedy, self.alpha, self.gamma)
+        if abs(delta) > self.episode_max_delta:
+            self.episode_max_delta = abs(delta)
+        self.episode_steps += 1
+        self.episode_return += reward
+        if self.replay is not None:
+            self.replay.add(state, action_idx, reward, next_state)
+            self.replay.plan(q, self.alpha, self.gamma)
+        if clock:
+            telemetry.add_phases(selected - started, moved - selected, clock() - moved)
+
+        self.visit_counts[next_state] += 1
+        if next_state != state:
+            self.trail.append(next_state)
+
+        self.state_index = next_state
+        return done
+
+    def run_episodes(self, n_episodes, starts=None, max_steps=None, on_episode=None):
+        """
+        Trains whole episodes through the episode kernel. Visits are counted,
+        but no trail is recorded.
+        Without an ``rng`` the kernel is seeded from the ``random`` module.
+        """
+        env = self.env
+        rng = self.rng if self.rng is not None else np.random.default_rng(random.getrandbits(64))
+        start_indices = [env.state_index(s) for s in (starts or [self.start_state])]
+        stats = run_episodes(self.q_values, env.transitions, env.reward_codes, env.terminal, start_indices, n_episodes,
+                             rng, self.alpha, self.gamma, self.epsilon, max_steps=max_steps, on_episode=on_episode,
+                             visit_counts=self.visit_counts, replay=self.replay, returns=self.returns,
+                             reward_values=env.reward_values)
+        self.state_index = stats["final_state"]
+        return stats
+
+    def find_best_path(self, start=None):
+        """Computes the best path after training is complete; see ``trace_path`` for why it may stop early."""
+        return self.trace_path(start)["path"]
+
+    def trace_path(self, start=None, max_steps=None):
+        """
+        Follows the greedy policy from ``start`` and says how the walk ended.
+
+        Returns a dict with the ``path`` of cells and a ``status``: ``"goal"``,
+        ``"invalid move"`` (the greedy action at ``cell`` runs into an
+        obstacle or off the grid), ``"cycle"`` (the next move returns to
+        ``cell``, already on the path) or ``"unreachable"`` (the start is not
+        a free cell, or ``max_steps`` ran out). A boolean mask over the states
+        marks the visited ones, so the walk costs O(path length) and never
+        takes more than ``n_states`` steps.
+        """
+        env = self.env
+        start = self.start_state if start is None else tuple(start)
+        path = [start]
+        if not env.is_valid_state(*start):
+            return {"path": path, "status": "unreachable", "cell": start}
+        try:
+            state = env.state_index(start)
+        except ValueError: # Free, but sealed off from a compact world's states
+            return {"path": path, "status": "unreachable", "cell": start}
+        # np.zeros is backed by calloc, so only the pages the walk touches are ever cleared
+        visited = np.zeros(env.n_states, dtype=bool)
+        visited[state] = True
+        transitions, q, terminal = env.transitions, self.q_values, env.terminal
+        limit = env.n_states if max_steps is None else max_steps
+        while not terminal[state]:
+            if len(path) > limit:
+                return {"path": path, "status": "unreachable", "cell": path[-1]}
+            next_state = int(transitions[state, q[state].argmax()])
+            if next_state == state: # Blocked or off-grid moves leave the agent in place
+                return {"path": path, "status": "invalid move", "cell": path[-1]}
+            if visited[next_state]:
+                return {"path": path, "status": "cycle", "cell": env.cell(next_state)}
+            visited[next_state] = True
+            path.append(env.cell(next_state))
+            state = next_state
+        return {"path": path, "status": "goal", "cell": path[-1]}
+
+    def greedy_policy(self):
+        """A ``GreedyPolicy`` snapshot of the current Q-table, for batches of path queries."""
+        return GreedyPolicy(self.env, self.q_values)
+
+    def memory_usage(self):
+        """Bytes held by the Q-table, trail, visit counts, replay buffer and returns plus ``env.memory_usage()``."""
+        usage = {"q_table": self.q_table.nbytes, "trail": self.trail.states.nbytes,
+                 "visit_counts": self.visit_counts.nbytes}
+        if self.replay is not None:
+            usage["replay"] = self.replay.nbytes
+        if self.returns is not None:
+            usage["returns"] = self.returns.nbytes
+        return {**usage, **self.env.memory_usage()}
+
+    def replan(self, cells, tolerance=1e-6):
+        """
+        Warm-starts the Q-table after the layout was edited around ``cells``.
+        Only the entries whose transitions changed, and the states upstream
+        whose values depend on them, are backed up; everything else keeps
+        what was learned. The replay buffer and the returns in progress, if
+        any, are cleared, since they describe the old layout. Returns the
+        ``sweep_changes`` statistics.
+        """
+        if self.replay is not None:
+            self.replay.clear()
+        if self.returns is not None:
+            self.returns.reset()
+        return sweep_changes(self.env, self.q_values, self.gamma, cells, tolerance)
+
+    def reset(self):
+        """Resets the agent's state for a new training episode."""
+        self.state_index = self.env.state_index(self.start_state)
+        self.trail.clear()
+        if self.returns is not None:
+            self.returns.reset()
+        self.episode_steps = 0
+        self.episode_return = 0.0
+        self.episode_max_delta = 0.0
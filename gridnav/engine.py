@@ -0,0 +1,144 @@
+import threading
+import time
+
+
+class TrainingEngine:
+    """
+    Drives a QLearningAgent through its training episodes without any display.
+
+    The same engine runs headless (``run``), inside a render loop with a time
+    budget per frame (``run_for``), or on its own thread (``start``/``stop``)
+    while a renderer reads ``snapshot``.
+
+    ``episodes`` is an upper bound; with a ``ConvergenceMonitor`` training
+    also stops as soon as the monitor reports convergence. A ``Telemetry``
+    gets a record of every finished episode and, if it asks for them, the
+    agent's phase times.
+    """
+    def __init__(self, agent, episodes, starts=None, convergence=None, telemetry=None):
+        self.agent = agent
+        self.episodes = episodes
+        self.convergence = convergence
+        self.telemetry = telemetry
+        agent.telemetry = telemetry
+        self.starts = list(starts) if starts else [agent.start_state]
+        self.current_episode = 0
+        self.total_steps = 0
+        self.lock = threading.Lock()
+        self._chunk = 64
+        self._thread = None
+        self._stop_event = threading.Event()
+
+        self.agent.start_state = self.starts[0]
+        self.agent.reset()
+
+    @property
+    def finished(self):
+        if self.convergence is not None and self.convergence.converged:
+            return True
+        return self.current_episode >= self.episodes
+
+    def _finish_episode(self, length, max_delta, episode_return):
+        """Counts a finished episode and feeds the convergence monitor and telemetry, if any."""
+        agent = self.agent
+        if self.telemetry is not None:
+            self.telemetry.episode(self.current_episode, self.starts[self.current_episode % len(self.starts)], length,
+                                   episode_return, max_delta / agent.alpha, agent.epsilon)
+        self.current_episode += 1
+        if self.convergence is not None:
+            paths = [agent.find_best_path(start) for start in self.starts]
+            solved = all(agent.env.is_goal(path[-1]) for path in paths)
+            self.convergence.update(max_delta, tuple(map(tuple, paths)), solved)
+
+    def step(self, max_steps=1):
+        """Takes up to ``max_steps`` steps and returns how many were taken."""
+        agent = self.agent
+        taken = 0
+        with self.lock:
+            while taken < max_steps and not self.finished:
+                taken += 1
+                if agent.take_step():
+                    self._finish_episode(agent.episode_steps, agent.episode_max_delta, agent.episode_return)
+                    if not self.finished:
+                        agent.start_state = self.starts[self.current_episode % len(self.starts)]
+                        agent.reset()
+            self.total_steps += taken
+        return taken
+
+    def run(self):
+        """Trains at full speed until every episode is finished."""
+        agent = self.agent
+        # Finish an episode already in progress step by step
+        while not self.finished and agent.current_state != agent.start_state:
+            self.step()
+        with self.lock:
+            if not self.finished:
+                offset = self.current_episode % len(self.starts)
+
+                def on_episode(length, max_delta, episode_return):
+                    self._finish_episode(length, max_delta, episode_return)
+                    return self.finished
+
+                stats = agent.run_episodes(self.episodes - self.current_episode,
+                                           starts=self.starts[offset:] + self.starts[:offset],
+                                           on_episode=on_episode)
+                self.total_steps += stats["steps"]
+                agent.start_state = self.starts[(self.current_episode - 1) % len(self.starts)]
+        return self.total_steps
+
+    def run_for(self, seconds):
+        """
+        Trains for roughly ``seconds`` of wall time. The chunk size between
+        clock checks adapts so that checking the clock stays cheap.
+        """
+        deadline = time.perf_counter() + seconds
+        taken = 0
+        while not self.finished:
+            chunk_started = time.perf_counter()
+            if chunk_started >= deadline:
+                break
+            taken += self.step(self._chunk)
+            elapsed = time.perf_counter() - chunk_started
+            # Keep each chunk between an eighth and a half of the budget
+            if elapsed < seconds / 8:
+                self._chunk = min(self._chunk * 2, 1 << 16)
+            elif elapsed > seconds / 2 and self._chunk > 1:
+                self._chunk //= 2
+        return taken
+
+    def start(self):
+        """Starts training on a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._train_in_background, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background thread, if any, and waits for it to exit."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _train_in_background(self):
+        while not self._stop_event.is_set() and not self.finished:
+            self.step(self._chunk)
+            # Give the render thread a chance to take the lock
+            time.sleep(0)
+
+    def snapshot(self):
+        """
+        Returns a consistent copy of the state a renderer needs. ``trail`` is
+        at most the agent's trail capacity of state indices, oldest first, and
+        ``trail_total`` counts every move of the episode so far.
+        """
+        with self.lock:
+            return {
+                "state": self.agent.current_state,
+                "trail": self.agent.trail.recent(),
+                "trail_total": self.agent.trail.total,
+                "episode": self.current_episode,
+                "converged": self.convergence is not None and self.convergence.converged,
+                "finished": self.finished,
+            }
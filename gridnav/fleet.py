@@ -0,0 +1,107 @@
+import time
+
+import numpy as np
+
+
+class Fleet:
+    """
+    Many agents on one GridWorld, sharing one Q-table and advanced together
+    by a single vectorized step.
+
+    Agent ``i`` starts from ``starts[i % len(starts)]`` and goes back there
+    whenever it reaches any of the world's goals. Every step costs a fixed
+    number of array operations over the agents, so throughput grows almost
+    linearly with their number. When several agents update the same Q-entry
+    in one step, the entry moves by the mean of their updates. Summing them
+    would overshoot with a fleet crowded around a start.
+
+    With ``collisions=True`` two agents never share a cell, except on starts
+    and goals: ``occupancy`` counts the agents per state, a move into an
+    occupied cell fails, and of several agents moving into the same free cell
+    only the one with the lowest index gets there. A failed move is treated
+    like running into an obstacle. Conflicts are found through the occupancy
+    grid and one sort of the moving agents, never by comparing pairs.
+    """
+    def __init__(self, env, alpha, gamma, epsilon, starts, n_agents, seed=None, q_table=None, collisions=False):
+        self.env = env
+        self.alpha = alpha
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.rng = np.random.default_rng(seed)
+        self.q_table = q_table if q_table is not None else np.zeros(env.q_shape)
+        self.q_values = self.q_table.reshape(env.n_states, len(env.actions))
+        start_states = np.array([env.state_index(start) for start in starts], dtype=np.int64)
+        self.start_states = start_states[np.arange(n_agents) % len(start_states)]
+        self.states = self.start_states.copy()
+        self.collisions = collisions
+        self.occupancy = np.zeros(env.n_states, dtype=np.int32)
+        np.add.at(self.occupancy, self.states, 1)
+        # Cells where agents may stack: the starts they respawn on and the goals they leave from
+        self.shared = env.terminal.copy()
+        self.shared[start_states] = True
+        self.episodes = np.zeros(n_agents, dtype=np.int64)
+        self.total_steps = 0
+        self.collided = 0
+
+    @property
+    def n_agents(self):
+        return len(self.states)
+
+    def positions(self):
+        """``(x, y)`` arrays of every agent's cell."""
+        return self.env.cell_arrays(self.states)
+
+    def step(self):
+        """Advances every agent by one step and returns the mask of agents that reached a goal."""
+        env = self.env
+        states = self.states
+        q = self.q_values
+        explore, pick = self.rng.random((2, len(states)))
+        actions = np.where(explore < self.epsilon, (pick * len(env.actions)).astype(np.int64),
+                           q[states].argmax(axis=1))
+        targets = env.transitions[states, actions].astype(np.int64)
+        rewards = env.reward_values[env.reward_codes[states, actions]]
+
+        if self.collisions:
+            moving = np.flatnonzero((targets != states) & ~self.shared[targets])
+            blocked = self.occupancy[targets[moving]] > 0
+            # Of several agents heading for the same cell, the first in index order wins
+            order = moving[np.argsort(targets[moving], kind="stable")]
+            contested = np.zeros(len(states), dtype=bool)
+            contested[order[1:][targets[order[1:]] == targets[order[:-1]]]] = True
+            failed = moving[blocked | contested[moving]]
+            targets[failed] = states[failed]
+            rewards[failed] = env.OBSTACLE_PENALTY
+            self.collided += failed.size
+            moved = targets != states
+            np.add.at(self.occupancy, states[moved], -1)
+            np.add.at(self.occupancy, targets[moved], 1)
+
+        deltas = self.alpha * (rewards + self.gamma * q[targets].max(axis=1) - q[states, actions])
+        entries, inverse = np.unique(states * len(env.actions) + actions, return_inverse=True)
+        q.reshape(-1)[entries] += np.bincount(inverse, weights=deltas) / np.bincount(inverse)
+
+        done = env.terminal[targets]
+        self.states = np.where(done, self.start_states, targets)
+        if self.collisions and done.any():
+            np.add.at(self.occupancy, targets[done], -1)
+            np.add.at(self.occupancy, self.start_states[done], 1)
+        self.episodes += done
+        self.total_steps += len(states)
+        return done
+
+    def run(self, ticks):
+        """Takes ``ticks`` steps with every agent and returns throughput statistics."""
+        started = time.perf_counter()
+        for _ in range(ticks):
+            self.step()
+        seconds = time.perf_counter() - started
+        steps = ticks * self.n_agents
+        return {
+            "agents": self.n_agents,
+            "ticks": ticks,
+            "steps": steps,
+            "episodes": int(self.episodes.sum()),
+            "seconds": seconds,
+            "steps_per_sec": steps / seconds if seconds > 0 else float("inf"),
+        }
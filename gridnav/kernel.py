@@ -0,0 +1,155 @@
+import time
+
+import numpy as np
+
+
+def run_episodes(q_table, transitions, rewards, terminal, starts, n_episodes, rng,
+                 alpha, gamma, epsilon, block_size=4096, max_steps=None, on_episode=None, visit_counts=None,
+                 replay=None, returns=None, reward_values=None):
+    """
+    Runs whole Q-learning episodes without returning to NumPy per step.
+
+    ``q_table`` is updated in place and may have any shape whose flat layout is
+    ``(n_states, n_actions)``; ``transitions``, ``rewards`` and ``terminal``
+    are the compiled GridWorld tables and ``starts`` are flat state indices,
+    used in turn, one per episode. Random numbers are drawn from ``rng`` in
+    blocks, two per step, in the same order as ``QLearningAgent`` with the same
+    generator, so the resulting Q-table is identical. The generator is left
+    ahead of the last draw actually used.
+
+    With ``reward_values``, ``rewards`` holds integer codes into it, like
+    ``GridWorld.reward_codes``; a plain float table is encoded that way once
+    per call.
+
+    Stops early after ``max_steps`` steps, if given, which guards against
+    layouts where the goal is unreachable, or when ``on_episode(length,
+    max_delta, episode_return)`` returns True after a finished episode;
+    ``max_delta`` is the largest absolute Q-update of that episode and
+    ``episode_return`` the sum of its rewards.
+
+    ``visit_counts``, an ``int32`` array with one entry per state, is
+    incremented for the state every step ends in.
+
+    With a ``ReplayBuffer`` as ``replay``, every step is stored in it and
+    followed by its planning updates, like ``QLearningAgent.take_step`` does.
+    Those run in NumPy, so they cost far more than the step itself.
+
+    With an ``NStepReturns`` or ``EligibilityTraces`` as ``returns``, it
+    makes every update in place of the one-step one and is reset at the
+    start of each episode; it runs in NumPy too.
+
+    Memoryviews cannot index half floats, so a float16 ``q_table`` is trained
+    through a float32 working copy that is stored back before each
+    ``on_episode`` call and at the end.
+    """
+    n_actions = transitions.shape[-1]
+    if not q_table.flags.c_contiguous or q_table.dtype not in (np.float64, np.float32, np.float16):
+        raise ValueError("q_table must be a C-contiguous float64, float32 or float16 array")
+    table = q_table.reshape(-1)
+    work = table.astype(np.float32) if table.dtype == np.float16 else table
+    # Memoryviews hand back plain Python numbers, so nothing is boxed per step
+    q = memoryview(work)
+    next_state = memoryview(np.ascontiguousarray(transitions, dtype=np.int32).reshape(-1))
+    if reward_values is None:
+        reward_values, rewards = np.unique(rewards, return_inverse=True)
+    code = memoryview(np.ascontiguousarray(rewards).reshape(-1))
+    reward = [float(value) for value in reward_values]
+    done = memoryview(np.ascontiguousarray(terminal, dtype=bool).reshape(-1))
+    if visit_counts is None:
+        visit_counts = np.zeros(len(done), dtype=np.int32)
+    visits = memoryview(visit_counts)
+    planned = work.reshape(-1, n_actions) # The same memory as ``q``, for the vectorized replay updates
+    starts = [int(s) for s in starts]
+    action_range = range(1, n_actions)
+
+    draws = []
+    cursor = 0
+    steps = 0
+    completed = 0
+    episode_steps = []
+    episode_max_delta = []
+    episode_return = []
+    state = starts[0]
+    started = time.perf_counter()
+    for episode in range(n_episodes):
+        state = starts[episode % len(starts)]
+        if returns is not None:
+            returns.reset()
+        length = 0
+        max_delta = 0.0
+        total_reward = 0.0
+        while max_steps is None or steps < max_steps:
+            if cursor == len(draws):
+                draws = rng.random(2 * block_size).tolist()
+                cursor = 0
+            explore = draws[cursor]
+            pick = draws[cursor + 1]
+            cursor += 2
+
+            base = state * n_actions
+            greedy = True
+            if explore < epsilon:
+                action = int(pick * n_actions)
+                if returns is not None:
+                    for a in range(n_actions):
+                        if q[base + a] > q[base + action]:
+                            greedy = False
+                            break
+            else:
+                action = 0
+                best = q[base]
+                for a in action_range:
+                    if q[base + a] > best:
+                        best = q[base + a]
+                        action = a
+
+            i = base + action
+            state = next_state[i]
+            visits[state] += 1
+            target_base = state * n_actions
+            target = q[target_base]
+            for a in action_range:
+                if q[target_base + a] > target:
+                    target = q[target_base + a]
+            r = reward[code[i]]
+            total_reward += r
+            if returns is None:
+                delta = alpha * (r + gamma * target - q[i])
+                q[i] += delta
+            else:
+                delta = returns.step(planned, base // n_actions, action, r, state, done[state], greedy, alpha, gamma)
+            if delta > max_delta or -delta > max_delta:
+                max_delta = abs(delta)
+            if replay is not None:
+                replay.add(base // n_actions, action, r, state)
+                replay.plan(planned, alpha, gamma)
+
+            length += 1
+            steps += 1
+            if done[state]:
+                completed += 1
+                break
+        episode_steps.append(length)
+        episode_max_delta.append(max_delta)
+        episode_return.append(total_reward)
+        if completed <= episode:
+            break
+        if on_episode is not None:
+            if work is not table:
+                table[:] = work
+            if on_episode(length, max_delta, total_reward):
+                break
+    if work is not table:
+        table[:] = work
+
+    seconds = time.perf_counter() - started
+    return {
+        "episodes": completed,
+        "episode_steps": episode_steps,
+        "episode_max_delta": episode_max_delta,
+        "episode_return": episode_return,
+        "final_state": state,
+        "steps": steps,
+        "seconds": seconds,
+        "steps_per_sec": steps / seconds if seconds > 0 else float("inf"),
+    }
@@ -0,0 +1,215 @@
+import numpy as np
+
+from gridnav.core import GridWorld
+
+# The 15x10 map shared by main.py and update_GUI.py
+DEFAULT_LAYOUT = {
+    "name": "default",
+    "width": 15,
+    "height": 10,
+    "starts": [(0, 0), (14, 0), (0, 9), (14, 9)],
+    "end": (8, 6),
+    "obstacles": [
+        (1, 3), (4, 1), (6, 6), (8, 3), (3, 5), (7, 4),
+        (10, 2), (12, 6), (11, 1), (13, 7), (5, 8),
+        (7, 6), (2, 9), (6, 2), (1, 6), (2, 4), (4, 4),
+        (5, 5), (6, 7), (8, 5), (9, 7), (10, 4), (11, 6)
+    ],
+    "actions": [(0, 1), (0, -1), (1, 0), (-1, 0)],
+}
+
+
+def make_env(layout, start=None):
+    """Builds a GridWorld from a layout dict, starting at ``start`` or the layout's first start."""
+    if start is None:
+        start = layout["starts"][0]
+    return GridWorld(layout["width"], layout["height"], start, layout["end"], layout["obstacles"], layout["actions"])
+
+
+# --- Generated layouts ---
+# Masks are (width, height) bool arrays, True where a cell is blocked, and
+# connectivity is four-neighbour like the default actions.
+def random_mask(width, height, density=0.2, rng=None):
+    """Each cell blocked with probability ``density``."""
+    rng = np.random.default_rng(rng)
+    return rng.random((width, height)) < density
+
+
+def _spanning_tree(cols, rows, rng):
+    """
+    A random spanning tree of a ``cols`` x ``rows`` lattice, made by the
+    sidewinder algorithm in a handful of array operations. Returns the
+    ``east`` edges, from ``(i, j)`` to ``(i + 1, j)``, and the ``north``
+    edges, from ``(i, j)`` to ``(i, j - 1)``, as bool arrays of shape
+    ``(cols, rows)``.
+    """
+    east = rng.random((cols, rows)) < 0.5
+    east[:, 0] = True # The first row is one long run
+    east[-1, :] = False
+    # Every row is cut into runs that end where no east edge leaves; each run
+    # in all but the first row joins the row above through one random cell
+    x = np.arange(cols)[:, None]
+    last_end = np.maximum.accumulate(np.where(east, -1, x), axis=0)
+    first = np.zeros((cols, rows), dtype=np.int64)
+    first[1:] = last_end[:-1] + 1
+    ends = np.nonzero(~east[:, 1:])
+    rows_of_ends = ends[1] + 1
+    starts = first[ends[0], rows_of_ends]
+    picks = starts + (rng.random(starts.size) * (ends[0] - starts + 1)).astype(np.int64)
+    north = np.zeros((cols, rows), dtype=bool)
+    north[picks, rows_of_ends] = True
+    return east, north
+
+
+def maze_mask(width, height, rng=None):
+    """
+    A perfect maze: passages on the even cells, walls in between, and
+    exactly one route between any two passage cells. With an even size the
+    last column or row copies the one before it, so the corners stay open.
+    """
+    rng = np.random.default_rng(rng)
+    cols, rows = (width + 1) // 2, (height + 1) // 2
+    east, north = _spanning_tree(cols, rows, rng)
+    mask = np.ones((width, height), dtype=bool)
+    mask[0:2 * cols:2, 0:2 * rows:2] = False
+    i, j = np.nonzero(east)
+    mask[2 * i + 1, 2 * j] = False
+    i, j = np.nonzero(north)
+    mask[2 * i, 2 * j - 1] = False
+    if width % 2 == 0:
+        mask[-1] = mask[-2]
+    if height % 2 == 0:
+        mask[:, -1] = mask[:, -2]
+    return mask
+
+
+def _bands(size, room, wall):
+    """First cells of the walls that cut ``size`` cells into rooms of ``room`` cells, and where the rooms start."""
+    walls = np.arange(room, size - wall, room + wall)
+    return walls, np.concatenate([[0], walls + wall])
+
+
+def rooms_mask(width, height, room=8, wall=1, loops=0.1, rng=None):
+    """
+    Rooms of ``room`` x ``room`` cells separated by walls ``wall`` cells
+    thick. Neighbouring rooms are joined by a door, a one-cell corridor
+    through the wall, along a random spanning tree of the rooms, so every
+    room can be reached, plus a fraction ``loops`` of the remaining walls.
+    Rooms at the right and bottom edges take whatever width is left.
+    """
+    rng = np.random.default_rng(rng)
+    wall_x, room_x = _bands(width, room, wall)
+    wall_y, room_y = _bands(height, room, wall)
+    end_x = np.append(wall_x, width)
+    end_y = np.append(wall_y, height)
+    mask = np.zeros((width, height), dtype=bool)
+    for x in wall_x:
+        mask[x:x + wall] = True
+    for y in wall_y:
+        mask[:, y:y + wall] = True
+    east, north = _spanning_tree(len(room_x), len(room_y), rng)
+    east |= rng.random(east.shape) < loops
+    north |= rng.random(north.shape) < loops
+    through = np.arange(wall)
+    i, j = np.nonzero(east[:-1])
+    door = room_y[j] + (rng.random(j.size) * (end_y[j] - room_y[j])).astype(np.int64)
+    mask[(wall_x[i][:, None] + through).ravel(), np.repeat(door, wall)] = False
+    i, j = np.nonzero(north[:, 1:])
+    door = room_x[i] + (rng.random(i.size) * (end_x[i] - room_x[i])).astype(np.int64)
+    mask[np.repeat(door, wall), (wall_y[j][:, None] + through).ravel()] = False
+    return mask
+
+
+def components(mask):
+    """
+    Labels the four-connected regions of free cells: a ``(width, height)``
+    int array holding, for every free cell, the smallest flat index in its
+    region, and -1 on blocked cells (every cell of a fully blocked mask).
+
+    Runs of free cells along a column are merged first with one cumulative
+    sum; the runs are then joined across columns by hooking every region
+    onto its smallest neighbour and jumping pointers until nothing changes.
+    Each round at least halves the number of regions, so a 1000x1000 map
+    takes a few dozen array passes rather than one per step of a flood fill.
+    """
+    if mask.all():
+        # No free cells, so no runs to label
+        return np.full(mask.shape, -1, dtype=np.int64)
+    free = ~mask
+    opens = free.copy()
+    opens[:, 1:] &= mask[:, :-1]
+    run_starts = np.flatnonzero(opens)
+    run_of = np.cumsum(opens, dtype=np.int32).reshape(-1) - 1
+    # Free neighbours in the next column, as pairs of runs; along two runs
+    # that touch for many cells only the first of those cells is kept
+    touch = free[:-1] & free[1:]
+    first = touch.copy()
+    first[:, 1:] &= ~touch[:, :-1] | opens[:-1, 1:] | opens[1:, 1:]
+    cells = np.flatnonzero(first)
+    u, v = run_of[cells], run_of[cells + mask.shape[1]]
+    parent = np.arange(run_starts.size, dtype=np.int32)
+    while u.size:
+        pu, pv = parent[u], parent[v]
+        apart = pu != pv
+        u, v, pu, pv = u[apart], v[apart], pu[apart], pv[apart]
+        if not u.size:
+            break
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+    labels = run_starts[parent][run_of].reshape(mask.shape)
+    labels[mask] = -1
+    return labels
+
+
+def reachable(mask, start):
+    """Bool mask of the free cells reachable from ``start``."""
+    labels = components(mask)
+    return (labels == labels[start]) & ~mask
+
+
+def connected(mask, cells):
+    """True if every cell in ``cells`` is free and all of them lie in one region."""
+    cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+    labels = components(mask)[cells[:, 0], cells[:, 1]]
+    return bool(labels[0] >= 0 and (labels == labels[0]).all())
+
+
+GENERATORS = {"random": random_mask, "maze": maze_mask, "rooms": rooms_mask}
+
+
+def generate_layouts(kind, width, height, count=None, starts=None, end=None, seed=None, max_attempts=100,
+                     **options):
+    """
+    Lazily yields ``count`` layout dicts (forever if None) with obstacle
+    masks from the ``kind`` generator in ``GENERATORS``, called with
+    ``options`` (e.g. ``density=0.3`` for "random"). Starts default to three
+    corners and ``end`` to the fourth; their cells are always cleared.
+
+    A mask where some start cannot reach the goal is rejected and redrawn
+    before anyone trains on it; ValueError is raised after ``max_attempts``
+    rejections in a row. ``seed`` may be an int or a NumPy Generator, and
+    the same seed yields the same sequence of layouts.
+    """
+    rng = np.random.default_rng(seed)
+    generator = GENERATORS[kind]
+    if starts is None:
+        starts = [(0, 0), (width - 1, 0), (0, height - 1)]
+    if end is None:
+        end = (width - 1, height - 1)
+    cells = np.array(list(starts) + [end], dtype=np.int64)
+    produced = 0
+    while count is None or produced < count:
+        for _ in range(max_attempts):
+            mask = generator(width, height, rng=rng, **options)
+            mask[cells[:, 0], cells[:, 1]] = False
+            if connected(mask, cells):
+                break
+        else:
+            raise ValueError(f"no solvable {kind} layout of {width}x{height} in {max_attempts} attempts")
+        yield {"name": f"{kind}-{width}x{height}-{produced}", "width": width, "height": height,
+               "starts": list(starts), "end": end, "obstacles": mask, "actions": DEFAULT_LAYOUT["actions"]}
+        produced += 1
@@ -0,0 +1,198 @@
+import heapq
+import time
+
+import numpy as np
+
+
+class Planner:
+    """
+    Model-based solver over a GridWorld's compiled tables.
+
+    The environment is known and deterministic, so instead of sampling it the
+    planner backs up ``Q(s, a) = r(s, a) + gamma * max Q(s', .)`` directly,
+    with the goal's row pinned at zero like in Q-learning. ``q_table`` has the
+    same ``env.q_shape`` as ``QLearningAgent.q_table``, so
+    it can be handed to an agent (``q_table=planner.q_table``) and used by
+    ``find_best_path`` or the GUI unchanged.
+
+    ``solve`` runs vectorized value iteration over the whole grid. After the
+    layout is edited, ``replan`` runs prioritized sweeping from the edited
+    cells and only backs up states whose values actually change.
+    """
+    def __init__(self, env, gamma, tolerance=1e-6, q_table=None):
+        self.env = env
+        self.gamma = gamma
+        self.tolerance = tolerance
+        self.q_table = q_table if q_table is not None else np.zeros(env.q_shape)
+        self.q_values = self.q_table.reshape(env.n_states, len(env.actions))
+        self.sweeps = 0
+        self.updates = 0
+
+    def _state_values(self, states):
+        values = self.q_values[states].max(axis=-1)
+        return np.where(self.env.terminal[states], 0.0, values)
+
+    def _backup(self, states):
+        """Bellman backup of the given rows, with terminal rows held at zero."""
+        env = self.env
+        rows = env.reward_values[env.reward_codes[states]] + self.gamma * self._state_values(env.transitions[states])
+        rows[env.terminal[states]] = 0.0
+        return rows
+
+    def solve(self, max_sweeps=None):
+        """
+        Runs value iteration until no Q-value moves by more than ``tolerance``
+        (or for ``max_sweeps`` sweeps) and returns timing statistics.
+        """
+        started = time.perf_counter()
+        states = np.arange(self.env.n_states)
+        sweeps = 0
+        while max_sweeps is None or sweeps < max_sweeps:
+            rows = self._backup(states)
+            change = np.abs(rows - self.q_values).max()
+            self.q_values[:] = rows
+            sweeps += 1
+            if change <= self.tolerance:
+                break
+        self.sweeps += sweeps
+        self.updates += sweeps * self.env.n_states
+        seconds = time.perf_counter() - started
+        return {"sweeps": sweeps, "updates": sweeps * self.env.n_states, "seconds": seconds}
+
+    def replan(self, cells, max_updates=None):
+        """
+        Re-converges after the tables around ``cells`` changed, e.g. after
+        ``env.toggle_obstacle``, by prioritized sweeping from those cells.
+        """
+        stats = sweep_changes(self.env, self.q_values, self.gamma, cells, self.tolerance, max_updates)
+        self.updates += stats["updates"]
+        return stats
+
+
+def _predecessors(env, state):
+    """States with at least one action that leads into ``state``."""
+    return [p for p in env.affected_states([env.cell(state)]) if (env.transitions[p] == state).any()]
+
+
+def _changed_actions(env, state, cells):
+    """Actions of ``state`` whose transition or reward depends on one of ``cells``."""
+    x, y = env.cell(state)
+    if (x, y) in cells:
+        return np.arange(len(env.actions))
+    return np.array([a for a, (dx, dy) in enumerate(env.actions) if (x + dx, y + dy) in cells], dtype=np.intp)
+
+
+def sweep_changes(env, q_values, gamma, cells, tolerance=1e-6, max_updates=None):
+    """
+    Prioritized sweeping after a layout edit around ``cells``.
+
+    Only the Q-entries whose transition or reward involves an edited cell are
+    backed up first. From there a change only spreads to the entries that
+    step into a state whose value moved by more than ``tolerance``, largest
+    change first, so the work scales with the region that depends on the
+    edit rather than with the grid. ``q_values`` is the flat
+    ``(n_states, n_actions)`` table, updated in place; it may be a converged
+    planner table or a partly trained Q-learning table.
+
+    The heap holds one live entry per state, raised when the state moves
+    again before it is popped, and each state passes its value on at most
+    once per pass. A state that moves again after that sits in a cycle of
+    touched states, e.g. inside a pocket the edit sealed off, whose values
+    only approach their new level by a factor of ``gamma`` per round. Those
+    rounds run as vectorized sweeps over just the touched entries, and then
+    whatever moved is passed on again. ``touched`` in the returned
+    statistics counts the distinct states whose entries changed, ``updates``
+    the backups made state by state and ``sweeps`` the vectorized ones.
+    """
+    started = time.perf_counter()
+    cells = set(cells)
+    terminal = env.terminal
+    transitions = env.transitions
+    codes, reward_values = env.reward_codes, env.reward_values
+    n_actions = q_values.shape[1]
+
+    def value(state):
+        return 0.0 if terminal[state] else q_values[state].max()
+
+    heap = []
+    queued = {} # State -> priority of its live heap entry
+    passed = {} # State -> value its predecessors were last backed up from, this pass
+    moved_again = False
+    entries = set() # Flat indices of the non-terminal entries changed so far
+    touched = set()
+    updates = 0
+    sweeps = 0
+
+    def update(state, actions, target):
+        """Sets the given entries and queues the state if its value moved."""
+        nonlocal updates, moved_again
+        before = value(state)
+        if terminal[state]:
+            q_values[state] = 0.0
+        else:
+            q_values[state, actions] = target
+            entries.update((state * n_actions + np.asarray(actions)).tolist())
+        touched.add(state)
+        updates += 1
+        change = abs(value(state) - before)
+        if change <= tolerance:
+            return
+        if state in passed:
+            moved_again = True
+        elif change > queued.get(state, 0.0):
+            queued[state] = change
+            heapq.heappush(heap, (-change, state))
+
+    def settle():
+        """Sweeps the changed entries until they stop moving; returns each touched state's move since passed on."""
+        nonlocal sweeps
+        flat = np.fromiter(entries, dtype=np.int64, count=len(entries))
+        states, actions = np.divmod(flat, n_actions)
+        targets, reward = transitions[states, actions], reward_values[codes[states, actions]]
+        reference = {state: passed.get(state, value(state)) for state in touched}
+        while True:
+            values = np.where(terminal[targets], 0.0, q_values[targets].max(axis=1))
+            backup = reward + gamma * values
+            change = np.abs(backup - q_values[states, actions]).max()
+            q_values[states, actions] = backup
+            sweeps += 1
+            if change <= tolerance:
+                break
+        return [(abs(value(state) - before), state) for state, before in reference.items()]
+
+    for state in env.affected_states(cells):
+        actions = _changed_actions(env, state, cells)
+        values = np.array([value(t) for t in transitions[state, actions]])
+        target = reward_values[codes[state, actions]] + gamma * values
+        if terminal[state] or np.abs(target - q_values[state, actions]).max(initial=0.0) > tolerance:
+            update(state, actions, target)
+
+    while max_updates is None or updates < max_updates:
+        if not heap:
+            if not moved_again:
+                break
+            # The heap only runs dry between passes, so nothing is queued yet
+            moved = settle()
+            passed.clear()
+            moved_again = False
+            for change, state in moved:
+                if change > tolerance:
+                    queued[state] = change
+                    heap.append((-change, state))
+            heapq.heapify(heap)
+            continue
+        priority, state = heapq.heappop(heap)
+        if queued.get(state) != -priority:
+            continue # Superseded by a higher priority entry
+        del queued[state]
+        target_value = passed[state] = value(state)
+        for p in _predecessors(env, state):
+            if terminal[p]:
+                continue
+            actions = np.flatnonzero(transitions[p] == state)
+            target = reward_values[codes[p, actions]] + gamma * target_value
+            if np.abs(target - q_values[p, actions]).max() > tolerance:
+                update(p, actions, target)
+
+    seconds = time.perf_counter() - started
+    return {"updates": updates, "sweeps": sweeps, "touched": len(touched), "pending": len(queued), "seconds": seconds}
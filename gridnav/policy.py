@@ -0,0 +1,119 @@
+import numpy as np
+
+
+class GreedyPolicy:
+    """
+    The greedy policy of a Q-table, evaluated once for every state and then
+    queried for whole batches of starts.
+
+    ``actions`` holds the argmax action of every state (the first one on
+    ties, like ``QLearningAgent.find_best_path``) and ``next_states`` where
+    it leads. Following the policy from any state either reaches the goal, or
+    gets stuck in a state whose greedy move is blocked (a dead end), or
+    circles forever. The first query classifies every state that way in one
+    pass and caches its distance to the goal, so each query afterwards costs
+    O(1) per start for lengths and O(path length) for paths.
+
+    A dense world also has states for its obstacle cells. Those are
+    ``BLOCKED``: like ``QLearningAgent.trace_path``, which reports them as
+    unreachable, they get no length and no path, even where the Q-table's
+    untrained row would lead off the obstacle.
+
+    The policy is a snapshot: build a new one after the Q-table or the
+    layout changes.
+    """
+    REACHES_GOAL, DEAD_END, CYCLE, BLOCKED = 0, 1, 2, 3
+
+    def __init__(self, env, q_values):
+        self.env = env
+        q_values = q_values.reshape(env.n_states, len(env.actions))
+        self.actions = q_values.argmax(axis=1).astype(np.int32)
+        self.next_states = env.transitions[np.arange(env.n_states), self.actions]
+        self._distances = None
+        self._fates = None
+
+    def _analyse(self):
+        """Fills the distance and fate of every state by searching backwards from the goal and the dead ends."""
+        env = self.env
+        n = env.n_states
+        states = np.arange(n)
+        blocked = env.blocked.reshape(-1)
+        if env.cells is not None:
+            blocked = blocked[env.cells]
+        # No move enters an obstacle, so leaving its states out of the search cuts no other path
+        active = ~env.terminal & ~blocked
+        following = active & (self.next_states != states)
+        # Predecessors of every state under the policy, in CSR form
+        sources = np.flatnonzero(following)
+        targets = self.next_states[sources]
+        order = sources[np.argsort(targets, kind="stable")]
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(targets, minlength=n), out=indptr[1:])
+
+        distances = np.full(n, -1, dtype=np.int32)
+        fates = np.full(n, self.CYCLE, dtype=np.int8)
+        for fate, roots in ((self.REACHES_GOAL, np.flatnonzero(env.terminal)),
+                            (self.DEAD_END, np.flatnonzero(active & ~following))):
+            frontier = roots
+            level = 0
+            # Every state has one successor, so no state is reached twice
+            while frontier.size:
+                fates[frontier] = fate
+                if fate == self.REACHES_GOAL:
+                    distances[frontier] = level
+                first, counts = indptr[frontier], indptr[frontier + 1] - indptr[frontier]
+                offsets = np.repeat(first - np.cumsum(counts) + counts, counts)
+                frontier = order[offsets + np.arange(offsets.size)]
+                level += 1
+        fates[blocked] = self.BLOCKED
+        self._distances, self._fates = distances, fates
+
+    @property
+    def distances(self):
+        """Greedy steps from every state to the goal, -1 where the policy never gets there."""
+        if self._distances is None:
+            self._analyse()
+        return self._distances
+
+    @property
+    def state_fates(self):
+        """``REACHES_GOAL``, ``DEAD_END``, ``CYCLE`` or ``BLOCKED`` for every state."""
+        if self._fates is None:
+            self._analyse()
+        return self._fates
+
+    def states_of(self, starts):
+        """State indices of an ``(n, 2)`` array or list of start cells."""
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+        return self.env.state_indices(starts[:, 0], starts[:, 1])
+
+    def lengths(self, starts):
+        """Path length from each start, -1 where the greedy path never reaches the goal or the start is blocked."""
+        return self.distances[self.states_of(starts)]
+
+    def fates(self, starts):
+        """``REACHES_GOAL``, ``DEAD_END``, ``CYCLE`` or ``BLOCKED`` for each start."""
+        return self.state_fates[self.states_of(starts)]
+
+    def paths(self, starts):
+        """
+        Greedy paths from each start as ``(length + 1, 2)`` arrays of cells,
+        or None where the path never reaches the goal or the start is
+        blocked. All paths are followed together, one vectorized step at a
+        time.
+        """
+        states = self.states_of(starts)
+        lengths = self.distances[states]
+        reachable = np.flatnonzero(lengths >= 0)
+        paths = [None] * len(states)
+        if not reachable.size:
+            return paths
+        walk = np.empty((int(lengths[reachable].max()) + 1, reachable.size), dtype=np.int64)
+        walk[0] = states[reachable]
+        for step in range(1, len(walk)):
+            walk[step] = self.next_states[walk[step - 1]]
+        xs, ys = self.env.cell_arrays(walk)
+        for column, i in enumerate(reachable):
+            end = lengths[i] + 1
+            paths[i] = np.stack([xs[:end, column], ys[:end, column]], axis=1)
+        return paths
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class ReplayBuffer:
+    """
+    The last ``capacity`` transitions ``(state, action, reward, next_state)``
+    an agent took, in preallocated NumPy rings, and the Dyna-Q planning that
+    replays them.
+
+    After every real step the agent calls ``add`` and then ``plan``, which
+    every ``planning_interval`` steps samples ``planning_steps`` batches of
+    ``batch_size`` stored transitions and applies their TD updates to the
+    Q-table, one vectorized update per batch. A batch costs about the same
+    up to a few hundred transitions, so larger batches at longer intervals
+    plan as much for less overhead per real step; the defaults are the
+    fastest setting of ``benchmarks/bench_replay.py``.
+
+    Moves on the grid are deterministic, so a stored transition is an exact
+    model of its state and action, and replaying it spreads the goal reward
+    back along the path without walking it again. A transition drawn twice
+    in one batch is applied once.
+
+    Samples come from the buffer's own generator, which leaves the agent's
+    exploration draws untouched. Transitions go stale when the layout
+    changes, so ``QLearningAgent.replan`` clears the buffer.
+    """
+    def __init__(self, capacity=100_000, batch_size=1024, planning_steps=1, planning_interval=32, seed=None):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.planning_steps = planning_steps
+        self.planning_interval = planning_interval
+        self.states = np.zeros(capacity, dtype=np.int32)
+        self.actions = np.zeros(capacity, dtype=np.int32)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int32)
+        self.total = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    @property
+    def nbytes(self):
+        return self.states.nbytes + self.actions.nbytes + self.rewards.nbytes + self.next_states.nbytes
+
+    def add(self, state, action, reward, next_state):
+        slot = self.total % self.capacity
+        self.states[slot] = state
+        self.actions[slot] = action
+        self.rewards[slot] = reward
+        self.next_states[slot] = next_state
+        self.total += 1
+
+    def clear(self):
+        self.total = 0
+
+    def sample(self, n):
+        """``n`` stored transitions drawn uniformly with replacement, as ``(states, actions, rewards, next_states)``."""
+        picks = self.rng.integers(len(self), size=n)
+        return self.states[picks], self.actions[picks], self.rewards[picks], self.next_states[picks]
+
+    def plan(self, q_values, alpha, gamma):
+        """
+        Replays ``planning_steps`` sampled batches into ``q_values``, an
+        ``(n_states, n_actions)`` array updated in place, once every
+        ``planning_interval`` transitions added, and returns the largest
+        absolute update.
+        """
+        if not self.total or self.total % self.planning_interval:
+            return 0.0
+        flat = q_values.reshape(-1)
+        largest = 0.0
+        for _ in range(self.planning_steps):
+            states, actions, rewards, next_states = self.sample(self.batch_size)
+            entries = states * q_values.shape[1] + actions
+            deltas = alpha * (rewards + gamma * q_values[next_states].max(axis=1) - flat[entries])
+            # Equal entries carry equal deltas, and fancy assignment keeps one of them
+            flat[entries] += deltas
+            largest = max(largest, float(np.abs(deltas).max()))
+        return largest
@@ -0,0 +1,350 @@
+"""
+Asyncio policy server: greedy paths for a layout and a batch of starts,
+over newline-delimited JSON on a TCP socket.
+
+A request names a layout and the starts to route from::
+
+    {"op": "paths", "id": 1, "starts": [[0, 0], [14, 9]],
+     "layout": {"width": 15, "height": 10, "end": [8, 6], "obstacles": [[1, 3], ...]}}
+
+and gets back one path per start (null on obstacles, on cells sealed off
+from the goal and wherever the greedy policy never reaches one) and its
+length (-1 there)::
+
+    {"id": 1, "key": "3f2a...", "cache": "hit", "paths": [[[0, 0], ...], null], "lengths": [18, -1]}
+
+The layout may also give ``extra_goals`` and ``actions``. ``{"op": "stats"}``
+returns the cache hit rate, p50/p99 request latency and the cache size.
+Malformed requests, grids above ``--max-cells`` cells and failed training
+jobs get ``{"id": ..., "error": "..."}`` and the connection stays open.
+
+Layouts are solved in a process pool, so the event loop keeps answering
+while a new layout trains. The solved policies are kept in an LRU cache
+keyed by ``store.key_for``, which evicts the least recently used ones once
+their memory exceeds a byte budget. Concurrent requests for a layout that
+is not cached yet share one training job. Run with
+``python -m gridnav.server [--port PORT] [--cache-mb MB] [--workers N] [--max-cells N]``.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from gridnav.core import GridWorld
+from gridnav.layouts import DEFAULT_LAYOUT
+from gridnav.planner import Planner
+from gridnav.policy import GreedyPolicy
+from gridnav.store import key_for
+
+GAMMA = 0.99
+# Requests carry whole obstacle lists, far beyond asyncio's 64 KiB default line limit
+LINE_LIMIT = 1 << 26
+# A 2000x2000 grid; the mask alone is allocated before anything else is checked
+MAX_CELLS = 4_000_000
+
+
+def parse_layout(layout, max_cells=MAX_CELLS):
+    """
+    Normalizes the ``layout`` of a request into plain tuples and a blocked
+    mask; ValueError if it is malformed or has more than ``max_cells`` cells.
+    """
+    width, height = int(layout["width"]), int(layout["height"])
+    if width <= 0 or height <= 0:
+        raise ValueError(f"grid size must be positive, got {width}x{height}")
+    if width * height > max_cells:
+        raise ValueError(f"a {width}x{height} grid exceeds the limit of {max_cells:,} cells")
+    end = tuple(map(int, layout["end"]))
+    extra_goals = [tuple(map(int, goal)) for goal in layout.get("extra_goals", ())]
+    actions = [tuple(map(int, action)) for action in layout.get("actions", DEFAULT_LAYOUT["actions"])]
+    obstacles = np.asarray(layout.get("obstacles", ()), dtype=np.int64).reshape(-1, 2)
+    inside = ((obstacles >= 0) & (obstacles < (width, height))).all(axis=1)
+    blocked = np.zeros((width, height), dtype=bool)
+    blocked[obstacles[inside, 0], obstacles[inside, 1]] = True
+    for x, y in [end, *extra_goals]:
+        if not (0 <= x < width and 0 <= y < height) or blocked[x, y]:
+            raise ValueError(f"goal {(x, y)} is not a free cell")
+    return {"width": width, "height": height, "end": end, "extra_goals": extra_goals, "actions": actions,
+            "blocked": blocked}
+
+
+def layout_env(layout):
+    """
+    The compact GridWorld of a parsed layout, searched from ``end``: cells
+    sealed off from the goal get no state, so value iteration only sweeps
+    cells that can have a path.
+    """
+    return GridWorld(layout["width"], layout["height"], layout["end"], layout["end"], layout["blocked"],
+                     layout["actions"], compact=True, extra_goals=layout["extra_goals"])
+
+
+def layout_key(layout):
+    """``store.layout_key`` of a parsed layout's world, computed without building it."""
+    return key_for(layout["width"], layout["height"], layout["end"], layout["actions"], layout["blocked"],
+                   extra_goals=layout["extra_goals"], compact_start=layout["end"])
+
+
+def route(policy, starts):
+    """
+    Lengths and paths from an ``(n, 2)`` array of starts. Starts without a
+    state (obstacles and cells sealed off from the goal) get -1 and None;
+    starts off the grid raise ValueError.
+    """
+    env = policy.env
+    xs, ys = starts[:, 0], starts[:, 1]
+    if not ((xs >= 0) & (xs < env.width) & (ys >= 0) & (ys < env.height)).all():
+        raise ValueError("a start lies outside the grid")
+    known = np.flatnonzero(env.slots[xs * env.height + ys] >= 0)
+    lengths = np.full(len(starts), -1, dtype=np.int64)
+    paths = [None] * len(starts)
+    lengths[known] = policy.lengths(starts[known])
+    for i, path in zip(known.tolist(), policy.paths(starts[known])):
+        paths[i] = path
+    return lengths, paths
+
+
+def solve_layout(layout, gamma=GAMMA):
+    """Solves a parsed layout by value iteration and returns its Q-table; runs in a worker process."""
+    planner = Planner(layout_env(layout), gamma)
+    planner.solve()
+    return planner.q_table
+
+
+def build_policy(layout, q_table):
+    """A GreedyPolicy for a solved layout, with its distances already analysed."""
+    policy = GreedyPolicy(layout_env(layout), q_table)
+    policy.distances
+    return policy
+
+
+def policy_nbytes(policy):
+    """Memory held by a cached policy: its environment's tables and the policy's own arrays."""
+    own = (policy.actions, policy.next_states, policy.distances, policy.state_fates)
+    return sum(policy.env.memory_usage().values()) + sum(array.nbytes for array in own)
+
+
+class PolicyCache:
+    """
+    Solved policies by layout key, least recently used first. ``put`` evicts
+    from the front until the entries fit in ``max_bytes``; a single policy
+    larger than the budget is still kept until the next one arrives.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.nbytes = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, policy):
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key)[1]
+        size = policy_nbytes(policy)
+        while self.entries and self.nbytes + size > self.max_bytes:
+            self.nbytes -= self.entries.popitem(last=False)[1][1]
+            self.evictions += 1
+        self.entries[key] = (policy, size)
+        self.nbytes += size
+
+
+class PolicyServer:
+    """
+    Serves greedy paths from solved layouts; see the module docstring for
+    the protocol. ``trainer(layout)`` runs in the process pool and returns a
+    Q-table for ``layout_env(layout)``; by default ``solve_layout``, which
+    gives every cell connected to the goal a path. ``query`` answers a
+    request without a socket.
+    """
+    def __init__(self, cache_bytes=256 * 2 ** 20, workers=None, trainer=solve_layout, latency_window=10_000,
+                 max_cells=MAX_CELLS):
+        self.cache = PolicyCache(cache_bytes)
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.trainer = trainer
+        self.max_cells = max_cells
+        self.pending = {}
+        self.latencies = collections.deque(maxlen=latency_window)
+        self.counts = collections.Counter()
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Starts listening and returns the bound ``(host, port)``; port 0 picks a free one."""
+        self._server = await asyncio.start_server(self._handle, host, port, limit=LINE_LIMIT)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def _policy(self, key, layout):
+        """The cached policy for ``key``, training it first if needed, and whether it was a hit, miss or coalesced."""
+        policy = self.cache.get(key)
+        if policy is not None:
+            return policy, "hit"
+        if key in self.pending:
+            # Shielded, so a client that disconnects does not cancel the job for everyone else
+            return await asyncio.shield(self.pending[key]), "coalesced"
+        task = asyncio.ensure_future(self._train(key, layout))
+        self.pending[key] = task
+        return await asyncio.shield(task), "miss"
+
+    async def _train(self, key, layout):
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        try:
+            try:
+                q_table = await loop.run_in_executor(pool, self.trainer, layout)
+            except BrokenProcessPool:
+                # A worker died, e.g. killed for memory; the jobs after this one get a fresh pool
+                if self.pool is pool:
+                    self.pool = ProcessPoolExecutor(max_workers=self.workers)
+                    pool.shutdown(wait=False)
+                raise
+            # Compiling the tables again takes a while on large maps, so it runs off the event loop too
+            policy = await loop.run_in_executor(None, build_policy, layout, q_table)
+            self.cache.put(key, policy)
+            self.counts["trained"] += 1
+            return policy
+        finally:
+            del self.pending[key]
+
+    async def query(self, message):
+        """Answers one decoded request with a response dict."""
+        started = time.perf_counter()
+        response = {"id": message.get("id")}
+        op = message.get("op", "paths")
+        if op == "stats":
+            return {**response, **self.stats()}
+        if op != "paths":
+            return {**response, "error": f"unknown op {op!r}"}
+        try:
+            layout = parse_layout(message["layout"], self.max_cells)
+            key = layout_key(layout)
+            policy, how = await self._policy(key, layout)
+            starts = np.asarray(message.get("starts", ()), dtype=np.int64).reshape(-1, 2)
+            lengths, paths = route(policy, starts)
+        except (KeyError, TypeError, ValueError) as error:
+            self.counts["errors"] += 1
+            return {**response, "error": f"{type(error).__name__}: {error}"}
+        except Exception as error:
+            # The trainer raised, its process died or memory ran out; the client still gets an answer
+            self.counts["errors"] += 1
+            return {**response, "error": f"training failed: {type(error).__name__}: {error}"}
+        self.counts[how] += 1
+        self.latencies.append(time.perf_counter() - started)
+        return {**response, "key": key, "cache": how, "lengths": lengths.tolist(),
+                "paths": [None if path is None else path.tolist() for path in paths]}
+
+    def stats(self):
+        """Request counts, cache hit rate, p50/p99 latency in milliseconds and cache occupancy."""
+        answered = self.counts["hit"] + self.counts["miss"] + self.counts["coalesced"]
+        p50, p99 = np.percentile(self.latencies, [50, 99]) * 1000 if self.latencies else (None, None)
+        return {
+            "requests": answered,
+            "hits": self.counts["hit"],
+            "misses": self.counts["miss"],
+            "coalesced": self.counts["coalesced"],
+            "errors": self.counts["errors"],
+            "trained": self.counts["trained"],
+            "hit_rate": self.counts["hit"] / answered if answered else None,
+            "p50_ms": None if p50 is None else float(p50),
+            "p99_ms": None if p99 is None else float(p99),
+            "cached": len(self.cache),
+            "cache_bytes": self.cache.nbytes,
+            "evictions": self.cache.evictions,
+        }
+
+    async def _handle(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as error:
+                    response = {"error": f"bad JSON: {error}"}
+                else:
+                    response = await self.query(message)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # Connections still open at shutdown are cancelled; ending quietly keeps asyncio from logging each one
+            pass
+        finally:
+            writer.close()
+
+
+class PolicyClient:
+    """One connection to a PolicyServer, with one request in flight at a time."""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._lock = asyncio.Lock()
+        self._next_id = 0
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        return cls(*await asyncio.open_connection(host, port, limit=LINE_LIMIT))
+
+    async def request(self, message):
+        async with self._lock:
+            self._next_id += 1
+            self.writer.write(json.dumps({"id": self._next_id, **message}).encode() + b"\n")
+            await self.writer.drain()
+            return json.loads(await self.reader.readline())
+
+    async def paths(self, layout, starts):
+        """Paths from ``starts`` on ``layout``, a dict like the request's ``layout``."""
+        return await self.request({"op": "paths", "layout": layout, "starts": [list(start) for start in starts]})
+
+    async def stats(self):
+        return await self.request({"op": "stats"})
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cache-mb", type=float, default=256, help="memory budget of the policy cache")
+    parser.add_argument("--workers", type=int, default=None, help="training processes, one per CPU by default")
+    parser.add_argument("--max-cells", type=int, default=MAX_CELLS, help="largest grid accepted, in cells")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = PolicyServer(int(args.cache_mb * 2 ** 20), args.workers, max_cells=args.max_cells)
+        host, port = await server.start(args.host, args.port)
+        print(f"serving policies on {host}:{port}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
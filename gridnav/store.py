@@ -0,0 +1,176 @@
+"""
+On-disk Q-tables with their layout, loaded lazily through ``np.memmap``.
+
+A saved model is a directory holding ``meta.json`` (format version, layout,
+hyperparameters, episodes trained), ``q_table.npy``, ``blocked.npy`` (the
+obstacle mask, bit-packed) and ``visits.npy`` (the agent's per-state
+visit counts, for analysis). ``load`` only reads the ``.npy`` header, so even
+a very large table opens in milliseconds and pages are read on first use.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from gridnav.core import GridWorld, QLearningAgent
+
+FORMAT = "gridnav-qtable"
+VERSION = 1
+
+
+def layout_key(env):
+    """Stable hash of everything a Q-table depends on besides the hyperparameters."""
+    return key_for(env.width, env.height, env.end, env.actions, env.blocked, extra_goals=env.goals[1:],
+                   compact_start=env.start if env.cells is not None else None)
+
+
+def key_for(width, height, end, actions, blocked, extra_goals=(), compact_start=None):
+    """``layout_key`` of a layout given by its parts, without building the GridWorld."""
+    digest = hashlib.sha1()
+    header = [width, height, list(end), [list(a) for a in actions], compact_start is not None]
+    if compact_start is not None:
+        # The compact state set depends on where the search started
+        header.append(list(compact_start))
+    if len(extra_goals):
+        # Appended only when present, so single-goal keys stay what they were
+        header.append([list(goal) for goal in extra_goals])
+    digest.update(json.dumps(header).encode())
+    digest.update(np.packbits(blocked).tobytes())
+    return digest.hexdigest()
+
+
+def save(path, agent, episodes=0, starts=None):
+    """
+    Writes ``agent``'s Q-table and layout to the directory ``path``.
+
+    Files are written next to their final name and moved into place, so a
+    reader never sees a half-written table. An agent that was loaded from
+    ``path`` in ``"r+"`` mode already trains in the file and is only flushed;
+    a copy-on-write (``"c"``) map keeps its changes in memory, so it is
+    written out like any other table.
+    """
+    env = agent.env
+    os.makedirs(path, exist_ok=True)
+    q_path = os.path.join(path, "q_table.npy")
+    q_table = agent.q_table
+    if isinstance(q_table, np.memmap) and q_table.mode == "r+" and q_table.filename == os.path.abspath(q_path):
+        q_table.flush()
+    else:
+        out = np.lib.format.open_memmap(q_path + ".tmp", mode="w+", dtype=q_table.dtype, shape=q_table.shape)
+        out[...] = q_table
+        out.flush()
+        del out
+        os.replace(q_path + ".tmp", q_path)
+
+    with open(os.path.join(path, "blocked.npy.tmp"), "wb") as f:
+        np.save(f, np.packbits(env.blocked))
+    os.replace(os.path.join(path, "blocked.npy.tmp"), os.path.join(path, "blocked.npy"))
+    with open(os.path.join(path, "visits.npy.tmp"), "wb") as f:
+        np.save(f, agent.visit_counts)
+    os.replace(os.path.join(path, "visits.npy.tmp"), os.path.join(path, "visits.npy"))
+
+    meta = {
+        "format": FORMAT,
+        "version": VERSION,
+        "key": layout_key(env),
+        "width": env.width,
+        "height": env.height,
+        "start": list(env.start),
+        "end": list(env.end),
+        "extra_goals": [list(goal) for goal in env.goals[1:]],
+        "starts": [list(s) for s in (starts or [env.start])],
+        "actions": [list(a) for a in env.actions],
+        "compact": env.cells is not None,
+        "alpha": agent.alpha,
+        "gamma": agent.gamma,
+        "epsilon": agent.epsilon,
+        "episodes": episodes,
+        "dtype": q_table.dtype.name,
+        "q_shape": list(q_table.shape),
+    }
+    with open(os.path.join(path, "meta.json.tmp"), "w") as f:
+        json.dump(meta, f, indent=1)
+    os.replace(os.path.join(path, "meta.json.tmp"), os.path.join(path, "meta.json"))
+
+
+def load(path, mode="r"):
+    """
+    Opens a saved model and returns ``(q_table, meta)``.
+
+    The table is a memmap: ``"r"`` is read-only and zero-copy, ``"r+"``
+    trains in the file, and ``"c"`` trains a private copy-on-write view.
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta.get("format") != FORMAT:
+        raise ValueError(f"{path} is not a saved Q-table")
+    if meta["version"] > VERSION:
+        raise ValueError(f"{path} uses format version {meta['version']}, this version reads up to {VERSION}")
+    q_table = np.load(os.path.join(path, "q_table.npy"), mmap_mode=mode)
+    return q_table, meta
+
+
+def load_env(path, meta=None):
+    """Rebuilds the GridWorld a model was saved with."""
+    if meta is None:
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+    width, height = meta["width"], meta["height"]
+    packed = np.load(os.path.join(path, "blocked.npy"))
+    blocked = np.unpackbits(packed, count=width * height).reshape(width, height).astype(bool)
+    return GridWorld(width, height, tuple(meta["start"]), tuple(meta["end"]), blocked,
+                     [tuple(a) for a in meta["actions"]], compact=meta["compact"],
+                     extra_goals=[tuple(goal) for goal in meta.get("extra_goals", [])])
+
+
+def load_visits(path):
+    """The saved per-state visit counts, or None for a model saved without them."""
+    visits_path = os.path.join(path, "visits.npy")
+    return np.load(visits_path) if os.path.exists(visits_path) else None
+
+
+def load_agent(path, mode="r+", rng=None):
+    """
+    Rebuilds the environment and a QLearningAgent on the saved Q-table and
+    visit counts, ready to resume training. Returns ``(agent, meta)``.
+    """
+    q_table, meta = load(path, mode)
+    env = load_env(path, meta)
+    agent = QLearningAgent(env, meta["alpha"], meta["gamma"], meta["epsilon"], env.start, rng=rng, q_table=q_table)
+    visits = load_visits(path)
+    if visits is not None:
+        agent.visit_counts[:] = visits
+    return agent, meta
+
+
+class QTableStore:
+    """
+    A directory of saved models keyed by ``layout_key``.
+
+    ``open`` keeps every table it has mapped, so asking for the same layout
+    again reuses the open memmap instead of touching the disk.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._cache = {}
+
+    def path_for(self, env):
+        return os.path.join(self.root, layout_key(env))
+
+    def save(self, agent, episodes=0, starts=None):
+        key = layout_key(agent.env)
+        save(os.path.join(self.root, key), agent, episodes, starts)
+        # A cached read-only map would still point at the replaced file
+        self._cache.pop(key, None)
+        return key
+
+    def open(self, env):
+        """Returns ``(q_table, meta)`` for ``env``'s layout, or None if nothing was saved for it."""
+        key = layout_key(env)
+        if key not in self._cache:
+            path = os.path.join(self.root, key)
+            if not os.path.exists(os.path.join(path, "meta.json")):
+                return None
+            self._cache[key] = load(path)
+        return self._cache[key]
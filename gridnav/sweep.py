@@ -0,0 +1,149 @@
+"""
+Parallel hyperparameter sweeps over layouts, start positions and seeds.
+
+Run the built-in demo sweep with ``python -m gridnav.sweep``.
+"""
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from gridnav.convergence import ConvergenceMonitor
+from gridnav.core import QLearningAgent
+from gridnav.layouts import DEFAULT_LAYOUT, make_env
+
+SUMMARY_COLUMNS = ["layout", "start", "alpha", "gamma", "epsilon", "episodes", "seed",
+                   "converged_at", "stable_since", "episodes_run", "path_length", "wall_ms"]
+
+
+def make_jobs(layouts, alphas, gammas, epsilons, episodes, seeds, patience=None, tolerance=None):
+    """
+    Expands every combination into job dicts, one per start of each layout.
+
+    With a ``patience`` each job stops as soon as its ``ConvergenceMonitor``
+    reports convergence, and ``episodes`` only caps the run. Without one,
+    every job runs all its episodes and its row has no ``converged_at``;
+    ``stable_since`` still gives the episode where the final path appeared.
+    """
+    jobs = []
+    for layout in layouts:
+        for start, alpha, gamma, epsilon, n_episodes, seed in itertools.product(
+                layout["starts"], alphas, gammas, epsilons, episodes, seeds):
+            jobs.append({"layout": layout, "start": tuple(start), "alpha": alpha, "gamma": gamma,
+                         "epsilon": epsilon, "episodes": n_episodes, "seed": seed,
+                         "patience": patience, "tolerance": tolerance})
+    return jobs
+
+
+def _q_shape(layout):
+    return (layout["width"], layout["height"], len(layout["actions"]))
+
+
+def _train(job, q_table):
+    """Trains one job in ``q_table`` and returns its environment, ConvergenceMonitor and final greedy path."""
+    env = make_env(job["layout"], job["start"])
+    agent = QLearningAgent(env, job["alpha"], job["gamma"], job["epsilon"], env.start,
+                           rng=np.random.default_rng(job["seed"]), q_table=q_table)
+    # Without a patience the monitor never stops the run and only tracks when the final path appeared
+    patience = job.get("patience")
+    monitor = ConvergenceMonitor(patience=math.inf if patience is None else patience, tolerance=job.get("tolerance"))
+    path = None
+
+    def on_episode(length, max_delta, episode_return):
+        nonlocal path
+        path = agent.find_best_path()
+        return monitor.update(max_delta, path, env.is_goal(path[-1]))
+
+    # One kernel call for the whole job, stopped from the callback; "max_steps" caps the job's total steps
+    agent.run_episodes(job["episodes"], max_steps=job.get("max_steps"), on_episode=on_episode)
+    if path is None:
+        path = agent.find_best_path()
+    return env, monitor, path
+
+
+def _run_job(job, shm_name, offset):
+    """Trains one job straight into its slot of the shared Q-table block."""
+    layout = job["layout"]
+    shm = SharedMemory(name=shm_name)
+    try:
+        q_table = np.ndarray(_q_shape(layout), dtype=np.float64, buffer=shm.buf, offset=offset)
+        q_table[:] = 0.0
+        started = time.perf_counter()
+        # The agent and its views of the block live only inside _train
+        env, monitor, path = _train(job, q_table)
+        wall_ms = (time.perf_counter() - started) * 1000
+        # Views into shm.buf must be gone before the block can be closed
+        del q_table
+    finally:
+        shm.close()
+
+    # Runs cut off by the episode cap, or without a patience, report no convergence episode
+    summary = monitor.summary()
+    return {
+        "layout": layout.get("name", ""),
+        "start": job["start"],
+        "alpha": job["alpha"],
+        "gamma": job["gamma"],
+        "epsilon": job["epsilon"],
+        "episodes": job["episodes"],
+        "seed": job["seed"],
+        "converged_at": summary["converged_at"],
+        "stable_since": monitor.stable_since,
+        "episodes_run": summary["episodes_run"],
+        "path_length": len(path) - 1 if path and env.is_goal(path[-1]) else None,
+        "wall_ms": wall_ms,
+    }
+
+
+def run_sweep(jobs, max_workers=None):
+    """
+    Runs ``jobs`` on every core and returns ``(rows, q_tables)``.
+
+    Workers write their Q-tables into one shared memory block, so only the
+    small job and summary dicts are pickled. The tables are copied out of the
+    block in one go before it is released.
+    """
+    offsets = []
+    size = 0
+    for job in jobs:
+        offsets.append(size)
+        size += int(np.prod(_q_shape(job["layout"]))) * np.dtype(np.float64).itemsize
+
+    shm = SharedMemory(create=True, size=max(size, 1))
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            futures = [pool.submit(_run_job, job, shm.name, offset) for job, offset in zip(jobs, offsets)]
+            rows = [future.result() for future in futures]
+        block = np.ndarray((size // 8,), dtype=np.float64, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    q_tables = []
+    for job, offset in zip(jobs, offsets):
+        shape = _q_shape(job["layout"])
+        q_tables.append(block[offset // 8: offset // 8 + int(np.prod(shape))].reshape(shape))
+    return rows, q_tables
+
+
+def format_summary(rows):
+    """Renders sweep rows as a fixed-width text table."""
+    cells = [[f"{row[column]:.1f}" if column == "wall_ms" else str(row[column]) for column in SUMMARY_COLUMNS]
+             for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells)) for i, column in enumerate(SUMMARY_COLUMNS)]
+    lines = ["  ".join(column.ljust(width) for column, width in zip(SUMMARY_COLUMNS, widths))]
+    lines.extend("  ".join(cell.ljust(width) for cell, width in zip(line, widths)) for line in cells)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    demo_jobs = make_jobs([DEFAULT_LAYOUT], alphas=[0.1, 0.5, 0.9], gammas=[0.9, 0.99],
+                          epsilons=[0.05, 0.1, 0.2], episodes=[100], seeds=[0], patience=20)
+    started = time.perf_counter()
+    summary, _ = run_sweep(demo_jobs)
+    print(format_summary(summary))
+    print(f"{len(demo_jobs)} jobs in {time.perf_counter() - started:.2f} s on {os.cpu_count()} cores")
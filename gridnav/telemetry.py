@@ -0,0 +1,123 @@
+"""
+Training telemetry: running counters and one record per finished episode,
+streamed to a JSONL or CSV file or to any callable.
+
+A ``TrainingEngine`` given a ``Telemetry`` reports every episode it
+finishes, whether it was stepped or run through the episode kernel. With
+``phases=True`` the agent also times the select, transition and update
+phases of each ``take_step``; the kernel does not split its steps, so its
+episodes carry no phase times. Without a telemetry object the step loop only
+pays for one ``None`` check.
+"""
+import csv
+import json
+import time
+
+PHASES = ("select", "transition", "update")
+
+
+class JsonlWriter:
+    """Writes each record as one line of JSON."""
+    def __init__(self, path):
+        self.file = open(path, "w")
+
+    def __call__(self, record):
+        self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter:
+    """Writes records as CSV rows; the columns are those of the first record."""
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.writer = None
+
+    def __call__(self, record):
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, fieldnames=list(record), extrasaction="ignore")
+            self.writer.writeheader()
+        self.writer.writerow(record)
+
+    def close(self):
+        self.file.close()
+
+
+def open_sink(path):
+    """A writer for ``path``, CSV if it ends in ``.csv`` and JSONL otherwise."""
+    return CsvWriter(path) if path.endswith(".csv") else JsonlWriter(path)
+
+
+class Telemetry:
+    """
+    Counters and per-episode records of a training run.
+
+    ``sink`` is a callable that receives each record dict, or a file path
+    opened with ``open_sink``. Only every ``every``-th episode is passed on,
+    but the counters include all of them. ``last`` always holds the newest
+    record, e.g. for a live overlay.
+
+    A record has the episode number, its start cell, steps, undiscounted
+    return, largest absolute TD error and the agent's epsilon, followed by
+    the run's total steps, elapsed seconds and the step throughput since the
+    previous record passed on. With ``phases`` it also has the mean
+    microseconds per step spent in each phase, or None for kernel episodes.
+    """
+    def __init__(self, sink=None, every=1, phases=False, clock=time.perf_counter):
+        self._owned = isinstance(sink, str)
+        self.sink = open_sink(sink) if self._owned else sink
+        self.every = every
+        self.phases = phases
+        self.clock = clock
+        self.episodes = 0
+        self.steps = 0
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self._phase_steps = 0
+        self.last = None
+        self.started = clock()
+        self._mark = (self.started, 0)
+
+    def add_phases(self, select, transition, update):
+        """Adds the phase times of one step, called by ``QLearningAgent.take_step``."""
+        seconds = self.phase_seconds
+        seconds["select"] += select
+        seconds["transition"] += transition
+        seconds["update"] += update
+        self._phase_steps += 1
+
+    def episode(self, episode, start, steps, episode_return, td_error_max, epsilon):
+        """Records a finished episode and returns the record."""
+        now = self.clock()
+        self.episodes += 1
+        self.steps += steps
+        mark_time, mark_steps = self._mark
+        record = {
+            "episode": episode,
+            "start": list(start),
+            "steps": steps,
+            "return": float(episode_return),
+            "td_error_max": float(td_error_max),
+            "epsilon": epsilon,
+            "total_steps": self.steps,
+            "elapsed": now - self.started,
+            "steps_per_sec": (self.steps - mark_steps) / (now - mark_time) if now > mark_time else None,
+        }
+        if self.phases:
+            for phase in PHASES:
+                seconds = self.phase_seconds[phase]
+                record[f"{phase}_us"] = seconds / self._phase_steps * 1e6 if self._phase_steps else None
+        self.last = record
+        if self.episodes % self.every == 0:
+            # Throughput and phase times cover the episodes since the last record passed on
+            if self.sink is not None:
+                self.sink(record)
+            self._mark = (now, self.steps)
+            self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+            self._phase_steps = 0
+        return record
+
+    def close(self):
+        """Closes the sink if it was opened from a path."""
+        if self._owned:
+            self.sink.close()
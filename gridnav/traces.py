@@ -0,0 +1,169 @@
+import numpy as np
+
+
+class EligibilityTraces:
+    """
+    Watkins Q(lambda): every TD error updates the recently taken entries of
+    the Q-table too, weighted by a trace that decays by ``gamma *
+    trace_decay`` per step, so one visit to the goal reaches a whole
+    corridor instead of its last cell.
+
+    Only the entries whose trace is at least ``threshold`` are kept, as flat
+    Q-table indices and trace values in preallocated arrays. Traces are
+    replacing: the taken entry is reset to 1 and moved to the end. Every
+    other entry decays by the same factor, so the values stay sorted from
+    oldest to newest, one multiply decays them all and one ``searchsorted``
+    finds the ones to drop. At most ``log(threshold) / log(gamma *
+    trace_decay)`` entries survive, so a step costs the same on any grid.
+    ``capacity`` caps them for decays close to 1 by dropping the oldest.
+
+    An exploratory action cuts the traces, since the steps before it no
+    longer lead along the greedy policy whose values Q-learning estimates.
+    So does a move into an obstacle or off the grid: its penalty says
+    nothing about the steps that led there, and while the untried moves of
+    a zero-initialized table look greedy, those penalties would otherwise
+    drag whole corridors below the value of never reaching the goal.
+    """
+    def __init__(self, trace_decay, threshold=0.01, capacity=4096):
+        if not 0 <= trace_decay <= 1:
+            raise ValueError(f"trace_decay must lie in [0, 1], got {trace_decay}")
+        self.trace_decay = trace_decay
+        self.threshold = threshold
+        self.entries = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        return self.entries.nbytes + self.values.nbytes
+
+    def reset(self):
+        self.size = 0
+
+    def step(self, q_values, state, action, reward, next_state, done, greedy, alpha, gamma):
+        """
+        Applies the TD error of one step to every traced entry of
+        ``q_values``, an ``(n_states, n_actions)`` array updated in place,
+        and returns the largest absolute update. ``greedy`` says whether
+        ``action`` was a greedy one and ``done`` ends the episode.
+        """
+        entry = state * q_values.shape[1] + action
+        entries, values = self.entries, self.values
+        n = self.size if greedy and next_state != state else 0
+        if n:
+            again = np.flatnonzero(entries[:n] == entry)
+            if len(again):
+                i = again[0]
+                entries[i:n - 1] = entries[i + 1:n]
+                values[i:n - 1] = values[i + 1:n]
+                n -= 1
+        if n == len(entries):
+            entries[:-1] = entries[1:]
+            values[:-1] = values[1:]
+            n -= 1
+        entries[n] = entry
+        values[n] = 1.0
+        n += 1
+
+        flat = q_values.reshape(-1)
+        error = reward + gamma * q_values[next_state].max() - flat[entry]
+        updates = alpha * error * values[:n]
+        # Replacing traces keep every entry once, so the fancy add sees no duplicates
+        flat[entries[:n]] += updates
+
+        if done:
+            n = 0
+        values[:n] *= gamma * self.trace_decay
+        dropped = int(np.searchsorted(values[:n], self.threshold))
+        if dropped:
+            n -= dropped
+            entries[:n] = entries[dropped:dropped + n]
+            values[:n] = values[dropped:dropped + n]
+        self.size = n
+        return abs(float(updates[-1]))
+
+
+class NStepReturns:
+    """
+    n-step Q-learning: an entry is updated towards the rewards of the ``n``
+    steps that follow it plus the discounted greedy value of the state
+    they reach, so reward travels ``n`` cells back per visit.
+
+    The entries still waiting for their ``n`` rewards sit in a ring of
+    length ``n`` with their partial return and the discount of the next
+    reward; a step adds its discounted reward to all of them with one
+    multiply-add. An exploratory action, a move into an obstacle or off the
+    grid (see ``EligibilityTraces``) and the end of an episode complete
+    every waiting entry at once from the greedy value of the state reached
+    so far, so no return mixes in steps off the greedy policy. With ``n=1``
+    this is the one-step update.
+    """
+    def __init__(self, n):
+        if n < 1:
+            raise ValueError(f"n must be at least 1, got {n}")
+        self.n = n
+        self.entries = np.zeros(n, dtype=np.int64)
+        self.partial = np.zeros(n, dtype=np.float64)
+        self.discounts = np.zeros(n, dtype=np.float64)
+        self.head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        return self.entries.nbytes + self.partial.nbytes + self.discounts.nbytes
+
+    def reset(self):
+        self.partial[:] = 0.0
+        self.discounts[:] = 0.0
+        self.head = 0
+        self.size = 0
+
+    def _complete(self, flat, slots, value, alpha):
+        """Updates the entries in ``slots`` towards their partial returns plus ``value`` and frees them."""
+        entries = self.entries[slots]
+        updates = alpha * (self.partial[slots] + self.discounts[slots] * value - flat[entries])
+        # An entry taken twice in the window is applied once, from its latest return
+        flat[entries] += updates
+        self.partial[slots] = 0.0
+        self.discounts[slots] = 0.0
+        return float(np.abs(updates).max())
+
+    def _flush(self, flat, value, alpha):
+        slots = (self.head + np.arange(self.size)) % self.n
+        largest = self._complete(flat, slots, value, alpha)
+        self.head = (self.head + self.size) % self.n
+        self.size = 0
+        return largest
+
+    def step(self, q_values, state, action, reward, next_state, done, greedy, alpha, gamma):
+        """
+        Adds one step, updates ``q_values`` (``(n_states, n_actions)``, in
+        place) for every entry whose return is complete and returns the
+        largest absolute update. Takes the same arguments as
+        ``EligibilityTraces.step``.
+        """
+        flat = q_values.reshape(-1)
+        largest = 0.0
+        if (not greedy or next_state == state) and self.size:
+            largest = self._flush(flat, q_values[state].max(), alpha)
+        slot = (self.head + self.size) % self.n
+        self.entries[slot] = state * q_values.shape[1] + action
+        self.discounts[slot] = 1.0
+        self.size += 1
+
+        self.partial += self.discounts * reward
+        self.discounts *= gamma
+        value = q_values[next_state].max()
+        if done:
+            return max(largest, self._flush(flat, value, alpha))
+        if self.size == self.n:
+            largest = max(largest, self._complete(flat, [self.head], value, alpha))
+            self.head = (self.head + 1) % self.n
+            self.size -= 1
+        return largest
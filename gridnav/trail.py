@@ -0,0 +1,32 @@
+import numpy as np
+
+
+class TrailBuffer:
+    """
+    The most recent ``capacity`` states of an agent, in a fixed NumPy ring.
+
+    ``append`` overwrites the oldest entry once the ring is full, so memory
+    and the cost of reading the trail stay constant however long an episode
+    runs. ``total`` counts every state appended since the last ``clear`` and
+    never wraps, which lets a reader ask for just the entries it has not seen
+    yet with ``recent(total - seen)``.
+    """
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int32)
+        self.total = 0
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, state):
+        self.states[self.total % self.capacity] = state
+        self.total += 1
+
+    def clear(self):
+        self.total = 0
+
+    def recent(self, n=None):
+        """Copy of the last ``n`` states (all that are held by default), oldest first."""
+        n = len(self) if n is None else max(0, min(n, len(self)))
+        return self.states[np.arange(self.total - n, self.total) % self.capacity]
@@ -16,9 +16,14 @@
 # This project is a simple yet powerful example of **Q-learning** applied to pathfinding in a 2D grid. 
 # It's a great way to explore reinforcement learning concepts in action.
 
-import numpy as np
-import random
-import pygame
+import argparse
+import os
+import runpy
+import sys
+
+# Only the standard library is imported up front. Each subcommand imports what
+# it needs, so "--help", and any module that imports this one, start in
+# milliseconds and never load pygame.
 
 # Grid dimensions and tile size
 GRID_WIDTH, GRID_HEIGHT = 15, 10
@@ -40,125 +45,224 @@ obstacles = [
 actions = [(0,1),(0,-1),(1,0),(-1,0)]
 action_names = ["down", "up", "right", "left"]
 
-# Initialize Q-table with zeros
-Q = np.zeros((GRID_WIDTH, GRID_HEIGHT, len(actions)))
-
 # Learning parameters
 alpha = 0.5  # Learning rate
 gamma = 0.9  # Discount factor
 epsilon = 0.1  # Exploration probability
-episodes = 100  # Number of training episodes
-
-# Check if a position is valid (within grid and not an obstacle)
-def is_valid(x, y):
-    return 0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT and (x, y) not in obstacles
-
-# Training loop over multiple episodes
-for ep in range(episodes):
-    for start in starts:
-        state = start
-        while state != end:
-            x, y = state
-
-            # Exploration vs Exploitation: select action
-            if random.uniform(0, 1) < epsilon:
-                # Exploration: choose random action
-                action_idx = random.randint(0, len(actions)-1)
-            else:
-                # Exploitation: choose best known action
-                action_idx = np.argmax(Q[x, y])
-
-            # Take the action and get the next state
-            dx, dy = actions[action_idx]
-            next_state = (x + dx, y + dy)
-
-            # Calculate reward
-            if next_state == end:
-                reward = 100  # Reward for reaching the goal
-            elif not is_valid(*next_state):
-                reward = -10  # Penalty for hitting an obstacle
-                next_state = state  # Stay in the same state
-            else:
-                reward = -1  # Penalty for each step
-
-            # Update Q-value using the Q-learning formula
-            nx, ny = next_state
-            Q[x, y, action_idx] = Q[x, y, action_idx] + alpha * (reward + gamma * np.max(Q[nx, ny]) - Q[x, y, action_idx])
-            
-            # Move to the next state
-            state = next_state
-
-# Pathfinding: extract the learned path after training
-state = start
-path = [state]
-while state != end:
-    x, y = state
-    action_idx = np.argmax(Q[x, y])  # Choose the best action based on the learned Q-table
-    dx, dy = actions[action_idx]
-    next_state = (x + dx, y + dy)
-    if next_state == state:
-        break  # Break if no movement
-    path.append(next_state)
-    state = next_state
-
-# Print the learned path
-print("Learned path by RL:")
-print(path)
-
-# Pygame setup for visualization
-WIDTH, HEIGHT = GRID_WIDTH * TILE_SIZE, GRID_HEIGHT * TILE_SIZE
-WHITE = (245, 245, 245)
-GRAY = (200, 200, 200)
-RED = (200, 50, 50)
-BLUE = (50, 50, 200)
-YELLOW = (255, 255, 0)
-
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("RL Path Visualization")
-clock = pygame.time.Clock()
-
-# Initialize player position at the start of the learned path
-player_pos = list(path[0])
-path_index = 0
-
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Move player through the path
-    if path_index < len(path):
-        player_pos = list(path[path_index])
-        path_index += 1
-
-    # Fill background with white
-    screen.fill(WHITE)
-
-    # Draw grid
-    for row in range(GRID_HEIGHT):
-        for col in range(GRID_WIDTH):
-            rect = pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            pygame.draw.rect(screen, GRAY, rect, 1)
-
-    # Draw obstacles
-    for ox, oy in obstacles:
-        rect = pygame.Rect(ox * TILE_SIZE, oy * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-        pygame.draw.rect(screen, RED, rect)
-
-    # Draw learned path
-    for x, y in path:
-        rect = pygame.Rect(x * TILE_SIZE + TILE_SIZE // 4, y * TILE_SIZE + TILE_SIZE // 4, TILE_SIZE // 2, TILE_SIZE // 2)
-        pygame.draw.rect(screen, YELLOW, rect)
-
-    # Draw the player (agent)
-    px, py = player_pos
-    rect = pygame.Rect(px * TILE_SIZE, py * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-    pygame.draw.rect(screen, BLUE, rect)
-
-    # Update the screen
-    pygame.display.flip()
-    clock.tick(5)  # Set the speed of the agent's movement
-
-pygame.quit()
+n_step = 1  # Rewards per update; above 1 selects n-step Q-learning
+trace_decay = 0.0  # Lambda; above 0 selects Watkins Q(lambda). Converges in fewer episodes, often on longer paths
+episodes = 100  # Maximum number of training episodes per start
+patience = 20  # Stop once the learned paths stay unchanged for this many episodes
+
+
+
+def build_agent(model_dir=None, dyna=False, n_step=n_step, trace_decay=trace_decay):
+    """
+    One agent (and Q-table) shared by every start position, resumed from the
+    Q-table saved in ``model_dir`` for this layout, if any. Returns the agent
+    and the episodes it was already trained for.
+    """
+    from gridnav import GridWorld, QLearningAgent, ReplayBuffer, store
+
+    env = GridWorld(GRID_WIDTH, GRID_HEIGHT, starts[0], end, obstacles, actions)
+    # Dyna-Q replays stored transitions between real steps, which needs far fewer of them
+    replay = ReplayBuffer() if dyna else None
+    agent = QLearningAgent(env, alpha, gamma, epsilon, starts[0], replay=replay, n_step=n_step, trace_decay=trace_decay)
+    trained_episodes = 0
+    if model_dir and os.path.exists(os.path.join(model_dir, "meta.json")):
+        saved, meta = store.load(model_dir, mode="r+")
+        if meta["key"] == store.layout_key(env):
+            agent = QLearningAgent(env, alpha, gamma, epsilon, starts[0], q_table=saved, replay=replay,
+                                   n_step=n_step, trace_decay=trace_decay)
+            visits = store.load_visits(model_dir)
+            if visits is not None:
+                agent.visit_counts[:] = visits
+            trained_episodes = meta["episodes"]
+            print(f"Resuming from {model_dir} after {trained_episodes} episodes")
+    return agent, trained_episodes
+
+
+def train(agent, telemetry_path=None):
+    """Trains until the paths from every start converge and returns the episodes run."""
+    from gridnav import ConvergenceMonitor, Telemetry, TrainingEngine
+
+    # Training loop: each episode runs once from every start position
+    convergence = ConvergenceMonitor(patience=patience)
+    # One record per episode to a .jsonl or .csv file
+    telemetry = Telemetry(telemetry_path) if telemetry_path else None
+    engine = TrainingEngine(agent, episodes * len(starts), starts=starts, convergence=convergence, telemetry=telemetry)
+    engine.run()
+    if telemetry is not None:
+        telemetry.close()
+        print(f"{telemetry.steps} steps in {telemetry.episodes} episodes, {telemetry.last['elapsed'] * 1000:.1f} ms")
+
+    summary = convergence.summary()
+    if summary["converged"]:
+        print(f"Converged after {summary['converged_at']} episodes (stopped at {summary['stopped_at']})")
+    else:
+        print(f"Not converged after {summary['episodes_run']} episodes")
+    return engine.current_episode
+
+
+def solve(agent):
+    """The grid is fully known, so solve it by value iteration instead of sampling."""
+    from gridnav import Planner
+
+    solved = Planner(agent.env, gamma, q_table=agent.q_table).solve()
+    print(f"Solved by value iteration in {solved['sweeps']} sweeps")
+    return 0
+
+
+def report(agent):
+    """Prints the learned path from the last start and the path length from every start, and returns the path."""
+    # Pathfinding: extract the learned path from the last start after training
+    agent.start_state = starts[-1]
+    traced = agent.trace_path()
+    path = traced["path"]
+
+    # Print the learned path, or why the greedy walk did not reach the goal
+    print("Learned path by RL:")
+    print(path)
+    if traced["status"] != "goal":
+        print(f"No path to the goal: {traced['status']} at cell {traced['cell']}")
+
+    # Lengths from every start in one batched query against the same Q-table
+    lengths = agent.greedy_policy().lengths(starts)
+    print("Path length from each start:", ", ".join(
+        f"{start}: {length if length >= 0 else 'unreachable'}" for start, length in zip(starts, lengths.tolist())))
+    return path
+
+
+def visualize(path):
+    """Animates the learned path in a Pygame window."""
+    import pygame
+
+    WIDTH, HEIGHT = GRID_WIDTH * TILE_SIZE, GRID_HEIGHT * TILE_SIZE
+    WHITE = (245, 245, 245)
+    GRAY = (200, 200, 200)
+    RED = (200, 50, 50)
+    BLUE = (50, 50, 200)
+    YELLOW = (255, 255, 0)
+
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("RL Path Visualization")
+    clock = pygame.time.Clock()
+
+    # Initialize player position at the start of the learned path
+    player_pos = list(path[0])
+    path_index = 0
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        # Move player through the path
+        if path_index < len(path):
+            player_pos = list(path[path_index])
+            path_index += 1
+
+        # Fill background with white
+        screen.fill(WHITE)
+
+        # Draw grid
+        for row in range(GRID_HEIGHT):
+            for col in range(GRID_WIDTH):
+                rect = pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+                pygame.draw.rect(screen, GRAY, rect, 1)
+
+        # Draw obstacles
+        for ox, oy in obstacles:
+            rect = pygame.Rect(ox * TILE_SIZE, oy * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+            pygame.draw.rect(screen, RED, rect)
+
+        # Draw learned path
+        for x, y in path:
+            rect = pygame.Rect(x * TILE_SIZE + TILE_SIZE // 4, y * TILE_SIZE + TILE_SIZE // 4, TILE_SIZE // 2, TILE_SIZE // 2)
+            pygame.draw.rect(screen, YELLOW, rect)
+
+        # Draw the player (agent)
+        px, py = player_pos
+        rect = pygame.Rect(px * TILE_SIZE, py * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        pygame.draw.rect(screen, BLUE, rect)
+
+        # Update the screen
+        pygame.display.flip()
+        clock.tick(5)  # Set the speed of the agent's movement
+
+    pygame.quit()
+
+
+def learn(args, planner=False):
+    """Trains or solves the agent, saves it if asked to, and returns the learned path."""
+    agent, trained_episodes = build_agent(args.model, getattr(args, "dyna", False), getattr(args, "n_step", n_step),
+                                          getattr(args, "trace_decay", trace_decay))
+    if planner:
+        trained_episodes += solve(agent)
+    else:
+        trained_episodes += train(agent, args.telemetry)
+    if args.model:
+        from gridnav import store
+
+        store.save(args.model, agent, trained_episodes, starts)
+    return report(agent)
+
+
+COMMANDS = ("train", "solve", "render", "bench")
+
+
+def legacy_argv(argv):
+    """Maps the flags used before there were subcommands: --headless [--planner] or a window by default."""
+    if argv and argv[0] in COMMANDS + ("-h", "--help"):
+        return argv
+    rest = [arg for arg in argv if arg not in ("--headless", "--planner")]
+    if "--headless" in argv:
+        return ["solve" if "--planner" in argv else "train"] + rest
+    return ["render"] + (["--planner"] if "--planner" in argv else []) + rest
+
+
+def run_bench(args):
+    """Runs ``benchmarks/<name>.py`` as if started with ``python -m``."""
+    sys.argv = [args.name] + args.args
+    runpy.run_module(f"benchmarks.{args.name}", run_name="__main__", alter_sys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Q-learning grid navigation on the built-in 15x10 layout.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    model = argparse.ArgumentParser(add_help=False)
+    model.add_argument("--model", metavar="DIR", help="resume from the Q-table saved in DIR and save it back")
+    learning = argparse.ArgumentParser(add_help=False)
+    learning.add_argument("--telemetry", metavar="FILE", help="stream one record per episode to a .jsonl or .csv file")
+    learning.add_argument("--dyna", action="store_true", help="replay stored transitions between real steps (Dyna-Q)")
+    learning.add_argument("--n-step", type=int, default=n_step, metavar="N",
+                          help="n-step Q-learning with N rewards per update")
+    learning.add_argument("--trace-decay", type=float, default=trace_decay, metavar="LAMBDA",
+                          help="Watkins Q(lambda) with this trace decay")
+    commands.add_parser("train", parents=[model, learning], help="train and print the learned path")
+    commands.add_parser("solve", parents=[model], help="solve by value iteration and print the path")
+    render = commands.add_parser("render", parents=[model, learning], help="train, then animate the path with pygame")
+    render.add_argument("--planner", action="store_true", help="solve by value iteration instead of training")
+    bench = commands.add_parser("bench", help="run a benchmark from benchmarks/, by default the suite")
+    bench.add_argument("name", nargs="?", default="suite", help="e.g. suite, bench_kernel, bench_startup")
+    bench.add_argument("args", nargs=argparse.REMAINDER, help="passed on to the benchmark")
+    args = parser.parse_args(legacy_argv(sys.argv[1:] if argv is None else argv))
+    if getattr(args, "n_step", 1) < 1:
+        parser.error("--n-step must be at least 1")
+    if not 0 <= getattr(args, "trace_decay", 0.0) <= 1:
+        parser.error("--trace-decay must lie in [0, 1]")
+    if getattr(args, "n_step", 1) > 1 and getattr(args, "trace_decay", 0.0) > 0:
+        parser.error("--n-step and --trace-decay select different updates; pass only one of them")
+
+    if args.command == "bench":
+        run_bench(args)
+    elif args.command == "render":
+        visualize(learn(args, planner=args.planner))
+    else:
+        learn(args, planner=args.command == "solve")
+
+
+if __name__ == "__main__":
+    main()
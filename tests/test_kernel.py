@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from gridnav import DEFAULT_LAYOUT, BatchQLearning, GridWorld, QLearningAgent, make_env, run_episodes
+from gridnav.traces import EligibilityTraces, NStepReturns
+
+ALPHA, GAMMA, EPSILON = 0.5, 0.9, 0.1
+EPISODES = 200
+
+
+def kernel_table(env, seed, returns=None):
+    q_table = np.zeros(env.q_shape)
+    starts = [env.state_index(start) for start in DEFAULT_LAYOUT["starts"]]
+    run_episodes(q_table, env.transitions, env.reward_codes, env.terminal, starts, EPISODES,
+                 np.random.default_rng(seed), ALPHA, GAMMA, EPSILON, returns=returns, reward_values=env.reward_values)
+    return q_table
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_kernel_matches_take_step(seed):
+    env = make_env(DEFAULT_LAYOUT)
+    starts = DEFAULT_LAYOUT["starts"]
+    agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, starts[0], rng=np.random.default_rng(seed))
+    for episode in range(EPISODES):
+        agent.start_state = starts[episode % len(starts)]
+        agent.reset()
+        while not agent.take_step():
+            pass
+    assert np.array_equal(agent.q_table, kernel_table(env, seed))
+
+
+def test_kernel_encodes_a_float_reward_table():
+    env = make_env(DEFAULT_LAYOUT)
+    q_table = np.zeros(env.q_shape)
+    starts = [env.state_index(start) for start in DEFAULT_LAYOUT["starts"]]
+    run_episodes(q_table, env.transitions, env.rewards, env.terminal, starts, EPISODES, np.random.default_rng(0),
+                 ALPHA, GAMMA, EPSILON)
+    assert np.array_equal(q_table, kernel_table(env, 0))
+
+
+@pytest.mark.parametrize("returns", [lambda: NStepReturns(1), lambda: EligibilityTraces(0.0)],
+                         ids=["n_step=1", "trace_decay=0"])
+def test_multi_step_updates_reduce_to_one_step(returns):
+    env = make_env(DEFAULT_LAYOUT)
+    assert np.array_equal(kernel_table(env, 0, returns()), kernel_table(env, 0))
+
+
+def test_batch_matches_separate_agents():
+    rng = np.random.default_rng(0)
+    layout = DEFAULT_LAYOUT
+    envs = []
+    for i in range(8):
+        # Random subsets of the built-in obstacles keep the goal reachable
+        obstacles = [cell for cell in layout["obstacles"] if rng.random() < 0.8]
+        start = layout["starts"][i % len(layout["starts"])]
+        envs.append(GridWorld(layout["width"], layout["height"], start, layout["end"], obstacles, layout["actions"]))
+    seeds = list(range(len(envs)))
+
+    tables = []
+    for env, seed in zip(envs, seeds):
+        agent = QLearningAgent(env, ALPHA, GAMMA, EPSILON, env.start, rng=np.random.default_rng(seed))
+        for _ in range(20):
+            while not agent.take_step():
+                pass
+            agent.reset()
+        tables.append(agent.q_table)
+
+    trainer = BatchQLearning(envs, ALPHA, GAMMA, EPSILON, seeds)
+    trainer.train(20)
+    assert np.array_equal(np.stack(tables), trainer.q_tables)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from gridnav import generate_layouts
+from gridnav.layouts import components, connected, reachable
+
+
+def test_components_of_a_fully_blocked_mask():
+    mask = np.ones((5, 4), dtype=bool)
+    labels = components(mask)
+    assert labels.shape == mask.shape
+    assert (labels == -1).all()
+    assert not reachable(mask, (0, 0)).any()
+    assert not connected(mask, [(0, 0), (4, 3)])
+
+
+def test_components_label_each_region_by_its_smallest_cell():
+    mask = np.zeros((4, 3), dtype=bool)
+    mask[2, :] = True
+    labels = components(mask)
+    assert (labels[:2] == 0).all()
+    assert (labels[2] == -1).all()
+    assert (labels[3] == 9).all()
+
+
+def test_generated_layouts_connect_starts_and_goal():
+    for layout in generate_layouts("maze", 15, 11, count=3, seed=0):
+        cells = layout["starts"] + [layout["end"]]
+        assert connected(layout["obstacles"], cells)
@@ -0,0 +1,13 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("argv", [["train", "--n-step", "3", "--trace-decay", "0.5"],
+                                  ["train", "--n-step", "0"],
+                                  ["render", "--trace-decay", "1.5"]])
+def test_invalid_learning_flags_are_usage_errors(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main.main(argv)
+    assert exit_info.value.code == 2
+    assert "error:" in capsys.readouterr().err
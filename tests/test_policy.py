@@ -0,0 +1,33 @@
+import numpy as np
+
+from gridnav import DEFAULT_LAYOUT, GreedyPolicy, Planner, QLearningAgent, make_env
+
+
+def test_blocked_starts_have_no_path():
+    env = make_env(DEFAULT_LAYOUT)
+    planner = Planner(env, 0.9)
+    planner.solve()
+    # An obstacle's untrained row is all zeros, so its greedy move may well lead to the goal
+    policy = GreedyPolicy(env, planner.q_values)
+    starts = [DEFAULT_LAYOUT["obstacles"][0], DEFAULT_LAYOUT["starts"][0]]
+    lengths = policy.lengths(starts)
+    assert lengths[0] == -1 and lengths[1] > 0
+    assert policy.fates(starts).tolist() == [GreedyPolicy.BLOCKED, GreedyPolicy.REACHES_GOAL]
+    paths = policy.paths(starts)
+    assert paths[0] is None and tuple(paths[1][-1]) == DEFAULT_LAYOUT["end"]
+
+    agent = QLearningAgent(env, 0.5, 0.9, 0.1, DEFAULT_LAYOUT["starts"][0], q_table=planner.q_table)
+    assert agent.trace_path(starts[0])["status"] == "unreachable"
+
+
+def test_lengths_match_find_best_path():
+    env = make_env(DEFAULT_LAYOUT)
+    planner = Planner(env, 0.9)
+    planner.solve()
+    agent = QLearningAgent(env, 0.5, 0.9, 0.1, DEFAULT_LAYOUT["starts"][0], q_table=planner.q_table)
+    policy = agent.greedy_policy()
+    for start in DEFAULT_LAYOUT["starts"]:
+        agent.start_state = start
+        path = agent.find_best_path()
+        assert policy.lengths([start])[0] == len(path) - 1
+        assert np.array_equal(policy.paths([start])[0], np.array(path))
@@ -0,0 +1,78 @@
+import asyncio
+import os
+import time
+
+from gridnav import DEFAULT_LAYOUT
+from gridnav.server import PolicyClient, PolicyServer, solve_layout
+
+LAYOUT = {key: DEFAULT_LAYOUT[key] for key in ("width", "height", "end", "obstacles")}
+STARTS = DEFAULT_LAYOUT["starts"]
+
+
+def slow_trainer(layout):
+    # Long enough for a second request to arrive while the first one trains
+    time.sleep(0.5)
+    return solve_layout(layout)
+
+
+def crashing_trainer(layout):
+    if layout["width"] == 7:
+        os._exit(1)
+    return solve_layout(layout)
+
+
+def serve(test, trainer=solve_layout, **options):
+    """Runs ``test(server, port)`` against a PolicyServer listening on a free localhost port."""
+    async def run():
+        server = PolicyServer(workers=1, trainer=trainer, **options)
+        _, port = await server.start("127.0.0.1", 0)
+        try:
+            await test(server, port)
+        finally:
+            await server.close()
+    asyncio.run(run())
+
+
+def test_cache_hit_and_stats():
+    async def test(server, port):
+        client = await PolicyClient.connect("127.0.0.1", port)
+        first = await client.paths(LAYOUT, STARTS)
+        second = await client.paths(LAYOUT, STARTS)
+        assert (first["cache"], second["cache"]) == ("miss", "hit")
+        assert first["lengths"] == second["lengths"] == [16, 12, 13, 9]
+        assert first["paths"][0][0] == [0, 0] and first["paths"][0][-1] == list(DEFAULT_LAYOUT["end"])
+
+        stats = await client.stats()
+        assert stats["requests"] == 2 and stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["trained"] == 1 and stats["cached"] == 1 and stats["hit_rate"] == 0.5
+        assert stats["p50_ms"] is not None
+        await client.close()
+    serve(test)
+
+
+def test_concurrent_requests_share_one_training_job():
+    async def test(server, port):
+        clients = [await PolicyClient.connect("127.0.0.1", port) for _ in range(3)]
+        replies = await asyncio.gather(*(client.paths(LAYOUT, STARTS) for client in clients))
+        assert sorted(reply["cache"] for reply in replies) == ["coalesced", "coalesced", "miss"]
+        assert len({reply["key"] for reply in replies}) == 1
+        stats = await clients[0].stats()
+        assert stats["trained"] == 1 and stats["coalesced"] == 2
+        for client in clients:
+            await client.close()
+    serve(test, trainer=slow_trainer)
+
+
+def test_errors_get_a_reply_and_keep_the_connection():
+    async def test(server, port):
+        client = await PolicyClient.connect("127.0.0.1", port)
+        huge = dict(LAYOUT, width=10 ** 6, height=10 ** 6)
+        assert "exceeds the limit" in (await client.paths(huge, STARTS))["error"]
+
+        crashing = dict(LAYOUT, width=7, end=[3, 3], obstacles=[])
+        assert "BrokenProcessPool" in (await client.paths(crashing, [(0, 0)]))["error"]
+        # The dead worker's pool was replaced, so the next layout still trains
+        assert (await client.paths(LAYOUT, STARTS))["lengths"] == [16, 12, 13, 9]
+        assert (await client.stats())["errors"] == 2
+        await client.close()
+    serve(test, trainer=crashing_trainer, max_cells=10 ** 6)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from gridnav import DEFAULT_LAYOUT, QLearningAgent, make_env, store
+
+
+def trained_agent(q_table=None, seed=0):
+    env = make_env(DEFAULT_LAYOUT)
+    agent = QLearningAgent(env, 0.5, 0.9, 0.1, env.start, rng=np.random.default_rng(seed), q_table=q_table)
+    agent.run_episodes(20, starts=DEFAULT_LAYOUT["starts"])
+    return agent
+
+
+@pytest.mark.parametrize("mode", ["c", "r+"])
+def test_resumed_training_persists(tmp_path, mode):
+    path = str(tmp_path / "model")
+    store.save(path, trained_agent(), episodes=20)
+
+    agent, meta = store.load_agent(path, mode=mode, rng=np.random.default_rng(1))
+    before = np.array(agent.q_table)
+    agent.run_episodes(20, starts=DEFAULT_LAYOUT["starts"])
+    assert not np.array_equal(agent.q_table, before)
+    trained = np.array(agent.q_table)
+    store.save(path, agent, episodes=meta["episodes"] + 20)
+    del agent
+
+    q_table, meta = store.load(path)
+    assert np.array_equal(q_table, trained)
+    assert meta["episodes"] == 40
+
+
+def test_load_agent_matches_saved_layout(tmp_path):
+    path = str(tmp_path / "model")
+    agent = trained_agent()
+    store.save(path, agent)
+    loaded, meta = store.load_agent(path, mode="r")
+    assert meta["key"] == store.layout_key(agent.env)
+    assert np.array_equal(loaded.env.blocked, agent.env.blocked)
+    assert np.array_equal(loaded.q_table, agent.q_table)
+    assert np.array_equal(store.load_visits(path), agent.visit_counts)
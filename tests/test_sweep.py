@@ -0,0 +1,37 @@
+import numpy as np
+
+from gridnav import DEFAULT_LAYOUT, QLearningAgent, make_env
+from gridnav.sweep import SUMMARY_COLUMNS, make_jobs, run_sweep
+
+SMALL = dict(DEFAULT_LAYOUT, starts=[(0, 0), (14, 9)])
+
+
+def test_run_sweep_returns_each_jobs_table_and_row():
+    jobs = make_jobs([SMALL], alphas=[0.5], gammas=[0.9], epsilons=[0.1], episodes=[60], seeds=[3])
+    rows, q_tables = run_sweep(jobs, max_workers=2)
+    assert len(rows) == len(q_tables) == 2
+
+    for job, row, q_table in zip(jobs, rows, q_tables):
+        env = make_env(SMALL, job["start"])
+        agent = QLearningAgent(env, 0.5, 0.9, 0.1, env.start, rng=np.random.default_rng(3))
+        agent.run_episodes(60)
+        # The table made it through the shared block unchanged
+        assert np.array_equal(q_table, agent.q_table)
+
+        assert list(row) == SUMMARY_COLUMNS
+        assert row["start"] == job["start"]
+        # Without a patience every episode runs and nothing is reported as converged
+        assert row["episodes_run"] == 60
+        assert row["converged_at"] is None
+        path = agent.find_best_path()
+        assert row["path_length"] == len(path) - 1
+        assert row["stable_since"] is not None and row["stable_since"] <= 60
+
+
+def test_run_sweep_stops_converged_jobs():
+    jobs = make_jobs([SMALL], alphas=[0.5], gammas=[0.9], epsilons=[0.1], episodes=[2000], seeds=[0], patience=20)
+    rows, _ = run_sweep(jobs, max_workers=2)
+    for row in rows:
+        assert row["converged_at"] == row["stable_since"]
+        assert row["episodes_run"] == row["converged_at"] + 20
+        assert row["episodes_run"] < 2000
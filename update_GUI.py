@@ -1,107 +1,20 @@
 # Writed By https://github.com/Behdad-kanaani
 
 import numpy as np
-import random
 import pygame
 import math
 import sys
+import time
 
-# ------------------------------
-# Environment and Agent Classes
-# ------------------------------
-class GridWorld:
-    """
-    The GridWorld class is responsible for managing the environment and its rules.
-    """
-    def __init__(self, width, height, start, end, obstacles, actions):
-        self.width = width
-        self.height = height
-        self.start = start
-        self.end = end
-        self.obstacles = set(obstacles)
-        self.actions = actions
-
-    def is_valid_state(self, x, y):
-        """Checks if a position is valid within the grid."""
-        return 0 <= x < self.width and 0 <= y < self.height and (x, y) not in self.obstacles
-
-    def get_reward(self, state, next_state):
-        """Returns the reward value based on the state transition."""
-        if next_state == self.end:
-            return 100
-        if not self.is_valid_state(*next_state):
-            return -10
-        return -1
-
-class QLearningAgent:
-    """
-    The QLearningAgent class is responsible for the Q-learning logic.
-    """
-    def __init__(self, env, alpha, gamma, epsilon, start_state):
-        self.env = env
-        self.alpha = alpha
-        self.gamma = gamma
-        self.epsilon = epsilon
-        self.start_state = start_state
-        self.current_state = start_state
-        self.q_table = np.zeros((env.width, env.height, len(env.actions)))
-        self.visited_trail = []
-
-    def choose_action(self):
-        """Selects an action based on the epsilon-greedy policy."""
-        x, y = self.current_state
-        if random.uniform(0, 1) < self.epsilon:
-            return random.randint(0, len(self.env.actions) - 1)
-        else:
-            return np.argmax(self.q_table[x, y])
-
-    def take_step(self):
-        """Takes a step in the environment and updates the Q-table."""
-        action_idx = self.choose_action()
-        dx, dy = self.env.actions[action_idx]
-        
-        x, y = self.current_state
-        next_state = (x + dx, y + dy)
-        
-        reward = self.env.get_reward(self.current_state, next_state)
-
-        if not self.env.is_valid_state(*next_state):
-            next_state = self.current_state
-
-        nx, ny = next_state
-        self.q_table[x, y, action_idx] += self.alpha * (reward + self.gamma * np.max(self.q_table[nx, ny]) - self.q_table[x, y, action_idx])
-        
-        if next_state != self.current_state:
-            self.visited_trail.append(next_state)
-        
-        self.current_state = next_state
-        return next_state == self.env.end
-
-    def find_best_path(self):
-        """Computes the best path after training is complete."""
-        path = [self.start_state]
-        state = self.start_state
-        while state != self.env.end:
-            x, y = state
-            action_idx = np.argmax(self.q_table[x, y])
-            dx, dy = self.env.actions[action_idx]
-            next_state = (x + dx, y + dy)
-            if next_state == state: # Prevent infinite loops
-                break
-            path.append(next_state)
-            state = next_state
-        return path
-
-    def reset(self):
-        """Resets the agent's state for a new training episode."""
-        self.current_state = self.start_state
-        self.visited_trail.clear()
+from gridnav import ConvergenceMonitor, Fleet, GridWorld, QLearningAgent, Telemetry, TrainingEngine, generate_layouts
+from gridnav.store import QTableStore, load_visits
 
 # ------------------------------
 # Main Pygame Application Class
 # ------------------------------
 class GridWorldApp:
-    def __init__(self):
+    def __init__(self, threaded=False, model_root=None, profile=False, grid_size=None, telemetry_path=None,
+                 seed=None, fleet_size=None):
         # Environment settings
         self.TILE_SIZE = 60
         self.GRID_WIDTH, self.GRID_HEIGHT = 15, 10
@@ -114,18 +27,49 @@ class GridWorldApp:
             (5, 5), (6, 7), (8, 5), (9, 7), (10, 4), (11, 6)
         ]
         self.actions = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        # Random maps, from --size and the Random Obstacles button
+        self.layout_rng = np.random.default_rng(seed)
+        if grid_size is not None:
+            # A larger map: start in the corners, aim for the middle, block about 15% of the cells.
+            # A seed makes the map reproducible, e.g. for benchmarks
+            self.GRID_WIDTH, self.GRID_HEIGHT = grid_size
+            w, h = grid_size
+            self.starts = [(0, 0), (w - 1, 0), (0, h - 1), (w - 1, h - 1)]
+            self.end_point = (w // 2, h // 2)
+            layout = next(generate_layouts("random", w, h, starts=self.starts, end=self.end_point, seed=self.layout_rng,
+                                           density=0.15))
+            self.obstacles = [(int(x), int(y)) for x, y in zip(*np.nonzero(layout["obstacles"]))]
         
         # Learning settings
         self.alpha = 0.5
         self.gamma = 0.9
         self.epsilon = 0.1
-        self.episodes = 50
-        self.current_episode = 0
+        self.n_step = 1  # Above 1 selects n-step Q-learning
+        self.trace_decay = 0.0  # Above 0 selects Watkins Q(lambda)
+        self.episodes = 50  # Upper bound; training stops earlier once converged
+        self.patience = 10
 
         # Pygame settings
         self.BUTTON_BAR_HEIGHT = 100
-        self.WIDTH, self.HEIGHT = self.GRID_WIDTH * self.TILE_SIZE, self.GRID_HEIGHT * self.TILE_SIZE + self.BUTTON_BAR_HEIGHT + 20
+        self.VIEW_WIDTH = min(self.GRID_WIDTH * self.TILE_SIZE, 900)
+        self.VIEW_HEIGHT = min(self.GRID_HEIGHT * self.TILE_SIZE, 600)
+        self.WIDTH, self.HEIGHT = self.VIEW_WIDTH, self.VIEW_HEIGHT + self.BUTTON_BAR_HEIGHT + 20
         self.GRID_OFFSET_Y = 10 
+        self.view_rect = pygame.Rect(0, self.GRID_OFFSET_Y, self.VIEW_WIDTH, self.VIEW_HEIGHT)
+
+        # Camera: top-left visible cell and pixels per tile. Below LOD_TILE_SIZE
+        # the grid is drawn from NumPy arrays instead of tile by tile. The value
+        # and visit heatmaps use the same arrays at any zoom, laid over the
+        # tiles with HEATMAP_ALPHA when tiles are drawn
+        self.MAX_TILE_SIZE = 2 * self.TILE_SIZE
+        self.LOD_TILE_SIZE = 12
+        self.LOD_MODES = ["obstacles", "values", "visits"]
+        self.HEATMAP_ALPHA = 170
+        self.LOD_REFRESH_FRAMES = 15
+        self.lod_mode = 0
+        self.frame_count = 0
+        self.camera = [0.0, 0.0]
+        self.tile_size = self.TILE_SIZE
 
         pygame.init()
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
@@ -146,6 +90,33 @@ class GridWorldApp:
         self.BUTTON_COLOR = (60, 75, 100)
         self.BUTTON_HOVER_COLOR = (80, 100, 130)
         self.BUTTON_TEXT_COLOR = (255, 255, 255)
+        self.VALUE_LOW_COLOR = (30, 20, 90)
+        self.VALUE_HIGH_COLOR = (255, 210, 80)
+        self.VISITS_HIGH_COLOR = (235, 215, 255)
+
+        # Render caches; --profile prints the per-layer frame times once a second
+        self.static_layer = pygame.Surface((self.WIDTH, self.HEIGHT))
+        self.static_dirty = True
+        self.overlay = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
+        self.overlay.set_clip(self.view_rect)
+        self.overlay_mode = None
+        self.overlay_rect = pygame.Rect(0, 0, 0, 0)
+        self.trail_drawn = 0
+        self.TRAIL_FADE_EVERY = 8
+        self.TRAIL_FADE = 230
+        self.glyph_cache = {}
+        self.sprite_cache = {}
+        self.sprite_rects = []
+        self.button_states = []
+        self.layer_times = {}
+        self.profile = profile
+        self.last_report = 0
+        # T shows live training telemetry; --telemetry FILE also streams it to disk
+        self.show_telemetry = False
+        self.telemetry_path = telemetry_path
+        self.telemetry = Telemetry(telemetry_path, phases=telemetry_path is not None)
+        self.telemetry_panel = None
+        self.telemetry_record = None
 
         # Application states
         self.is_training = True
@@ -154,16 +125,32 @@ class GridWorldApp:
         self.selecting_obstacle = False
         self.show_final_path = False
         
-        # Speeds
-        self.speeds = [40, 500, 1000]
+        # Speeds in training steps per second; None trains for most of each frame
+        self.FPS = 60
+        self.FRAME_BUDGET = 0.75 / self.FPS
+        self.speeds = [40, 500, None]
         self.current_speed_index = 1
+        self.step_credit = 0.0
+        self.threaded = threaded
+        # --fleet N trains N agents at once on the shared Q-table instead of one, with collisions
+        self.fleet_size = fleet_size
+        self.fleet = None
+        self.fleet_monitor = None
+        self.fleet_episodes = 0
+        # Learned Q-tables are saved per layout and reused when a layout comes back
+        self.store = QTableStore(model_root) if model_root else None
+        self.trained_episodes = 0
 
         # Instantiate classes
         self.env = GridWorld(self.GRID_WIDTH, self.GRID_HEIGHT, self.starts[0], self.end_point, self.obstacles, self.actions)
-        self.agent = QLearningAgent(self.env, self.alpha, self.gamma, self.epsilon, self.env.start)
+        self.agent = self.new_agent()
+        self.engine = self.new_engine()
         self.final_path = []
+        self.edited_cells = set()
+        self.last_replan = None
 
         self.buttons = self.create_buttons()
+        self.set_camera(0, 0, min(self.TILE_SIZE, self.fit_tile_size()))
 
     def create_buttons(self):
         """Generates button rects dynamically for a clean layout in two rows."""
@@ -172,7 +159,7 @@ class GridWorldApp:
         spacing = 15
         
         # Calculate positions for two rows
-        row1_y = self.GRID_HEIGHT * self.TILE_SIZE + self.GRID_OFFSET_Y + spacing
+        row1_y = self.VIEW_HEIGHT + self.GRID_OFFSET_Y + spacing
         row2_y = row1_y + button_height + spacing
 
         # First row buttons
@@ -198,6 +185,7 @@ class GridWorldApp:
     # --- Event handling methods ---
     def toggle_start_selection(self):
         """Toggles the start point selection mode."""
+        self.engine.stop()
         self.selecting_start = not self.selecting_start
         self.selecting_goal = False
         self.selecting_obstacle = False
@@ -217,6 +205,7 @@ class GridWorldApp:
 
     def toggle_goal_selection(self):
         """Toggles the goal point selection mode."""
+        self.engine.stop()
         self.selecting_goal = not self.selecting_goal
         self.selecting_start = False
         self.selecting_obstacle = False
@@ -224,37 +213,75 @@ class GridWorldApp:
     
     def toggle_obstacle_selection(self):
         """Toggles the obstacle selection mode."""
+        # Stop a background trainer before the layout is edited under it
+        self.engine.stop()
         self.selecting_obstacle = not self.selecting_obstacle
         self.selecting_start = False
         self.selecting_goal = False
         self.is_training = False
         if not self.selecting_obstacle:
-            # Reset simulation to learn a new path after changes
-            self.reset_simulation(reset_obstacles=False)
+            # Re-plan around the edited tiles and learn the new path from there
+            self.replan(self.edited_cells)
+            self.edited_cells = set()
 
     def set_random_obstacles(self):
-        """Generates random obstacles and resets the simulation."""
-        num_obstacles = random.randint(20, 30)
-        new_obstacles = []
-        for _ in range(num_obstacles):
-            while True:
-                obs_x = random.randint(0, self.GRID_WIDTH - 1)
-                obs_y = random.randint(0, self.GRID_HEIGHT - 1)
-                if (obs_x, obs_y) != self.env.start and (obs_x, obs_y) != self.env.end and (obs_x, obs_y) not in new_obstacles:
-                    new_obstacles.append((obs_x, obs_y))
-                    break
-        self.env.obstacles = set(new_obstacles)
-        self.reset_simulation(reset_obstacles=False)
+        """Generates random obstacles that leave the goal reachable from every start, and resets the simulation."""
+        starts = list(dict.fromkeys([self.env.start] + self.starts))
+        layout = next(generate_layouts("random", self.GRID_WIDTH, self.GRID_HEIGHT, starts=starts, end=self.env.end,
+                                       seed=self.layout_rng, density=0.17))
+        new_obstacles = set(zip(*(axis.tolist() for axis in np.nonzero(layout["obstacles"]))))
+        self.engine.stop()
+        changed = new_obstacles ^ self.env.obstacles
+        self.env.obstacles = new_obstacles
+        self.invalidate_static()
+        self.replan(changed)
 
     def reset_simulation(self, reset_obstacles=True):
         """Resets the entire simulation."""
-        self.current_episode = 0
+        self.engine.stop()
         self.is_training = True
         self.show_final_path = False
         self.final_path = []
+        self.edited_cells = set()
+        self.last_replan = None
         if reset_obstacles:
-            self.env.obstacles = self.obstacles # Restore initial obstacles
-        self.agent = QLearningAgent(self.env, self.alpha, self.gamma, self.epsilon, self.env.start)
+            self.env.obstacles = set(self.obstacles) # Restore initial obstacles
+            self.invalidate_static()
+        self.agent = self.new_agent()
+        self.engine = self.new_engine()
+
+    def new_engine(self):
+        """A training engine for the current agent and, in fleet mode, a fleet sharing its Q-table."""
+        if self.fleet_size:
+            starts = [self.env.start] + [s for s in self.starts if s != self.env.start and self.env.is_valid_state(*s)]
+            self.fleet = Fleet(self.env, self.alpha, self.gamma, self.epsilon, starts, self.fleet_size,
+                               q_table=self.agent.q_table, collisions=True)
+            self.fleet_monitor = ConvergenceMonitor(self.patience)
+            self.fleet_episodes = 0
+        return TrainingEngine(self.agent, self.episodes, convergence=ConvergenceMonitor(self.patience),
+                              telemetry=self.telemetry)
+
+    def new_agent(self):
+        """Creates an agent, warm-started from the store if this layout was trained before."""
+        saved = self.store.open(self.env) if self.store is not None else None
+        self.trained_episodes = saved[1]["episodes"] if saved is not None else 0
+        q_table = np.array(saved[0]) if saved is not None else None
+        agent = QLearningAgent(self.env, self.alpha, self.gamma, self.epsilon, self.env.start, q_table=q_table,
+                               n_step=self.n_step, trace_decay=self.trace_decay)
+        visits = load_visits(self.store.path_for(self.env)) if saved is not None else None
+        if visits is not None:
+            agent.visit_counts[:] = visits
+        return agent
+
+    def replan(self, cells):
+        """Keeps the learned Q-table, re-plans around the edited cells and resumes training."""
+        self.engine.stop()
+        self.is_training = True
+        self.show_final_path = False
+        self.final_path = []
+        self.last_replan = self.agent.replan(cells)
+        self.agent.start_state = self.env.start
+        self.engine = self.new_engine()
 
     def handle_mouse_click(self, event):
         """Handles mouse clicks."""
@@ -266,139 +293,407 @@ class GridWorldApp:
                 return
 
         # Handle point selection on the grid
-        grid_y_start = self.GRID_OFFSET_Y
-        grid_x = event.pos[0] // self.TILE_SIZE
-        grid_y = (event.pos[1] - grid_y_start) // self.TILE_SIZE
-        
+        if not self.view_rect.collidepoint(mouse_pos):
+            return
+        grid_x, grid_y = self.screen_to_cell(mouse_pos)
+
         if self.selecting_start and self.env.is_valid_state(grid_x, grid_y) and (grid_x, grid_y) != self.env.end:
             self.env.start = (grid_x, grid_y)
             self.selecting_start = False
-            self.reset_simulation(reset_obstacles=False)
+            self.replan(set())
         elif self.selecting_goal and self.env.is_valid_state(grid_x, grid_y) and (grid_x, grid_y) != self.env.start:
+            old_end = self.env.end
             self.env.end = (grid_x, grid_y)
             self.selecting_goal = False
-            self.reset_simulation(reset_obstacles=False)
+            self.replan({old_end, self.env.end})
         elif self.selecting_obstacle and (grid_x, grid_y) != self.env.start and (grid_x, grid_y) != self.env.end:
-            pos = (grid_x, grid_y)
-            if pos in self.env.obstacles:
-                self.env.obstacles.remove(pos)
-            else:
-                self.env.obstacles.add(pos)
+            self.env.toggle_obstacle((grid_x, grid_y))
+            self.invalidate_static()
+            self.edited_cells.add((grid_x, grid_y))
+
+    # --- Camera ---
+    def fit_tile_size(self):
+        """Tile size at which the whole grid fits the view."""
+        return min(self.VIEW_WIDTH / self.GRID_WIDTH, self.VIEW_HEIGHT / self.GRID_HEIGHT)
+
+    def set_camera(self, x, y, tile_size=None):
+        """Moves and zooms the view, clamped to the grid, and redraws the cached layers."""
+        tile_size = self.tile_size if tile_size is None else tile_size
+        tile_size = max(min(tile_size, self.MAX_TILE_SIZE), min(self.fit_tile_size(), self.LOD_TILE_SIZE))
+        if tile_size >= self.LOD_TILE_SIZE:
+            tile_size = round(tile_size) # Whole pixels, so every tile is the same stamp
+        self.tile_size = tile_size
+        self.camera = [max(0.0, min(x, self.GRID_WIDTH - self.VIEW_WIDTH / tile_size)),
+                       max(0.0, min(y, self.GRID_HEIGHT - self.VIEW_HEIGHT / tile_size))]
+        self.invalidate_static()
+        self.overlay_mode = None
+
+    def zoom(self, factor, pos):
+        """Zooms by ``factor`` while keeping the cell under ``pos`` in place."""
+        px, py = pos[0], pos[1] - self.GRID_OFFSET_Y
+        gx = self.camera[0] + px / self.tile_size
+        gy = self.camera[1] + py / self.tile_size
+        tile_size = self.tile_size * factor
+        self.set_camera(gx - px / tile_size, gy - py / tile_size, tile_size)
+
+    def pan(self, dx, dy):
+        """Pans by a fraction of the view in each direction."""
+        self.set_camera(self.camera[0] + dx * self.VIEW_WIDTH / self.tile_size,
+                        self.camera[1] + dy * self.VIEW_HEIGHT / self.tile_size)
+
+    def handle_key(self, event):
+        """Arrow keys pan, +/- zoom around the view center, L cycles the heatmaps and T the telemetry panel."""
+        moves = {pygame.K_LEFT: (-0.25, 0), pygame.K_RIGHT: (0.25, 0), pygame.K_UP: (0, -0.25), pygame.K_DOWN: (0, 0.25)}
+        if event.key in moves:
+            self.pan(*moves[event.key])
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            self.zoom(1.25, self.view_rect.center)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.zoom(0.8, self.view_rect.center)
+        elif event.key == pygame.K_l:
+            self.lod_mode = (self.lod_mode + 1) % len(self.LOD_MODES)
+            self.invalidate_static()
+        elif event.key == pygame.K_t:
+            self.show_telemetry = not self.show_telemetry
+            # Phase timing costs a few clock reads per step, so it only runs while someone looks
+            self.telemetry.phases = self.show_telemetry or self.telemetry_path is not None
+
+    def screen_to_cell(self, pos):
+        return (int(self.camera[0] + pos[0] / self.tile_size),
+                int(self.camera[1] + (pos[1] - self.GRID_OFFSET_Y) / self.tile_size))
+
+    def visible_cells(self):
+        """Column and row ranges inside the view."""
+        x0, y0 = int(self.camera[0]), int(self.camera[1])
+        x1 = min(self.GRID_WIDTH, math.ceil(self.camera[0] + self.VIEW_WIDTH / self.tile_size))
+        y1 = min(self.GRID_HEIGHT, math.ceil(self.camera[1] + self.VIEW_HEIGHT / self.tile_size))
+        return x0, x1, y0, y1
 
     # --- Drawing methods ---
-    def draw_text(self, text, position, color, centered=False):
-        text_surface = self.font.render(text, True, color)
-        if centered:
-            text_rect = text_surface.get_rect(center=position)
-            self.screen.blit(text_surface, text_rect)
+    # Frames are composed from cached layers: the static grid and obstacles,
+    # an overlay with the trail or final path, and small sprites on top. Only
+    # rects that changed are recomposed and passed to pygame.display.update.
+    def tile_rect(self, x, y):
+        left = math.floor((x - self.camera[0]) * self.tile_size)
+        top = math.floor((y - self.camera[1]) * self.tile_size) + self.GRID_OFFSET_Y
+        right = math.floor((x + 1 - self.camera[0]) * self.tile_size)
+        bottom = math.floor((y + 1 - self.camera[1]) * self.tile_size) + self.GRID_OFFSET_Y
+        return pygame.Rect(left, top, max(1, right - left), max(1, bottom - top))
+
+    def tile_center(self, x, y):
+        return (int((x + 0.5 - self.camera[0]) * self.tile_size),
+                int((y + 0.5 - self.camera[1]) * self.tile_size) + self.GRID_OFFSET_Y)
+
+    def invalidate_static(self):
+        """Marks the grid and obstacle layer for a rebuild after an edit."""
+        self.static_dirty = True
+
+    def glyph(self, text, color):
+        """Rendered text, cached by string and color."""
+        key = (text, color)
+        if key not in self.glyph_cache:
+            self.glyph_cache[key] = self.font.render(text, True, color)
+        return self.glyph_cache[key]
+
+    def glow_sprite(self, kind, pulse):
+        """Goal and player sprites, cached by size and pulsing glow radius."""
+        # Keep markers visible when zoomed far out
+        size = max(int(self.tile_size), 8)
+        if kind == "goal":
+            radius = size // 2 + int(5 * size / self.TILE_SIZE * math.sin(pulse * 0.15))
         else:
-            self.screen.blit(text_surface, position)
-
-    def draw_button(self, rect, text, mouse_pos):
-        color = self.BUTTON_HOVER_COLOR if rect.collidepoint(mouse_pos) else self.BUTTON_COLOR
+            radius = size // 2 + int(3 * size / self.TILE_SIZE * math.sin(pulse))
+        key = (kind, size, radius)
+        if key not in self.sprite_cache:
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            center = (size // 2, size // 2)
+            if kind == "goal":
+                pygame.draw.circle(surface, (50, 255, 100, 40), center, radius)
+                pygame.draw.circle(surface, self.GOAL_COLOR, center, size // 4)
+            else:
+                pygame.draw.circle(surface, (50, 150, 255, 100), center, radius)
+                pygame.draw.circle(surface, self.PLAYER_COLOR, center, size // 3)
+            self.sprite_cache[key] = surface
+        return self.sprite_cache[key]
+
+    def fleet_sprites(self):
+        """One ``(dot, position)`` pair per fleet agent inside the view, for a single ``blits`` call."""
+        size = max(int(self.tile_size) // 2, 2)
+        key = ("fleet", size)
+        if key not in self.sprite_cache:
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(surface, self.PLAYER_COLOR, (size // 2, size // 2), size // 2)
+            self.sprite_cache[key] = surface
+        dot = self.sprite_cache[key]
+        xs, ys = self.fleet.positions()
+        x0, x1, y0, y1 = self.visible_cells()
+        inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        left = ((xs[inside] + 0.5 - self.camera[0]) * self.tile_size).astype(int) - size // 2
+        top = ((ys[inside] + 0.5 - self.camera[1]) * self.tile_size).astype(int) + self.GRID_OFFSET_Y - size // 2
+        return [(dot, position) for position in zip(left.tolist(), top.tolist())]
+
+    def draw_button(self, rect, text, hovered):
+        color = self.BUTTON_HOVER_COLOR if hovered else self.BUTTON_COLOR
         pygame.draw.rect(self.screen, color, rect, 0, 5)
-        self.draw_text(text, rect.center, self.BUTTON_TEXT_COLOR, centered=True)
+        label = self.glyph(text, self.BUTTON_TEXT_COLOR)
+        self.screen.blit(label, label.get_rect(center=rect.center))
 
-    def draw_3d_tile(self, x, y, color):
-        rect = pygame.Rect(x * self.TILE_SIZE, y * self.TILE_SIZE + self.GRID_OFFSET_Y, self.TILE_SIZE, self.TILE_SIZE)
-        pygame.draw.rect(self.screen, color, rect)
+    def draw_3d_tile(self, surface, rect, color):
+        pygame.draw.rect(surface, color, rect)
+        bevel = max(1, rect.width // 12)
         # Add 3D effect (Highlights and shadows)
         highlight_color = (min(255, color[0] + 30), min(255, color[1] + 30), min(255, color[2] + 30))
         shadow_color = (max(0, color[0] - 10), max(0, color[1] - 10), max(0, color[2] - 10))
-        pygame.draw.polygon(self.screen, highlight_color, [rect.topleft, rect.topright, (rect.topright[0]-5, rect.topright[1]+5), (rect.topleft[0]+5, rect.topleft[1]+5)])
-        pygame.draw.polygon(self.screen, highlight_color, [rect.topleft, (rect.topleft[0]+5, rect.topleft[1]+5), (rect.bottomleft[0]+5, rect.bottomleft[1]-5), rect.bottomleft])
-        pygame.draw.polygon(self.screen, shadow_color, [(rect.topright[0]-5, rect.topright[1]+5), rect.topright, rect.bottomright, (rect.bottomright[0]-5, rect.bottomright[1]-5)])
-        pygame.draw.polygon(self.screen, shadow_color, [(rect.bottomleft[0]+5, rect.bottomleft[1]-5), rect.bottomleft, rect.bottomright, (rect.bottomright[0]-5, rect.bottomright[1]-5)])
-
-    def draw_grid(self):
-        for row in range(self.GRID_HEIGHT):
-            for col in range(self.GRID_WIDTH):
-                self.draw_3d_tile(col, row, self.GRID_COLOR)
-            
-    def draw_obstacles(self):
-        margin = self.TILE_SIZE * 0.1
-        for ox, oy in self.env.obstacles:
-            obstacle_rect = pygame.Rect(ox * self.TILE_SIZE + margin, oy * self.TILE_SIZE + self.GRID_OFFSET_Y + margin, self.TILE_SIZE - 2*margin, self.TILE_SIZE - 2*margin)
-            pygame.draw.rect(self.screen, self.OBSTACLE_COLOR, obstacle_rect, 0, 5)
-
-    def draw_goal(self, pulse):
-        gx, gy = self.env.end
-        goal_surface = pygame.Surface((self.TILE_SIZE, self.TILE_SIZE), pygame.SRCALPHA)
-        # Glow effect
-        glow_radius = self.TILE_SIZE // 2 + int(5 * math.sin(pulse * 0.15))
-        pygame.draw.circle(goal_surface, (50, 255, 100, 40), (self.TILE_SIZE // 2, self.TILE_SIZE // 2), glow_radius)
-        pygame.draw.circle(goal_surface, self.GOAL_COLOR, (self.TILE_SIZE // 2, self.TILE_SIZE // 2), self.TILE_SIZE // 4)
-        self.screen.blit(goal_surface, (gx * self.TILE_SIZE, gy * self.TILE_SIZE + self.GRID_OFFSET_Y))
-
-    def draw_player(self, player_pos, pulse):
-        px, py = player_pos
-        glow_radius = self.TILE_SIZE // 2 + int(3 * math.sin(pulse))
-        glow_surface = pygame.Surface((self.TILE_SIZE, self.TILE_SIZE), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (50, 150, 255, 100), (self.TILE_SIZE // 2, self.TILE_SIZE // 2), glow_radius)
-        self.screen.blit(glow_surface, (px * self.TILE_SIZE, py * self.TILE_SIZE + self.GRID_OFFSET_Y))
-        pygame.draw.circle(self.screen, self.PLAYER_COLOR,
-                           (int(px * self.TILE_SIZE + self.TILE_SIZE / 2), int(py * self.TILE_SIZE + self.TILE_SIZE / 2) + self.GRID_OFFSET_Y),
-                           self.TILE_SIZE // 3)
-
-    def draw_fading_trail(self, visited_trail):
-        if not visited_trail:
-            return
-        min_alpha = 255 * 0.3
-        surface = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-        for i, (vx, vy) in enumerate(visited_trail):
-            alpha_val = int(min_alpha + (255 - min_alpha) * (i / (len(visited_trail) - 1 + 1e-6)))
-            color = (self.VISITED_COLOR_TRAIL[0], self.VISITED_COLOR_TRAIL[1], self.VISITED_COLOR_TRAIL[2], alpha_val)
-            pygame.draw.circle(surface, color,
-                               (vx * self.TILE_SIZE + self.TILE_SIZE // 2, vy * self.TILE_SIZE + self.TILE_SIZE // 2 + self.GRID_OFFSET_Y),
-                               self.TILE_SIZE // 6)
-        self.screen.blit(surface, (0, 0))
+        pygame.draw.polygon(surface, highlight_color, [rect.topleft, rect.topright, (rect.topright[0]-bevel, rect.topright[1]+bevel), (rect.topleft[0]+bevel, rect.topleft[1]+bevel)])
+        pygame.draw.polygon(surface, highlight_color, [rect.topleft, (rect.topleft[0]+bevel, rect.topleft[1]+bevel), (rect.bottomleft[0]+bevel, rect.bottomleft[1]-bevel), rect.bottomleft])
+        pygame.draw.polygon(surface, shadow_color, [(rect.topright[0]-bevel, rect.topright[1]+bevel), rect.topright, rect.bottomright, (rect.bottomright[0]-bevel, rect.bottomright[1]-bevel)])
+        pygame.draw.polygon(surface, shadow_color, [(rect.bottomleft[0]+bevel, rect.bottomleft[1]-bevel), rect.bottomleft, rect.bottomright, (rect.bottomright[0]-bevel, rect.bottomright[1]-bevel)])
+
+    def build_static_layer(self):
+        """Pre-renders the background and the visible part of the grid."""
+        layer = self.static_layer
+        layer.fill(self.BG_COLOR)
+        layer.set_clip(self.view_rect)
+        x0, x1, y0, y1 = self.visible_cells()
+        if self.tile_size < self.LOD_TILE_SIZE:
+            self.blit_lod(layer, x0, x1, y0, y1)
+        else:
+            # Every tile looks the same, so draw one and stamp it
+            tile = pygame.Surface((self.tile_size, self.tile_size))
+            self.draw_3d_tile(tile, tile.get_rect(), self.GRID_COLOR)
+            for row in range(y0, y1):
+                for col in range(x0, x1):
+                    layer.blit(tile, self.tile_rect(col, row))
+            if self.LOD_MODES[self.lod_mode] != "obstacles":
+                self.blit_lod(layer, x0, x1, y0, y1, alpha=self.HEATMAP_ALPHA)
+            margin = self.tile_size * 0.1
+            for ox, oy in zip(*np.nonzero(self.env.blocked[x0:x1, y0:y1])):
+                obstacle_rect = self.tile_rect(x0 + ox, y0 + oy).inflate(-2 * margin, -2 * margin)
+                pygame.draw.rect(layer, self.OBSTACLE_COLOR, obstacle_rect, 0, 5)
+        layer.set_clip(None)
+        self.static_dirty = False
+
+    def lod_step(self):
+        """Cells per sampled pixel, so the low-zoom image never exceeds the view's pixel count."""
+        return max(1, int(1 / self.tile_size))
+
+    def lod_colors(self, x0, x1, y0, y1):
+        """(columns, rows, 3) colors of the visible cells for the current low-zoom view."""
+        step = self.lod_step()
+        blocked = self.env.blocked[x0:x1:step, y0:y1:step]
+        colors = np.empty(blocked.shape + (3,), dtype=np.uint8)
+        colors[:] = self.GRID_COLOR
+        mode = self.LOD_MODES[self.lod_mode]
+        if mode != "obstacles":
+            states = self.sampled_states(x0, x1, y0, y1)
+            known = ~blocked & (states >= 0)
+            if mode == "values":
+                values = self.agent.q_values[states[known]].max(axis=-1)
+                low_color, high_color = self.VALUE_LOW_COLOR, self.VALUE_HIGH_COLOR
+            else:
+                # Visits span orders of magnitude, so shade them on a log scale
+                values = np.log1p(self.agent.visit_counts[states[known]])
+                low_color, high_color = self.GRID_COLOR, self.VISITS_HIGH_COLOR
+            if values.size:
+                low, high = values.min(), values.max()
+                t = (values - low) / (high - low if high > low else 1.0)
+                colors[known] = (np.outer(1 - t, low_color) + np.outer(t, high_color)).astype(np.uint8)
+        colors[blocked] = self.OBSTACLE_COLOR
+        return colors
+
+    def sampled_states(self, x0, x1, y0, y1):
+        """State indices of the sampled visible cells, -1 where the world has no state."""
+        env = self.env
+        step = self.lod_step()
+        flat = np.arange(x0, x1, step)[:, None] * env.height + np.arange(y0, y1, step)
+        return flat if env.slots is None else env.slots[flat]
+
+    def blit_lod(self, layer, x0, x1, y0, y1, alpha=None):
+        """Draws the visible cells as one scaled image, without per-tile draw calls; ``alpha`` blends it in."""
+        image = pygame.surfarray.make_surface(self.lod_colors(x0, x1, y0, y1))
+        top_left = self.tile_rect(x0, y0).topleft
+        bottom_right = self.tile_rect(x1 - 1, y1 - 1).bottomright
+        size = (bottom_right[0] - top_left[0], bottom_right[1] - top_left[1])
+        image = pygame.transform.scale(image, size)
+        if alpha is not None:
+            image.set_alpha(alpha)
+        layer.blit(image, top_left)
+
+    def update_overlay(self, snapshot):
+        """
+        Brings the trail or final-path overlay up to date and returns the rects
+        it changed. Trail dots are drawn as they arrive, and older ones fade by
+        dimming the trail's bounding rect every TRAIL_FADE_EVERY dots. Only the
+        moves since the last frame are read from the snapshot's ring buffer,
+        so a frame costs the same however long the episode has run.
+        """
+        if self.show_final_path and not self.is_training and not self.selecting_obstacle:
+            mode = ("path", tuple(self.final_path))
+        elif self.is_training:
+            mode = ("trail", snapshot["episode"])
+        else:
+            mode = None
+
+        dirty = []
+        if mode != self.overlay_mode:
+            self.overlay.fill((0, 0, 0, 0))
+            dirty.append(self.overlay_rect)
+            self.overlay_mode = mode
+            self.overlay_rect = pygame.Rect(0, 0, 0, 0)
+            self.trail_drawn = 0
+            if mode is not None and mode[0] == "path":
+                self.draw_path_lines(self.final_path)
+                dirty.append(self.overlay.get_rect())
+        if mode is None or mode[0] != "trail":
+            return dirty
+
+        total = snapshot["trail_total"]
+        # Fade once per frame by every step the new dots account for
+        fades = total // self.TRAIL_FADE_EVERY - self.trail_drawn // self.TRAIL_FADE_EVERY
+        if fades > 0 and self.overlay_rect.width:
+            alpha = int(255 * (self.TRAIL_FADE / 255) ** fades)
+            self.overlay.fill((255, 255, 255, alpha), self.overlay_rect, special_flags=pygame.BLEND_RGBA_MULT)
+            dirty.append(self.overlay_rect)
+        # Moves that already left the ring would have faded out anyway
+        trail = snapshot["trail"]
+        xs, ys = self.env.cell_arrays(trail[len(trail) - max(0, min(total - self.trail_drawn, len(trail))):])
+        x0, x1, y0, y1 = self.visible_cells()
+        inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        radius = max(1, int(self.tile_size) // 6)
+        for x, y in zip(xs[inside].tolist(), ys[inside].tolist()):
+            center = self.tile_center(x, y)
+            pygame.draw.circle(self.overlay, self.VISITED_COLOR_TRAIL, center, radius)
+            dot = pygame.Rect(center[0] - radius, center[1] - radius, 2 * radius, 2 * radius)
+            self.overlay_rect = self.overlay_rect.union(dot) if self.overlay_rect.width else dot
+            dirty.append(dot)
+        self.trail_drawn = total
+        return dirty
 
     def draw_path_lines(self, path):
         if len(path) < 2: return
         for i in range(len(path) - 1):
-            px, py = path[i]
-            next_px, next_py = path[i+1]
-            pygame.draw.line(self.screen, self.PATH_COLOR, 
-                             (px * self.TILE_SIZE + self.TILE_SIZE // 2, py * self.TILE_SIZE + self.TILE_SIZE // 2 + self.GRID_OFFSET_Y), 
-                             (next_px * self.TILE_SIZE + self.TILE_SIZE // 2, next_py * self.TILE_SIZE + self.TILE_SIZE // 2 + self.GRID_OFFSET_Y), 5)
+            pygame.draw.line(self.overlay, self.PATH_COLOR, self.tile_center(*path[i]), self.tile_center(*path[i+1]),
+                             max(1, int(self.tile_size) // 12))
         for px, py in path:
-            pygame.draw.circle(self.screen, self.PATH_COLOR,
-                               (px * self.TILE_SIZE + self.TILE_SIZE // 2, py * self.TILE_SIZE + self.TILE_SIZE // 2 + self.GRID_OFFSET_Y),
-                               self.TILE_SIZE // 5)
-    
-    def draw_scene(self, pulse):
-        """Draws all UI elements."""
-        self.screen.fill(self.BG_COLOR)
-        
-        status_text = ""
+            pygame.draw.circle(self.overlay, self.PATH_COLOR, self.tile_center(px, py), max(1, int(self.tile_size) // 5))
+
+    def telemetry_surface(self):
+        """The telemetry panel, re-rendered only when a new episode record arrives."""
+        record = self.telemetry.last
+        if self.telemetry_panel is None or record is not self.telemetry_record:
+            self.telemetry_record = record
+            if record is None:
+                lines = ["Telemetry: waiting for the first episode"]
+            else:
+                speed = record["steps_per_sec"] or 0.0
+                lines = [f"Episode {record['episode']}: {record['steps']} steps, return {record['return']:.0f}",
+                         f"max TD error {record['td_error_max']:.2f}, epsilon {record['epsilon']}",
+                         f"{speed:,.0f} steps/sec, {self.telemetry.steps:,} steps in total"]
+                if record.get("select_us") is not None:
+                    lines.append(f"select {record['select_us']:.2f} / transition {record['transition_us']:.2f} / "
+                                 f"update {record['update_us']:.2f} us per step")
+            glyphs = [self.font.render(line, True, self.TEXT_COLOR) for line in lines]
+            width = max(glyph.get_width() for glyph in glyphs) + 12
+            panel = pygame.Surface((width, sum(glyph.get_height() for glyph in glyphs) + 8), pygame.SRCALPHA)
+            panel.fill((0, 0, 0, 170))
+            top = 4
+            for glyph in glyphs:
+                panel.blit(glyph, (6, top))
+                top += glyph.get_height()
+            self.telemetry_panel = panel
+        return self.telemetry_panel
+
+    def status_text(self, snapshot):
         if self.selecting_start:
-            status_text = "Click a tile to select a new start point."
+            return "Click a tile to select a new start point."
         elif self.selecting_goal:
-            status_text = "Click a tile to select a new goal."
+            return "Click a tile to select a new goal."
         elif self.selecting_obstacle:
-            status_text = "Click a tile to add or remove an obstacle."
+            return "Click a tile to add or remove an obstacle."
+        elif self.is_training and self.fleet is not None:
+            return f"Fleet of {self.fleet.n_agents}: {self.fleet_episodes} episodes, {self.fleet.collided} blocked moves"
         elif self.is_training:
-            status_text = f"Episode: {self.current_episode}/{self.episodes}"
+            status_text = f"Episode: {snapshot['episode']}/{self.episodes}"
+            if self.last_replan is not None:
+                status_text += f" (re-planned {self.last_replan['touched']} states)"
+            return status_text
+        elif snapshot["converged"]:
+            return f"Final Path (converged after {self.engine.convergence.stable_since} episodes)"
+        return "Final Path"
+
+    def draw_scene(self, pulse):
+        """Draws the frame from the cached layers and returns the rects that changed."""
+        clock = time.perf_counter
+        started = clock()
+        snapshot = self.engine.snapshot()
+        self.frame_count += 1
+        if (self.LOD_MODES[self.lod_mode] != "obstacles" and self.is_training
+                and self.frame_count % self.LOD_REFRESH_FRAMES == 0):
+            self.invalidate_static() # Heatmaps follow the Q-table and visit counts a few times a second
+        full = self.static_dirty
+        if self.static_dirty:
+            self.build_static_layer()
+        static_done = clock()
+        dirty = self.update_overlay(snapshot)
+        overlay_done = clock()
+
+        # Sprites animate every frame, so their old and new rects are always dirty
+        goal = self.glow_sprite("goal", pulse)
+        sprites = [(goal, goal.get_rect(center=self.tile_center(*cell))) for cell in self.env.goals]
+        if self.fleet is None:
+            player = self.glow_sprite("player", pulse)
+            sprites.append((player, player.get_rect(center=self.tile_center(*snapshot["state"]))))
         else:
-            status_text = "Final Path"
-        
-        # Draw status text at the top
-        self.draw_text(status_text, (self.WIDTH // 2, 40), self.TEXT_COLOR, centered=True)
-        
-        self.draw_grid()
-        self.draw_obstacles()
-        self.draw_goal(pulse)
-        
-        if self.show_final_path and not self.is_training and not self.selecting_obstacle:
-            self.draw_path_lines(self.final_path)
-        elif self.is_training:
-            self.draw_fading_trail(self.agent.visited_trail)
-        
-        self.draw_player(self.agent.current_state, pulse)
+            dirty.append(self.view_rect) # Agents move all over the view
+        markers = len(sprites)
+        status = self.glyph(self.status_text(snapshot), self.TEXT_COLOR)
+        sprites.append((status, status.get_rect(center=(self.WIDTH // 2, 40))))
+        if self.show_telemetry:
+            panel = self.telemetry_surface()
+            sprites.append((panel, panel.get_rect(bottomleft=self.view_rect.bottomleft)))
+        rects = [rect for _, rect in sprites]
+        dirty.extend(self.sprite_rects)
+        dirty.extend(rects)
+        self.sprite_rects = rects
 
         mouse_pos = pygame.mouse.get_pos()
-        for button in self.buttons:
-            self.draw_button(button["rect"], button["text"], mouse_pos)
+        buttons = [(button["text"], button["rect"].collidepoint(mouse_pos)) for button in self.buttons]
+        for button, state, drawn in zip(self.buttons, buttons, self.button_states):
+            if state != drawn or button["rect"].collidelist(dirty) != -1:
+                dirty.append(button["rect"])
+        if full:
+            dirty = [self.screen.get_rect()]
+        elif len(dirty) > 32:
+            # Many small rects cost more to compose than their bounding box
+            dirty = [dirty[0].unionall(dirty[1:])]
+
+        for rect in dirty:
+            self.screen.blit(self.static_layer, rect, rect)
+            self.screen.blit(self.overlay, rect, rect)
+        # Markers of cells outside the view must not spill over the button bar
+        self.screen.set_clip(self.view_rect)
+        for surface, rect in sprites[:markers]:
+            self.screen.blit(surface, rect)
+        if self.fleet is not None:
+            self.screen.blits(self.fleet_sprites(), doreturn=False)
+        self.screen.set_clip(None)
+        for surface, rect in sprites[markers:]:
+            self.screen.blit(surface, rect)
+        sprites_done = clock()
+        for button, (text, hovered) in zip(self.buttons, buttons):
+            if button["rect"].collidelist(dirty) != -1:
+                self.draw_button(button["rect"], text, hovered)
+        self.button_states = buttons
+        finished = clock()
+
+        for layer, seconds in (("static", static_done - started), ("overlay", overlay_done - static_done),
+                               ("sprites", sprites_done - overlay_done), ("buttons", finished - sprites_done)):
+            self.layer_times[layer] = 0.9 * self.layer_times.get(layer, seconds) + 0.1 * seconds
+        return dirty
+
+    def report_layer_times(self):
+        """One line of smoothed per-layer frame times, in milliseconds."""
+        return "  ".join(f"{layer} {seconds * 1000:.2f} ms" for layer, seconds in self.layer_times.items())
 
     # --- Main application loop ---
     def run(self):
@@ -407,27 +702,93 @@ class GridWorldApp:
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    self.telemetry.close()
                     pygame.quit()
                     sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 2, 3):
                     self.handle_mouse_click(event)
+                if event.type == pygame.MOUSEWHEEL:
+                    self.zoom(1.25 ** event.y, pygame.mouse.get_pos())
+                if event.type == pygame.KEYDOWN:
+                    self.handle_key(event)
 
             if self.is_training and not self.selecting_start and not self.selecting_goal and not self.selecting_obstacle:
-                episode_finished = self.agent.take_step()
-                if episode_finished:
-                    self.current_episode += 1
-                    if self.current_episode < self.episodes:
-                        self.agent.reset()
-                    else:
-                        self.is_training = False
-                        self.final_path = self.agent.find_best_path()
+                self.advance_training()
+            else:
+                self.engine.stop()
 
             pulse += 0.1
-            self.draw_scene(pulse)
-            
-            pygame.display.flip()
-            self.clock.tick(self.speeds[self.current_speed_index])
+            dirty = self.draw_scene(pulse)
+            present_started = time.perf_counter()
+            pygame.display.update(dirty)
+            seconds = time.perf_counter() - present_started
+            self.layer_times["present"] = 0.9 * self.layer_times.get("present", seconds) + 0.1 * seconds
+            if self.profile and pygame.time.get_ticks() - self.last_report >= 1000:
+                self.last_report = pygame.time.get_ticks()
+                print(self.report_layer_times())
+            self.clock.tick(self.FPS)
+
+    def advance_training(self):
+        """Runs this frame's share of training, decoupled from the frame rate."""
+        if self.fleet is not None:
+            self.advance_fleet()
+            return
+        if self.threaded:
+            self.engine.start()
+        else:
+            speed = self.speeds[self.current_speed_index]
+            if speed is None:
+                self.engine.run_for(self.FRAME_BUDGET)
+            else:
+                self.step_credit += speed / self.FPS
+                steps = int(self.step_credit)
+                self.step_credit -= steps
+                self.engine.step(steps)
+        if self.engine.finished:
+            self.engine.stop()
+            self.finish_training(self.engine.current_episode)
+
+    def advance_fleet(self):
+        """
+        Fleet mode: every agent takes one step per tick, at the selected speed
+        in ticks per second. The greedy paths are checked whenever an episode
+        ends, and training stops once they have converged or after
+        ``episodes`` episodes per agent.
+        """
+        fleet = self.fleet
+        speed = self.speeds[self.current_speed_index]
+        deadline = time.perf_counter() + self.FRAME_BUDGET
+        if speed is not None:
+            self.step_credit += speed / self.FPS
+            ticks = int(self.step_credit)
+            self.step_credit -= ticks
+        finished = 0
+        while (time.perf_counter() < deadline) if speed is None else ticks > 0:
+            finished += int(fleet.step().sum())
+            if speed is not None:
+                ticks -= 1
+        if finished:
+            self.fleet_episodes += finished
+            paths = [self.agent.trace_path(self.env.cell(s)) for s in np.unique(fleet.start_states)]
+            self.fleet_monitor.update(0.0, tuple(tuple(p["path"]) for p in paths), all(p["status"] == "goal" for p in paths))
+        if self.fleet_monitor.converged or self.fleet_episodes >= self.episodes * fleet.n_agents:
+            self.finish_training(self.fleet_episodes)
+
+    def finish_training(self, episodes):
+        self.is_training = False
+        self.final_path = self.agent.find_best_path()
+        if self.store is not None:
+            self.trained_episodes += episodes
+            self.store.save(self.agent, self.trained_episodes)
 
 if __name__ == '__main__':
-    app = GridWorldApp()
+    model_root = sys.argv[sys.argv.index("--model") + 1] if "--model" in sys.argv else None
+    # --size WxH opens a random map of that size, e.g. --size 500x500
+    grid_size = tuple(map(int, sys.argv[sys.argv.index("--size") + 1].split("x"))) if "--size" in sys.argv else None
+    # --telemetry FILE streams one record per episode as JSONL, or CSV if FILE ends in .csv
+    telemetry_path = sys.argv[sys.argv.index("--telemetry") + 1] if "--telemetry" in sys.argv else None
+    # --fleet N trains N agents at once, e.g. --size 200x200 --fleet 2000
+    fleet_size = int(sys.argv[sys.argv.index("--fleet") + 1]) if "--fleet" in sys.argv else None
+    app = GridWorldApp(threaded="--threaded" in sys.argv, model_root=model_root, profile="--profile" in sys.argv,
+                       grid_size=grid_size, telemetry_path=telemetry_path, fleet_size=fleet_size)
     app.run()